@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Variante asyncio de SecurityChecker para analizar flotas de miles de
+aplicaciones: los 14 chequeos son los mismos (run_checks se hereda sin
+cambios y devuelve las mismas tuplas checks), pero la página principal y
+los sondeos se piden con AsyncTransport sobre un AsyncHTTPClient
+compartido, con un semáforo global y uno por host.
+
+Uso:
+    python aiochecker.py urls.txt --concurrency 200
+"""
+
+import argparse
+import asyncio
+import codecs
+import hashlib
+import http.client
+import sys
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from aiotransport import MAX_CONNECTIONS, PER_HOST_CONNECTIONS, AsyncHTTPClient, AsyncTransport
+from assets import AssetBody, analyzer_id, asset_probes, conditional_headers
+from batch import BatchItem, load_urls
+from cache import cached_check_async, get_cache
+from checker import HTMLTagParser, SecurityChecker
+from incremental import (BODY_CHANGED, BODY_NOT_MODIFIED, BODY_SAME, check_headers, conditional_request, needs_body,
+                         reusable_checks, session_cookies)
+from incremental import summarize as summarize_rescan
+from metrics import DISABLED, ScanMetrics
+from pageindex import PageIndex
+from probes import Probe, ProbeBatch, ProbeResult, RateLimiter
+
+# Escaneos simultáneos por defecto en una flota
+CONCURRENCY = 100
+
+class AsyncRateLimiter(RateLimiter):
+    """
+    RateLimiter para sondeos con asyncio: espera con asyncio.sleep en lugar
+    de bloquear el hilo. Todas las tareas corren en el mismo event loop, así
+    que no hace falta lock.
+    """
+    
+    async def acquire(self, deadline: Optional[float] = None) -> bool:
+        if self.rate is None:
+            return True
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            wait_time = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait_time > deadline:
+                return False
+            await asyncio.sleep(wait_time)
+
+class AsyncSecurityChecker(SecurityChecker):
+    """
+    SecurityChecker con E/S no bloqueante. Con client se comparten las
+    conexiones y los límites de concurrencia con otros escaneos del mismo
+    event loop; sin él, cada análisis usa (y cierra) un cliente propio.
+    check_security e is_unchanged siguen disponibles como llamadas
+    sincrónicas que corren su propio event loop.
+    """
+    
+    def __init__(self, url, client: Optional[AsyncHTTPClient] = None, **kwargs):
+        super().__init__(url, **kwargs)
+        # Plazos y tamaño del pool del transporte sincrónico, para el cliente propio
+        self.client_settings = {'pool_size': self.transport.pool_size,
+                                'connect_timeout': self.transport.connect_timeout,
+                                'read_timeout': self.transport.read_timeout}
+        self.client = client
+        self.transport = AsyncTransport(client, self.cookie_jar)
+        self.limiter = AsyncRateLimiter(self.scheduler.limiter.rate)
+    
+    def _own_client(self) -> Optional[AsyncHTTPClient]:
+        """Cliente para un análisis sin cliente compartido (se cierra al terminar)"""
+        if self.client is not None:
+            return None
+        self.transport.client = AsyncHTTPClient(**self.client_settings)
+        return self.transport.client
+    
+    async def make_request_async(self, url, method="GET", additional_headers=None):
+        headers = dict(self.headers)
+        if additional_headers:
+            headers.update(additional_headers)
+        
+        # Las respuestas de error (4xx/5xx) se devuelven igual que las exitosas
+        try:
+            return await self.transport.request(url, method=method, headers=headers)
+        except (OSError, http.client.HTTPException, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            raise Exception(f"No se pudo conectar a {url}: {str(e) or type(e).__name__}")
+    
+    async def fetch_probe_async(self, probe: Probe) -> ProbeResult:
+        limit = probe.max_bytes or self.max_body_size
+        if probe.head_first:
+            result = await self._fetch_async(probe, "HEAD", 0)
+            # HEAD alcanza para descartar la ruta; un 200 se confirma con GET para compararlo con la página de error
+            if result.status not in (200, 405, 501):
+                return result
+            if not await self.limiter.acquire(probe.deadline):
+                return ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado")
+        return await self._fetch_async(probe, probe.method, limit if probe.read_body else 0)
+    
+    async def _fetch_async(self, probe, method, limit):
+        response = await self.make_request_async(probe.url, method=method)
+        try:
+            body = await response.read(limit) if limit else b''
+        finally:
+            await response.close()
+        return ProbeResult(probe.key, probe.url, status=response.getcode(),
+                           headers=dict(response.info()), body=body,
+                           method=method, final_url=response.geturl())
+    
+    async def fetch_asset_async(self, probe: Probe) -> ProbeResult:
+        return await self.asset_cache.load_async(probe, self._download_asset_async, analyzer_id(self.detector))
+    
+    async def _download_asset_async(self, probe, stale):
+        """Lee el recurso por bloques y lo analiza (o lo busca por hash); con stale, la petición es condicional"""
+        response = await self.make_request_async(probe.url, additional_headers=conditional_headers(stale))
+        body = AssetBody()
+        try:
+            if response.getcode() == 200:
+                while body.bytes_read < probe.max_bytes:
+                    chunk = await response.read(min(self.CHUNK_SIZE, probe.max_bytes - body.bytes_read))
+                    if not chunk:
+                        break
+                    body.append(chunk)
+                body.truncated = body.bytes_read >= probe.max_bytes and bool(await response.read(1))
+        finally:
+            await response.close()
+        # El análisis y la consulta de huellas (SQLite) corren fuera del event loop
+        return await asyncio.to_thread(body.result, probe.key, probe.url, response, self.detector, self.fingerprints)
+    
+    async def run_probes(self, probes: List[Probe], fetch=None, deadline: Optional[float] = None) -> ProbeBatch:
+        """
+        Ejecuta los sondeos con el mismo límite de sondeos simultáneos, tasa
+        y plazo del escaneo que ProbeScheduler; devuelve el lote terminado.
+        fetch reemplaza a fetch_probe_async (por ejemplo, fetch_asset_async)
+        y deadline es el vencimiento del escaneo, como en ProbeScheduler.submit
+        """
+        probes = list(probes)
+        fetch = fetch or self.fetch_probe_async
+        scheduler = self.scheduler
+        if deadline is None:
+            deadline = scheduler.scan_deadline()
+        slots = asyncio.Semaphore(scheduler.max_workers)
+        
+        async def run_one(probe):
+            if not await self.limiter.acquire(deadline):
+                return ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado")
+            async with slots:
+                start = time.monotonic()
+                try:
+                    result = await fetch(probe._replace(deadline=deadline))
+                except Exception as e:
+                    result = ProbeResult(probe.key, probe.url, error=str(e))
+                result.elapsed = time.monotonic() - start
+                return result
+        
+        tasks = [asyncio.ensure_future(run_one(probe)) for probe in probes]
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+        
+        results = []
+        for probe, task in zip(probes, tasks):
+            if task.done() and not task.cancelled():
+                results.append(task.result())
+            else:
+                task.cancel()
+                results.append(ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado"))
+        # Las tareas canceladas cierran sus conexiones antes de seguir
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return ProbeBatch.from_results(probes, results)
+    
+    async def read_page_async(self, response, parser) -> PageIndex:
+        """Lee el cuerpo por bloques hasta max_body_size alimentando el parser en la misma pasada"""
+        page = PageIndex(self.MATCHER)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        feed = self.metrics.timed('parse', page.feed)
+        digest = hashlib.sha256()
+        
+        while page.bytes_read < self.max_body_size:
+            chunk = await response.read(min(self.CHUNK_SIZE, self.max_body_size - page.bytes_read))
+            if not chunk:
+                break
+            page.bytes_read += len(chunk)
+            digest.update(chunk)
+            feed(decoder.decode(chunk), parser)
+        else:
+            page.truncated = bool(await response.read(1))
+        
+        feed(decoder.decode(b'', final=True), parser)
+        await response.close()
+        page.digest = digest.hexdigest()
+        return page.finish()
+    
+    async def read_body_async(self, response):
+        """read_body sobre la respuesta asíncrona: (bytes, info) sin parsear"""
+        digest = hashlib.sha256()
+        chunks, size, truncated = [], 0, False
+        while size < self.max_body_size:
+            chunk = await response.read(min(self.CHUNK_SIZE, self.max_body_size - size))
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            chunks.append(chunk)
+        else:
+            truncated = bool(await response.read(1))
+        await response.close()
+        return b''.join(chunks), {'bytes_read': size, 'truncated': truncated, 'digest': digest.hexdigest()}
+    
+    async def is_unchanged_async(self, validators, headers=None) -> bool:
+        """SecurityChecker.is_unchanged con E/S no bloqueante"""
+        conditional = conditional_request(validators)
+        if not conditional:
+            return False
+        
+        own_client = self._own_client()
+        try:
+            response = await self.make_request_async(self.url, additional_headers=conditional)
+            await response.close()
+            if response.getcode() != 304:
+                return False
+            return headers is None or check_headers(await self._current_headers_async(headers, response)) == headers
+        except Exception:
+            return False
+        finally:
+            if own_client is not None:
+                await own_client.close()
+    
+    async def check_security_async(self, previous=None):
+        if previous is not None and previous.artifacts:
+            success, result = await self._rescan_async(previous)
+        else:
+            success, result = await self._check_security_async()
+        # El historial escribe en SQLite: no se bloquea el event loop
+        await asyncio.to_thread(self.record_history, success, result)
+        return success, result
+    
+    async def _check_security_async(self):
+        own_client = self._own_client()
+        self.metrics = metrics = ScanMetrics() if self.instrument else DISABLED
+        deadline = self.scheduler.scan_deadline()
+        probes = assets = None
+        try:
+            with metrics.phase('request'):
+                response = await self.make_request_async(self.url)
+            if response.getcode() != 200:
+                await response.close()
+                return False, f"Error: No se pudo acceder a la URL. Código de estado: {response.getcode()}"
+            
+            headers = dict(response.info())
+            self.details['validators'] = {
+                'etag': response.info().get('ETag'),
+                'last_modified': response.info().get('Last-Modified'),
+            }
+            
+            # Los sondeos corren mientras se lee y se analiza la página principal
+            cookies = session_cookies(self.cookie_jar)
+            probes = asyncio.ensure_future(self.run_probes(self.build_probes(), deadline=deadline))
+            parser = HTMLTagParser(self.detector)
+            with metrics.phase('body'):
+                page = await self.read_page_async(response, parser)
+            self.details['body'] = {'bytes_read': page.bytes_read, 'truncated': page.truncated, 'digest': page.digest}
+            metrics.count_bytes(page.bytes_read)
+            
+            # Los recursos referenciados se conocen recién con la página parseada
+            assets = asyncio.ensure_future(self.run_probes(self.build_asset_probes(parser, response.geturl()),
+                                                           fetch=self.fetch_asset_async, deadline=deadline))
+            probe_batch, asset_batch = await asyncio.gather(probes, assets)
+            with metrics.phase('checks'):
+                checks = self.run_checks(None, page, headers, parser, probe_batch, asset_batch, cookies=cookies)
+            
+            inputs = self._inputs(headers, self.details['body'], probe_batch, asset_batch, cookies)
+            self.details['artifacts'] = self.scan_artifacts(headers, self.details['body'], asset_batch, inputs)
+            
+            # Calcular estadísticas
+            return True, self._summary(checks)
+        
+        except Exception as e:
+            return False, f"Error durante la evaluación: {str(e)}"
+        
+        finally:
+            for pending in (probes, assets):
+                if pending is not None and not pending.done():
+                    pending.cancel()
+                    await asyncio.gather(pending, return_exceptions=True)
+            self.details['transport'] = self.transport.metrics()
+            if metrics.enabled:
+                self.details['performance'] = metrics.to_dict(self.details['transport'])
+            if own_client is not None:
+                await own_client.close()
+    
+    async def _current_headers_async(self, stored, not_modified):
+        try:
+            response = await self.make_request_async(self.url, method="HEAD")
+            await response.close()
+            if response.getcode() == 200:
+                return dict(response.info())
+        except Exception:
+            pass
+        headers = dict(stored)
+        headers.update(not_modified.info())
+        return headers
+    
+    async def _rescan_async(self, previous):
+        """SecurityChecker._rescan con E/S no bloqueante"""
+        own_client = self._own_client()
+        artifacts = previous.artifacts
+        self.metrics = metrics = ScanMetrics() if self.instrument else DISABLED
+        deadline = self.scheduler.scan_deadline()
+        probes = None
+        try:
+            with metrics.phase('request'):
+                response = await self.make_request_async(self.url,
+                                                         additional_headers=conditional_request(previous.validators))
+            status = response.getcode()
+            if status not in (200, 304):
+                await response.close()
+                return False, f"Error: No se pudo acceder a la URL. Código de estado: {status}"
+            
+            cookies = session_cookies(self.cookie_jar)
+            probes = asyncio.ensure_future(self.run_probes(self.build_probes(), deadline=deadline))
+            if status == 304:
+                await response.close()
+                headers = await self._current_headers_async(artifacts['headers'], response)
+                raw, body, state = None, artifacts['body'], BODY_NOT_MODIFIED
+            else:
+                headers = dict(response.info())
+                with metrics.phase('body'):
+                    raw, body = await self.read_body_async(response)
+                metrics.count_bytes(body['bytes_read'])
+                state = BODY_SAME if body['digest'] == artifacts['body']['digest'] else BODY_CHANGED
+            self.details['validators'] = {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            }
+            self.details['body'] = dict(body)
+            
+            page = parser = None
+            if state == BODY_CHANGED:
+                page, parser = self.parse_body(raw, body)
+                asset_list = self.build_asset_probes(parser, response.geturl())
+            else:
+                asset_list = asset_probes(artifacts['asset_urls']) if self.fetch_assets else []
+            asset_batch = await self.run_probes(asset_list, fetch=self.fetch_asset_async, deadline=deadline)
+            probe_batch = await probes
+            
+            inputs = self._inputs(headers, body, probe_batch, asset_batch, cookies)
+            reuse = reusable_checks(previous.result['checks'], artifacts.get('inputs'), inputs)
+            if page is None and needs_body(reuse):
+                if raw is None:
+                    # La página respondió 304 pero cambió otra entrada de un chequeo del cuerpo
+                    with metrics.phase('request'):
+                        response = await self.make_request_async(self.url)
+                    if response.getcode() != 200:
+                        await response.close()
+                        return False, f"Error: No se pudo acceder a la URL. Código de estado: {response.getcode()}"
+                    with metrics.phase('body'):
+                        raw, full = await self.read_body_async(response)
+                    metrics.count_bytes(full['bytes_read'])
+                    if full['digest'] != body['digest']:
+                        # El servidor respondió 304 con otra página: no hay nada confiable que reutilizar
+                        return await self._check_security_async()
+                page, parser = self.parse_body(raw, body)
+            if page is None:
+                # Todos los chequeos que leen el cuerpo se reutilizan
+                page, parser = PageIndex.from_text('', self.MATCHER), HTMLTagParser(self.detector)
+            
+            with metrics.phase('checks'):
+                checks = self.run_checks(None, page, headers, parser, probe_batch, asset_batch, reuse=reuse,
+                                         cookies=cookies)
+            self.details['artifacts'] = self.scan_artifacts(headers, body, asset_batch, inputs)
+            
+            result = self._summary(checks)
+            result['incremental'] = summarize_rescan(checks, reuse, state)
+            return True, result
+        
+        except Exception as e:
+            return False, f"Error durante la evaluación: {str(e)}"
+        
+        finally:
+            if probes is not None and not probes.done():
+                probes.cancel()
+                await asyncio.gather(probes, return_exceptions=True)
+            self.details['transport'] = self.transport.metrics()
+            if metrics.enabled:
+                self.details['performance'] = metrics.to_dict(self.details['transport'])
+            if own_client is not None:
+                await own_client.close()
+    
+    def check_security(self, previous=None):
+        return asyncio.run(self.check_security_async(previous))
+    
+    def is_unchanged(self, validators, headers=None):
+        return asyncio.run(self.is_unchanged_async(validators, headers))
+
+async def scan_fleet(urls: List[str], concurrency: int = CONCURRENCY, options: Optional[Dict] = None,
+                     use_cache: bool = False, client: Optional[AsyncHTTPClient] = None,
+                     incremental: bool = False) -> AsyncIterator[BatchItem]:
+    """
+    Analiza todas las URLs con hasta concurrency escaneos a la vez sobre un
+    único cliente compartido y entrega cada resultado apenas termina (no en
+    el orden de entrada; usar BatchItem.index para ordenarlos)
+    """
+    own_client = client is None
+    if own_client:
+        client = AsyncHTTPClient()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    cache = get_cache() if use_cache or incremental else None
+    
+    async def scan(index, url):
+        async with slots:
+            checker = None
+            try:
+                checker = AsyncSecurityChecker(url, client=client, **(options or {}))
+                if cache is not None:
+                    success, result, _ = await cached_check_async(checker, cache, incremental=incremental)
+                else:
+                    success, result = await checker.check_security_async()
+            except Exception as e:
+                success, result = False, f"Error durante la evaluación: {str(e)}"
+            return BatchItem(index, url, success, result, checker.details.get('performance') if checker else None)
+    
+    tasks = [asyncio.ensure_future(scan(i, url)) for i, url in enumerate(urls)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_client:
+            await client.close()
+
+def run_fleet(urls: List[str], concurrency: int = CONCURRENCY, options: Optional[Dict] = None,
+              use_cache: bool = False, max_connections: int = MAX_CONNECTIONS,
+              per_host: int = PER_HOST_CONNECTIONS, incremental: bool = False) -> Iterator[BatchItem]:
+    """Versión sincrónica de scan_fleet (para batch.run_batch): corre su propio event loop"""
+    loop = asyncio.new_event_loop()
+    
+    async def start():
+        return scan_fleet(urls, concurrency, options, use_cache,
+                          AsyncHTTPClient(max_connections=max_connections, per_host=per_host), incremental)
+    
+    fleet = loop.run_until_complete(start())
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(fleet.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(fleet.aclose())
+        loop.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Checkpoint de Seguridad GCABA - análisis de flotas con asyncio")
+    parser.add_argument("archivo", help="Archivo .txt o .csv con una URL por línea ('-' para stdin)")
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY, help="Escaneos simultáneos")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="Peticiones simultáneas de toda la flota")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_CONNECTIONS,
+                        help="Peticiones simultáneas a un mismo host")
+    args = parser.parse_args(argv)
+    
+    if args.archivo == '-':
+        urls = load_urls(sys.stdin)
+    else:
+        with open(args.archivo, encoding='utf-8') as f:
+            urls = load_urls(f)
+    
+    start = time.perf_counter()
+    approved = 0
+    for done, item in enumerate(run_fleet(urls, args.concurrency, max_connections=args.max_connections,
+                                          per_host=args.per_host), 1):
+        status = item.result['status'] if item.success else f"ERROR: {item.error}"
+        approved += item.success and item.result['status'] == 'APROBADO'
+        print(f"[{done}/{len(urls)}] {item.url} -> {status}", flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"{len(urls)} URLs en {elapsed:.1f} s ({len(urls) / elapsed:.1f} URLs/s), {approved} aprobadas",
+          file=sys.stderr)
+    return 0 if approved == len(urls) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
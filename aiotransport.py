@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Transporte HTTP no bloqueante para AsyncSecurityChecker, construido sobre
+los streams de asyncio (HTTP/1.1 con keep-alive, chunked y redirecciones).
+
+AsyncHTTPClient se comparte entre todos los escaneos de una flota: guarda
+las conexiones ociosas por host y limita las peticiones en vuelo en total
+y por host. AsyncTransport es la vista de un escaneo: envía y guarda sus
+cookies y lleva las métricas que se informan en details['transport'].
+A diferencia de HTTPTransport, no usa los proxies configurados en el entorno.
+"""
+
+import asyncio
+import email.parser
+import http.client
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+from transport import default_ssl_context, new_stats, summarize_stats
+
+# Peticiones simultáneas de toda la flota y por host
+MAX_CONNECTIONS = 256
+PER_HOST_CONNECTIONS = 8
+
+# Códigos sin cuerpo (además de las respuestas a HEAD)
+NO_BODY_CODES = (204, 304)
+MAX_HEADERS = 100
+
+class AsyncResponse:
+    """
+    Respuesta HTTP con la interfaz de PooledResponse, pero con read y close
+    asincrónicos. Al cerrarse libera su turno en el cliente y devuelve la
+    conexión al pool si el cuerpo se consumió completo.
+    """
+    
+    def __init__(self, status, reason, headers, url, reader, writer, pool_key, client, method, reusable):
+        self.status = status
+        self.reason = reason
+        self.url = url
+        self._headers = headers
+        self._reader = reader
+        self._writer = writer
+        self._pool_key = pool_key
+        self._client = client
+        self._reusable = reusable
+        self._released = False
+        self._chunked = False
+        self._remaining = None
+        self._chunk_left = 0
+        
+        if method == "HEAD" or status in NO_BODY_CODES or 100 <= status < 200:
+            self._done = True
+        elif 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            self._chunked, self._done = True, False
+        elif headers.get('Content-Length', '').strip().isdigit():
+            self._remaining = int(headers['Content-Length'])
+            self._done = self._remaining == 0
+        else:
+            # Sin longitud: el cuerpo termina al cerrarse la conexión
+            self._done, self._reusable = False, False
+    
+    def getcode(self):
+        return self.status
+    
+    def geturl(self):
+        return self.url
+    
+    def info(self):
+        return self._headers
+    
+    async def read(self, amt=None) -> bytes:
+        """Lee hasta amt bytes del cuerpo (todo si amt es None); menos solo al terminar el cuerpo"""
+        parts, size = [], 0
+        while not self._done and (amt is None or size < amt):
+            data = await self._read_some(self._client.CHUNK_SIZE if amt is None else amt - size)
+            parts.append(data)
+            size += len(data)
+        return b''.join(parts)
+    
+    async def _read_some(self, limit: int) -> bytes:
+        timeout = self._client.read_timeout
+        if self._chunked:
+            if self._chunk_left == 0:
+                line = await asyncio.wait_for(self._reader.readline(), timeout)
+                size = int(line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Trailers hasta la línea vacía
+                    while line not in (b'\r\n', b'\n', b''):
+                        line = await asyncio.wait_for(self._reader.readline(), timeout)
+                    self._done = True
+                    return b''
+                self._chunk_left = size
+            data = await asyncio.wait_for(self._reader.read(min(limit, self._chunk_left)), timeout)
+            if not data:
+                raise http.client.IncompleteRead(b'')
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                await asyncio.wait_for(self._reader.readexactly(2), timeout)
+            return data
+        
+        if self._remaining is not None:
+            data = await asyncio.wait_for(self._reader.read(min(limit, self._remaining)), timeout)
+            if not data:
+                raise http.client.IncompleteRead(b'', self._remaining)
+            self._remaining -= len(data)
+            self._done = self._remaining == 0
+            return data
+        
+        data = await asyncio.wait_for(self._reader.read(limit), timeout)
+        self._done = not data
+        return data
+    
+    async def close(self):
+        if self._released:
+            return
+        self._released = True
+        
+        reusable = self._reusable
+        if reusable and not self._done:
+            try:
+                await self.read(self._client.DRAIN_LIMIT)
+                reusable = self._done
+            except (OSError, asyncio.IncompleteReadError, http.client.HTTPException, ValueError):
+                reusable = False
+        self._client.release(self._pool_key, (self._reader, self._writer), reusable)
+
+class AsyncHTTPClient:
+    """
+    Pool de conexiones keep-alive por host compartido por los escaneos, con
+    un semáforo global (max_connections) y uno por host (per_host) sobre las
+    peticiones en vuelo. Debe usarse desde un único event loop.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    # Resto de cuerpo que se lee al cerrar una respuesta para poder reutilizar la conexión
+    DRAIN_LIMIT = 64 * 1024
+    
+    def __init__(self, max_connections=MAX_CONNECTIONS, per_host=PER_HOST_CONNECTIONS, pool_size=4,
+                 connect_timeout=10.0, read_timeout=10.0, ssl_context=None):
+        self.max_connections = max(1, max_connections)
+        self.per_host = max(1, per_host)
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context
+        self._slots = asyncio.Semaphore(self.max_connections)
+        self._host_slots: Dict[tuple, asyncio.Semaphore] = {}
+        self._idle: Dict[tuple, list] = {}
+    
+    async def acquire_slot(self, pool_key):
+        """Turno para una petición: primero el del host, para no ocupar uno global mientras se espera"""
+        semaphore = self._host_slots.get(pool_key)
+        if semaphore is None:
+            semaphore = self._host_slots.setdefault(pool_key, asyncio.Semaphore(self.per_host))
+        await semaphore.acquire()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            semaphore.release()
+            raise
+    
+    def release_slot(self, pool_key):
+        self._slots.release()
+        self._host_slots[pool_key].release()
+    
+    async def connect(self, pool_key, fresh=False) -> Tuple[tuple, bool, float]:
+        """Conexión (reader, writer) para el host, si es posible una ociosa del pool"""
+        if not fresh:
+            idle = self._idle.get(pool_key)
+            while idle:
+                connection = idle.pop()
+                if not connection[0].at_eof():
+                    return connection, True, 0.0
+                connection[1].close()
+        
+        scheme, host, port = pool_key
+        start = time.perf_counter()
+        if scheme == 'https':
+            ssl_context = self.ssl_context or default_ssl_context()
+            opening = asyncio.open_connection(host, port or 443, ssl=ssl_context, server_hostname=host,
+                                              limit=self.CHUNK_SIZE * 2)
+        else:
+            opening = asyncio.open_connection(host, port or 80, limit=self.CHUNK_SIZE * 2)
+        connection = await asyncio.wait_for(opening, self.connect_timeout)
+        return connection, False, time.perf_counter() - start
+    
+    def release(self, pool_key, connection, reusable):
+        """Devuelve la conexión al pool (o la cierra) y libera el turno de la petición"""
+        try:
+            if reusable:
+                idle = self._idle.setdefault(pool_key, [])
+                if len(idle) < self.pool_size:
+                    idle.append(connection)
+                    return
+            connection[1].close()
+        finally:
+            self.release_slot(pool_key)
+    
+    async def close(self):
+        """Cierra las conexiones ociosas del pool"""
+        idle, self._idle = self._idle, {}
+        writers = [writer for connections in idle.values() for _, writer in connections]
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+class AsyncTransport:
+    """
+    Peticiones de un escaneo sobre el cliente compartido: cookies del
+    escaneo, redirecciones y métricas con el formato de HTTPTransport.metrics.
+    """
+    
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 10
+    
+    def __init__(self, client: Optional[AsyncHTTPClient] = None, cookie_jar=None):
+        self.client = client
+        self.cookie_jar = cookie_jar
+        self.stats = new_stats()
+    
+    async def request(self, url, method="GET", headers=None) -> AsyncResponse:
+        """Ejecuta la petición siguiendo redirecciones; devuelve la respuesta final"""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = await self._send(url, method, headers or {})
+            location = response.info().get('Location')
+            if response.getcode() not in self.REDIRECT_CODES or not location:
+                return response
+            
+            await response.close()
+            url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(url).scheme not in ('http', 'https'):
+                raise urllib.error.URLError(f"Redirección a un esquema no soportado: {url}")
+            if response.getcode() == 303 or (response.getcode() in (301, 302) and method == "POST"):
+                method = "GET"
+            self.stats['redirects'] += 1
+        
+        raise urllib.error.URLError(f"Demasiadas redirecciones: {url}")
+    
+    async def _send(self, url, method, headers) -> AsyncResponse:
+        request = urllib.request.Request(url, headers=headers, method=method)
+        if self.cookie_jar is not None:
+            self.cookie_jar.add_cookie_header(request)
+        
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise urllib.error.URLError(f"URL no soportada: {url}")
+        pool_key = (parts.scheme, parts.hostname, parts.port)
+        target = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        payload = self._encode(method, target, parts.netloc.rpartition('@')[2], request)
+        
+        client = self.client
+        await client.acquire_slot(pool_key)
+        try:
+            connection, reused, elapsed = await client.connect(pool_key)
+            try:
+                head = await self._exchange(connection, payload)
+            except (ConnectionError, asyncio.IncompleteReadError, http.client.HTTPException):
+                connection[1].close()
+                if not reused:
+                    raise
+                # El servidor cerró la conexión ociosa: se reintenta una vez con una nueva
+                self.stats['retries'] += 1
+                connection, reused, elapsed = await client.connect(pool_key, fresh=True)
+                try:
+                    head = await self._exchange(connection, payload)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+        except BaseException:
+            client.release_slot(pool_key)
+            raise
+        
+        self.stats['requests'] += 1
+        self.stats['reused_connections' if reused else 'new_connections'] += 1
+        self.stats['connect_time'] += elapsed
+        version, status, reason, message = head
+        reusable = version == 'HTTP/1.1' and 'close' not in message.get('Connection', '').lower()
+        response = AsyncResponse(status, reason, message, url, connection[0], connection[1], pool_key,
+                                 client, method, reusable)
+        if self.cookie_jar is not None:
+            self.cookie_jar.extract_cookies(response, request)
+        return response
+    
+    @staticmethod
+    def _encode(method, target, host, request) -> bytes:
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}", "Accept-Encoding: identity"]
+        lines += (f"{header}: {value}" for header, value in request.header_items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+    
+    async def _exchange(self, connection, payload):
+        reader, writer = connection
+        timeout = self.client.read_timeout
+        writer.write(payload)
+        await asyncio.wait_for(writer.drain(), timeout)
+        
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if not line:
+                raise http.client.RemoteDisconnected("El servidor cerró la conexión sin responder")
+            try:
+                version, status, reason = (line.decode('latin-1').rstrip('\r\n').split(None, 2) + [''])[:3]
+                status = int(status)
+            except ValueError:
+                raise http.client.BadStatusLine(line.decode('latin-1', errors='replace'))
+            
+            lines = []
+            while True:
+                header = await asyncio.wait_for(reader.readline(), timeout)
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                lines.append(header)
+                if len(lines) > MAX_HEADERS:
+                    raise http.client.HTTPException(f"Más de {MAX_HEADERS} cabeceras")
+            # 100 Continue y otras respuestas informativas preceden a la respuesta final
+            if status != 100:
+                break
+        
+        message = email.parser.Parser(_class=http.client.HTTPMessage).parsestr(b''.join(lines).decode('latin-1'))
+        return version, status, reason, message
+    
+    def metrics(self) -> Dict:
+        """Métricas de reutilización de conexiones del escaneo"""
+        return summarize_stats(self.stats)
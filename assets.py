@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Descarga y análisis de los scripts y hojas de estilo referenciados por la
+página: banners y declaraciones de versión (chequeo 5), IPs y posibles
+credenciales (chequeo 14).
+
+Se piden en paralelo con el planificador de sondeos del escaneo y se leen
+por bloques hasta ASSET_MAX_BYTES. El contenido se identifica por su hash:
+si la base de huellas (fingerprints.py) ya lo conoce, no se vuelve a
+analizar. Los análisis quedan además en una caché de proceso indexada por
+URL y revalidada por ETag / Last-Modified: las bibliotecas de un CDN
+compartidas por las aplicaciones de un lote se descargan una sola vez.
+"""
+
+import codecs
+import hashlib
+import ipaddress
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fingerprints import ANALYSIS_VERSION
+from probes import Probe, ProbeResult
+
+# Recursos analizados por página y bytes leídos de cada uno
+MAX_ASSETS = 40
+ASSET_MAX_BYTES = 2 * 1024 * 1024
+ASSET_TTL = 3600.0
+
+IP_PATTERN = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+# password: "...", apiKey = '...', etc. (se informa el nombre, nunca el valor)
+CREDENTIAL_PATTERN = re.compile(
+    r'\b(password|passwd|pwd|secret|client_secret|api_?key|access_?key|auth_?token|private_?key)'
+    r'[\'"]?\s*[:=]\s*[\'"][^\'"\s]{4,}[\'"]', re.IGNORECASE)
+AWS_KEY_PATTERN = re.compile(r'\bAKIA[0-9A-Z]{16}\b')
+# Caracteres retenidos al final de cada bloque y contexto que se repite en el siguiente,
+# para no perder ni partir coincidencias entre bloques
+HOLD = 64
+OVERLAP = 256
+
+class AssetResult(ProbeResult):
+    """Análisis de un script u hoja de estilo (sin el contenido)"""
+    
+    __slots__ = ("versions", "ips", "credentials", "bytes_read", "truncated", "cached", "digest", "known")
+    
+    def __init__(self, key, url, status=None, headers=None, versions=None, ips=(), credentials=(),
+                 bytes_read=0, truncated=False, cached=False, digest=None, known=False, **kwargs):
+        super().__init__(key, url, status=status, headers=headers, **kwargs)
+        self.versions = versions or {}
+        self.ips = tuple(ips)
+        self.credentials = tuple(credentials)
+        self.bytes_read = bytes_read
+        self.truncated = truncated
+        self.cached = cached
+        # Hash del contenido y si su análisis salió de la base de huellas
+        self.digest = digest
+        self.known = known
+    
+    def copy(self, key: str, cached: bool = True) -> "AssetResult":
+        return AssetResult(key, self.url, self.status, self.headers, self.versions, self.ips,
+                           self.credentials, self.bytes_read, self.truncated, cached, self.digest, self.known,
+                           final_url=self.final_url)
+    
+    @property
+    def name(self) -> str:
+        """Nombre del archivo, para los detalles de los chequeos"""
+        return urllib.parse.urlsplit(self.url).path.rsplit('/', 1)[-1] or self.url
+
+class AssetScan:
+    """Análisis incremental del contenido de un recurso, bloque a bloque"""
+    
+    def __init__(self, detector):
+        self.detector = detector
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self.versions: Dict[str, str] = {}
+        self.ips: Dict[str, None] = {}
+        self.credentials: Dict[str, None] = {}
+        self.bytes_read = 0
+        self._tail = ''
+    
+    def feed(self, chunk: bytes, final: bool = False):
+        self.bytes_read += len(chunk)
+        text = self._tail + self.decoder.decode(chunk, final=final)
+        end = len(text) if final else self._safe_end(text)
+        self._scan(text[:end])
+        # El próximo bloque se analiza con el contexto anterior al corte (el nombre antes de una versión)
+        self._tail = text[max(0, end - OVERLAP):]
+    
+    @staticmethod
+    def _safe_end(text: str) -> int:
+        """
+        Corte del texto a analizar: se retienen los últimos caracteres y no se
+        parte una palabra, un número de versión ni una IP, que se completan
+        con el bloque siguiente
+        """
+        end = max(0, len(text) - HOLD)
+        limit = max(0, end - HOLD)
+        cut = end
+        while cut > limit and (text[cut - 1].isalnum() or text[cut - 1] in '.@-_'):
+            cut -= 1
+        return cut if cut > limit else end
+    
+    def _scan(self, text: str):
+        lower = text.lower()
+        for library, version in self.detector.scan_banner(lower).items():
+            self.versions.setdefault(library, version)
+        for library, version in self.detector.scan_script(lower).items():
+            self.versions.setdefault(library, version)
+        for ip in IP_PATTERN.findall(text):
+            if valid_ip(ip):
+                self.ips[ip] = None
+        for match in CREDENTIAL_PATTERN.finditer(text):
+            self.credentials[match.group(1).lower()] = None
+        for match in AWS_KEY_PATTERN.finditer(text):
+            self.credentials[f"clave AWS {match.group(0)[:8]}…"] = None
+    
+    def analysis(self) -> Dict:
+        return {'versions': self.versions, 'ips': list(self.ips), 'credentials': list(self.credentials)}
+
+def analyzer_id(detector) -> str:
+    """Identifica el análisis: la versión de las reglas de este módulo y los productos del detector"""
+    return f"{ANALYSIS_VERSION}:{detector.fingerprint}"
+
+class AssetBody:
+    """
+    Cuerpo de un recurso leído por bloques (hasta ASSET_MAX_BYTES) con su
+    hash SHA-256, que se calcula mientras se lee
+    """
+    
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.hash = hashlib.sha256()
+        self.bytes_read = 0
+        self.truncated = False
+    
+    def append(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self.hash.update(chunk)
+        self.bytes_read += len(chunk)
+    
+    def analyze(self, detector, fingerprints=None):
+        """(análisis, conocido): de la base de huellas si el contenido ya se analizó; si no, se recorre y se guarda"""
+        digest = self.hash.hexdigest()
+        analyzer = analyzer_id(detector)
+        if fingerprints is not None:
+            known = fingerprints.get(digest, analyzer)
+            if known is not None:
+                return known, True
+        scan = AssetScan(detector)
+        for chunk in self.chunks:
+            scan.feed(chunk)
+        scan.feed(b'', final=True)
+        analysis = scan.analysis()
+        if fingerprints is not None:
+            fingerprints.put(digest, analyzer, self.bytes_read, analysis)
+        return analysis, False
+    
+    def result(self, key: str, url: str, response, detector, fingerprints=None) -> AssetResult:
+        """AssetResult de la respuesta; solo se analizan las respuestas 200"""
+        status = response.getcode()
+        result = AssetResult(key, url, status, dict(response.info()), bytes_read=self.bytes_read,
+                             truncated=self.truncated, final_url=response.geturl())
+        if status == 200:
+            analysis, result.known = self.analyze(detector, fingerprints)
+            result.versions = analysis['versions']
+            result.ips = tuple(analysis['ips'])
+            result.credentials = tuple(analysis['credentials'])
+            result.digest = self.hash.hexdigest()
+        return result
+
+def valid_ip(text: str) -> bool:
+    """Descarta números con forma de IP que no lo son (octetos > 255) y los rangos sin sentido en un recurso"""
+    try:
+        address = ipaddress.ip_address(text)
+    except ValueError:
+        return False
+    return not (address.is_unspecified or address.is_multicast or address.is_reserved)
+
+def asset_urls(parser, page_url: str, allowed_domains: Iterable[str] = (), limit: int = MAX_ASSETS) -> List[str]:
+    """
+    Scripts externos y hojas de estilo de la página, del mismo origen o de
+    los dominios permitidos del checker (los CDN de bibliotecas comunes)
+    """
+    page_host = urllib.parse.urlsplit(page_url).netloc.lower()
+    candidates = [script.get('src') for script in parser.scripts]
+    candidates += [link.get('href') for link in parser.links
+                   if 'stylesheet' in (link.get('rel') or '').lower()
+                   or urllib.parse.urlsplit(link.get('href') or '').path.lower().endswith('.css')]
+    urls = []
+    for reference in candidates:
+        if not reference:
+            continue
+        url = urllib.parse.urljoin(page_url, reference.strip()).split('#', 1)[0]
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or url in urls:
+            continue
+        host = parts.netloc.lower()
+        if host != page_host and not any(domain in host for domain in allowed_domains):
+            continue
+        urls.append(url)
+        if len(urls) >= limit:
+            break
+    return urls
+
+def asset_probes(urls: Iterable[str]) -> List[Probe]:
+    return [Probe(f'asset:{url}', url, max_bytes=ASSET_MAX_BYTES) for url in urls]
+
+def conditional_headers(cached: Optional[AssetResult]) -> Dict[str, str]:
+    headers = {}
+    if cached is not None:
+        if cached.headers.get('ETag'):
+            headers['If-None-Match'] = cached.headers['ETag']
+        if cached.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = cached.headers['Last-Modified']
+    return headers
+
+class _Download:
+    """
+    Descarga en curso de un recurso. La esperan hilos (event) y tareas de
+    cualquier event loop (waiters: pares loop, future); finish se llama con
+    el lock de la caché tomado, el mismo con el que se registran las esperas.
+    """
+    
+    __slots__ = ("event", "waiters")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.waiters = []
+    
+    def finish(self):
+        self.event.set()
+        for loop, future in self.waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # event loop ya cerrado: nadie espera esa tarea
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+class AssetCache:
+    """
+    Caché LRU en memoria de los análisis por URL y analizador (analyzer_id:
+    un catálogo con otros productos detecta otras versiones en el mismo
+    recurso). Un análisis vigente se reutiliza sin tráfico; uno vencido se
+    revalida con una petición condicional. Si varios escaneos piden la misma
+    URL con el mismo analizador a la vez, la descarga la hace uno solo y los
+    demás esperan su resultado.
+    """
+    
+    def __init__(self, ttl: float = ASSET_TTL, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], _Download] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
+    
+    def _fresh(self, key: Tuple[str, str]):
+        """(análisis vigente o None, análisis vencido para revalidar o None); con el lock tomado"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        created, result = entry
+        if time.monotonic() - created < self.ttl:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return result, None
+        return None, result
+    
+    def _store(self, key: Tuple[str, str], result: AssetResult, stale: Optional[AssetResult]):
+        # Errores de red: no se guardan, el próximo escaneo vuelve a intentar
+        if result.status is None:
+            return
+        with self._lock:
+            if result.status == 304 and stale is not None:
+                self.stats['revalidated'] += 1
+                result = stale
+            else:
+                self.stats['misses'] += 1
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def load(self, probe: Probe, download, analyzer: str = '') -> AssetResult:
+        """
+        Análisis de probe.url hecho por analyzer (analyzer_id del detector);
+        download(probe, stale) hace la petición (condicional si hay stale)
+        """
+        key = (probe.url, analyzer)
+        while True:
+            with self._lock:
+                result, stale = self._fresh(key)
+                if result is not None:
+                    return result.copy(probe.key)
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = _Download()
+                    break
+            pending.event.wait()
+        try:
+            result = download(probe, stale)
+            self._store(key, result, stale)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).finish()
+        return stale.copy(probe.key) if result.status == 304 and stale is not None else result
+    
+    async def load_async(self, probe: Probe, download, analyzer: str = '') -> AssetResult:
+        """load para AsyncSecurityChecker: las esperas no bloquean el event loop"""
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        key = (probe.url, analyzer)
+        while True:
+            with self._lock:
+                result, stale = self._fresh(key)
+                if result is not None:
+                    return result.copy(probe.key)
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = _Download()
+                    break
+                # La descarga puede ser de un hilo o de otro event loop: avisa con call_soon_threadsafe
+                waiter = loop.create_future()
+                pending.waiters.append((loop, waiter))
+            await waiter
+        try:
+            result = await download(probe, stale)
+            self._store(key, result, stale)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).finish()
+        return stale.copy(probe.key) if result.status == 304 and stale is not None else result
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
+
+ASSET_CACHE = AssetCache()
+
+def summarize(results: List[ProbeResult]) -> Dict:
+    """Resumen para SecurityChecker.details['assets']"""
+    analyzed = [result for result in results if isinstance(result, AssetResult)]
+    return {
+        'requested': len(results),
+        'analyzed': sum(1 for result in analyzed if result.status == 200),
+        'cached': sum(1 for result in analyzed if result.cached),
+        'fingerprinted': sum(1 for result in analyzed if result.known and not result.cached),
+        'errors': sum(1 for result in results if not result.ok),
+        'bytes_read': sum(result.bytes_read for result in analyzed if not result.cached),
+    }
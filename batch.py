@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Análisis por lotes: ejecuta SecurityChecker sobre una lista de URLs con un
+pool de hilos o procesos y genera un informe consolidado
+"""
+
+import argparse
+import contextvars
+import csv
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from cache import cached_check, get_cache
+from checker import SecurityChecker
+from estandar import cargar_catalogo_desde_archivo
+from metrics import REGISTRY, start_metrics_server
+from report import build_report_data, generate_pdf_report
+
+REPORTS_DIR = os.environ.get('CHECKPOINT_REPORTS_DIR', 'reports')
+CSV_COLUMNS = ['url', 'estado', 'total', 'aprobadas', 'fallidas', 'pruebas_fallidas', 'error']
+
+class BatchItem:
+    """Resultado del análisis de una URL dentro de un lote"""
+    
+    __slots__ = ("index", "url", "success", "result", "performance")
+    
+    def __init__(self, index, url, success, result, performance=None):
+        self.index = index
+        self.url = url
+        self.success = success
+        self.result = result
+        # Tiempos del análisis (solo con la opción instrument del checker)
+        self.performance = performance
+    
+    @property
+    def error(self) -> Optional[str]:
+        return None if self.success else str(self.result)
+
+def load_urls(lines: Iterable[str]) -> List[str]:
+    """
+    Lee URLs de un archivo de texto o CSV (una por línea, primera columna).
+    Ignora líneas vacías, comentarios (#) y duplicados, conservando el orden.
+    """
+    urls, seen = [], set()
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='ignore')
+        line = line.strip().lstrip('\ufeff')
+        if not line or line.startswith('#'):
+            continue
+        
+        url = re.split(r'[,;\t]', line, maxsplit=1)[0].strip().strip('"')
+        if not url or url.lower() == 'url':
+            continue
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+def scan_url(index: int, url: str, options: Optional[Dict] = None, use_cache: bool = False,
+             incremental: bool = False) -> BatchItem:
+    """
+    Analiza una URL; se define a nivel de módulo para poder usarse con procesos.
+    Con incremental se reescanea a partir del resultado guardado en la caché.
+    """
+    checker = None
+    try:
+        checker = SecurityChecker(url, **(options or {}))
+        if use_cache or incremental:
+            # Con procesos, cada uno tiene su caché en memoria y comparten la del disco
+            success, result, _ = cached_check(checker, get_cache(), incremental=incremental)
+        else:
+            success, result = checker.check_security()
+    except Exception as e:
+        success, result = False, f"Error durante la evaluación: {str(e)}"
+    return BatchItem(index, url, success, result, checker.details.get('performance') if checker else None)
+
+def run_batch(urls: List[str], workers: int = 4, mode: str = "thread",
+              options: Optional[Dict] = None, use_cache: bool = False,
+              incremental: bool = False) -> Iterator[BatchItem]:
+    """
+    Ejecuta el análisis de todas las URLs y entrega cada resultado apenas
+    termina (no en el orden de entrada; usar BatchItem.index para ordenarlos)
+    """
+    if mode not in ("thread", "process", "async"):
+        raise ValueError(f"Modo de ejecución desconocido: {mode}")
+    
+    if mode == "async":
+        # Un solo hilo con un event loop; workers es la cantidad de escaneos simultáneos
+        from aiochecker import run_fleet
+        yield from run_fleet(urls, concurrency=workers, options=options, use_cache=use_cache,
+                             incremental=incremental)
+        return
+    
+    if mode == "process":
+        pool_class, submit_args = ProcessPoolExecutor, ()
+    else:
+        # Los hilos del pool no heredan el contexto: cada análisis corre en una
+        # copia del contexto de quien llama, con su catálogo de sesión
+        pool_class, submit_args = ThreadPoolExecutor, (contextvars.copy_context().run,)
+    with pool_class(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(*submit_args, scan_url, i, url, options, use_cache, incremental)
+                   for i, url in enumerate(urls)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _csv_row(item: BatchItem) -> Dict:
+    if not item.success:
+        return {'url': item.url, 'estado': 'ERROR', 'error': item.error}
+    
+    result = item.result
+    return {
+        'url': item.url,
+        'estado': result['status'],
+        'total': result['total'],
+        'aprobadas': result['passed'],
+        'fallidas': result['failed'],
+        'pruebas_fallidas': '; '.join(name for name, status, _ in result['checks'] if not status),
+        'error': ''
+    }
+
+def build_batch_json(items: List[BatchItem], project: Dict) -> Dict:
+    """Informe consolidado del lote, con el mismo esquema por URL que el JSON individual"""
+    items = sorted(items, key=lambda item: item.index)
+    approved = sum(1 for item in items if item.success and item.result['status'] == 'APROBADO')
+    errors = sum(1 for item in items if not item.success)
+    
+    return {
+        'fecha': datetime.now().isoformat(),
+        'proyecto': project,
+        'total_urls': len(items),
+        'aprobadas': approved,
+        'no_aprobadas': len(items) - approved - errors,
+        'errores': errors,
+        'resultados': [
+            build_report_data(item.url, item.result, project, item.performance) if item.success
+            else {'url': item.url, 'error': item.error}
+            for item in items
+        ]
+    }
+
+def build_batch_csv(items: List[BatchItem]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for item in sorted(items, key=lambda item: item.index):
+        writer.writerow(_csv_row(item))
+    return buffer.getvalue()
+
+def pdf_filename(url: str) -> str:
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', re.sub(r'^https?://', '', url)).strip('_')
+    return f"checkpoint_seguridad_{slug[:80] or 'url'}.pdf"
+
+def write_batch_reports(items: List[BatchItem], output_dir: str, project: Optional[Dict] = None) -> Dict:
+    """
+    Escribe el JSON y el CSV consolidados y un PDF por cada URL analizada.
+    Devuelve las rutas generadas.
+    """
+    project = project or {}
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    json_path = os.path.join(output_dir, f"checkpoint_lote_{stamp}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(build_batch_json(items, project), f, indent=2, ensure_ascii=False)
+    
+    csv_path = os.path.join(output_dir, f"checkpoint_lote_{stamp}.csv")
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(build_batch_csv(items))
+    
+    pdf_paths = []
+    for item in sorted(items, key=lambda item: item.index):
+        if not item.success:
+            continue
+        project_info = {
+            'estado': item.result['status'],
+            'autor': project.get('autor') or 'Sistema Automático',
+            'proyecto': project.get('nombre') or 'N/A',
+            'ticket': project.get('ticket') or 'N/A',
+            'version': project.get('version') or '01.00.00'
+        }
+        try:
+            pdf_buffer = generate_pdf_report(item.url, item.result, project_info)
+        except ImportError:
+            break
+        pdf_path = os.path.join(output_dir, pdf_filename(item.url))
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
+        pdf_paths.append(pdf_path)
+    
+    return {'json': json_path, 'csv': csv_path, 'pdf': pdf_paths}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Checkpoint de Seguridad GCABA - análisis por lotes")
+    parser.add_argument("archivo", help="Archivo .txt o .csv con una URL por línea ('-' para stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Cantidad de análisis simultáneos")
+    parser.add_argument("-m", "--mode", choices=["thread", "process", "async"], default="thread",
+                        help="Ejecutar con un pool de hilos, de procesos o con asyncio (flotas grandes)")
+    parser.add_argument("-o", "--output", default=REPORTS_DIR, help="Directorio de salida de los informes")
+    parser.add_argument("--proyecto", default="", help="Nombre del proyecto")
+    parser.add_argument("--autor", default="", help="Email del autor")
+    parser.add_argument("--ticket", default="", help="Ticket JIRA")
+    parser.add_argument("--cache", action="store_true", help="Reutilizar resultados recientes de la caché de escaneos")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reescanear a partir del resultado guardado en la caché: solo se recalculan los "
+                             "chequeos cuyas cabeceras, cuerpo o sondeos cambiaron")
+    parser.add_argument("--estandar", help="Archivo de estándares (.txt o .pdf) a usar en lugar del catálogo predeterminado")
+    parser.add_argument("--sin-recursos", action="store_true",
+                        help="No descargar los scripts y hojas de estilo de las páginas (chequeos 5 y 14)")
+    parser.add_argument("--rendimiento", action="store_true",
+                        help="Medir los tiempos de cada análisis (se agregan al JSON consolidado)")
+    parser.add_argument("--prometheus", type=int, metavar="PUERTO",
+                        help="Exponer las métricas del lote en http://127.0.0.1:PUERTO/metrics (implica --rendimiento)")
+    args = parser.parse_args(argv)
+    
+    if args.archivo == '-':
+        urls = load_urls(sys.stdin)
+    else:
+        with open(args.archivo, encoding='utf-8') as f:
+            urls = load_urls(f)
+    
+    if not urls:
+        print("No se encontraron URLs para analizar", file=sys.stderr)
+        return 2
+    
+    project = {'nombre': args.proyecto, 'autor': args.autor, 'ticket': args.ticket, 'version': '01.00.00'}
+    # Los datos del proyecto acompañan cada escaneo en el historial
+    options = {'project': project}
+    if args.estandar:
+        # Los procesos no comparten memoria: reciben la ruta y cada uno compila (una vez) el catálogo
+        try:
+            catalogo = cargar_catalogo_desde_archivo(args.estandar)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo cargar el archivo de estándares: {e}", file=sys.stderr)
+            return 2
+        options['catalogo'] = args.estandar if args.mode == "process" else catalogo
+    if args.sin_recursos:
+        options['fetch_assets'] = False
+    if args.rendimiento or args.prometheus is not None:
+        options['instrument'] = True
+    if args.prometheus is not None:
+        start_metrics_server(args.prometheus)
+    
+    items = []
+    for item in run_batch(urls, workers=args.workers, mode=args.mode, options=options, use_cache=args.cache,
+                          incremental=args.incremental):
+        items.append(item)
+        # Los resultados llegan al proceso principal en todos los modos: el registro los acumula acá
+        REGISTRY.observe(item.performance, item.success)
+        status = item.result['status'] if item.success else f"ERROR: {item.error}"
+        print(f"[{len(items)}/{len(urls)}] {item.url} -> {status}", flush=True)
+    
+    paths = write_batch_reports(items, args.output, project)
+    print(f"Informe consolidado: {paths['json']}, {paths['csv']} ({len(paths['pdf'])} PDF)")
+    
+    return 0 if all(item.success and item.result['status'] == 'APROBADO' for item in items) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
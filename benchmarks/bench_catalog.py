@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark del catálogo de versiones homologadas: consultas por segundo de
+la implementación original (re-parseo de cada versión y reconstrucción del
+mapeo de alias en cada llamada) frente al catálogo compilado, y de la
+verificación elemento por elemento frente a verificar_lote.
+
+Uso:
+    python benchmarks/bench_catalog.py [--lookups 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import estandar
+from estandar import VERSIONES_HOMOLOGADAS, obtener_catalogo
+
+def legacy_normalizar(nombre):
+    """Normalización original: arma el diccionario de alias en cada llamada"""
+    nombre = nombre.lower().strip()
+    mapeo = {
+        "node.js": "nodejs", "node js": "nodejs", "react.js": "react", "vue.js": "vue",
+        "angular.js": "angular", "next.js": "nextjs", "nest.js": "nestjs", "express.js": "express",
+        "fastify.js": "fastify", "spring boot": "springboot", "chart.js": "chartjs",
+        "font awesome": "fontawesome", "font-awesome": "fontawesome", "open jdk": "openjdk",
+        "red hat": "redhat", "red hat enterprise linux": "rhel",
+    }
+    return mapeo.get(nombre, nombre)
+
+def legacy_compatible(version_detectada, versiones_homologadas):
+    """Verificación original: convierte a int cada versión homologada en cada llamada"""
+    if not version_detectada or not versiones_homologadas:
+        return False
+    if version_detectada in versiones_homologadas:
+        return True
+    try:
+        partes_detectada = [int(x) for x in version_detectada.split('.')]
+        for version_homologada in versiones_homologadas:
+            try:
+                partes_homologada = [int(x) for x in version_homologada.split('.')]
+                if partes_detectada[0] == partes_homologada[0]:
+                    if len(partes_detectada) >= 2 and len(partes_homologada) >= 2:
+                        if partes_detectada[1] == partes_homologada[1]:
+                            return True
+                    else:
+                        return True
+            except ValueError:
+                continue
+    except ValueError:
+        pass
+    return False
+
+def build_queries(count):
+    rng = random.Random(42)
+    names = list(VERSIONES_HOMOLOGADAS) + ['Node.js', 'Chart.js', 'Spring Boot', 'desconocido']
+    versions = [v for lista in VERSIONES_HOMOLOGADAS.values() for v in lista] + ['2.0.0', '4.1.3', '17.0.1', '1.0']
+    return [(rng.choice(names), rng.choice(versions)) for _ in range(count)]
+
+def rate(func, queries):
+    start = time.perf_counter()
+    func(queries)
+    return len(queries) / (time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=200000, help="Cantidad de consultas por medición")
+    args = parser.parse_args(argv)
+    
+    queries = build_queries(args.lookups)
+    catalogo = obtener_catalogo()
+    
+    def legacy(queries):
+        for nombre, version in queries:
+            lista = VERSIONES_HOMOLOGADAS.get(legacy_normalizar(nombre))
+            if lista:
+                legacy_compatible(version, lista)
+    
+    def compiled(queries):
+        for nombre, version in queries:
+            producto = catalogo.producto(estandar.normalizar_nombre_software(nombre))
+            if producto is not None:
+                producto.es_compatible(version)
+    
+    def compiled_raw(queries):
+        es_compatible = catalogo.es_compatible
+        for nombre, version in queries:
+            es_compatible(nombre, version)
+    
+    def buscar(queries):
+        for nombre, version in queries:
+            estandar.buscar_version_homologada(f"{nombre} {version}")
+    
+    # Las dos implementaciones deben dar el mismo resultado
+    for nombre, version in queries[:5000]:
+        lista = VERSIONES_HOMOLOGADAS.get(legacy_normalizar(nombre))
+        esperado = bool(lista) and legacy_compatible(version, lista)
+        assert catalogo.es_compatible(estandar.normalizar_nombre_software(nombre), version) == esperado, (nombre, version)
+    
+    print(f"Catálogo: {len(catalogo)} productos, {len(catalogo.alias)} alias")
+    legacy_rate = rate(legacy, queries)
+    compiled_rate = rate(compiled, queries)
+    print(f"Original (normalizar + verificar):  {legacy_rate:>12,.0f} consultas/s")
+    print(f"Compilado (normalizar + verificar): {compiled_rate:>12,.0f} consultas/s  ({compiled_rate / legacy_rate:4.1f}x)")
+    print(f"Compilado (nombre ya normalizado):  {rate(compiled_raw, queries):>12,.0f} consultas/s")
+    buscar_rate = rate(buscar, queries[:args.lookups // 4])
+    print(f"buscar_version_homologada:          {buscar_rate:>12,.0f} consultas/s")
+    
+    textos = [f"{nombre} {version}" for nombre, version in queries]
+    lote_textos = rate(estandar.verificar_lote, textos)
+    lote_pares = rate(estandar.verificar_lote, queries)
+    motor = "numpy" if estandar.NUMPY_DISPONIBLE else "Python"
+    print(f"verificar_lote ({motor}, textos):     {lote_textos:>12,.0f} consultas/s  ({lote_textos / buscar_rate:4.1f}x)")
+    print(f"verificar_lote ({motor}, pares):      {lote_pares:>12,.0f} consultas/s  ({lote_pares / buscar_rate:4.1f}x)")
+
+if __name__ == "__main__":
+    main()
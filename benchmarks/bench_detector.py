@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de detección de versiones y de parseo de HTMLTagParser sobre
+páginas SPA grandes generadas sintéticamente.
+
+Uso:
+    python benchmarks/bench_detector.py [--scripts 2000] [--inline-kb 2048]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker import DEFAULT_DETECTOR, HTMLTagParser
+
+LEGACY_LIBS = ['jquery', 'bootstrap', 'react', 'angular', 'vue']
+
+def legacy_scan_url(src):
+    """Detección original: una expresión regular nueva por biblioteca y por tag"""
+    found = {}
+    src = src.lower()
+    for lib in LEGACY_LIBS:
+        version_match = re.search(rf'{lib}[.-](\d+\.\d+\.\d+)', src, re.IGNORECASE)
+        if version_match:
+            found[lib] = version_match.group(1)
+    return found
+
+def legacy_scan_script(content):
+    found = {}
+    content = content.lower()
+    for lib in LEGACY_LIBS:
+        version_match = re.search(rf'{lib}[\s\'"]?version[\s\'"]?[:=]\s*[\'"](\d+\.\d+\.\d+)[\'"]', content, re.IGNORECASE)
+        if version_match:
+            found[lib] = version_match.group(1)
+    return found
+
+def build_spa_page(scripts: int, inline_kb: int) -> str:
+    """Página tipo SPA: muchos chunks con hash, algunas bibliotecas versionadas y un bundle inline grande"""
+    parts = ['<html><head>']
+    libs = ['jquery-3.6.4.min.js', 'bootstrap-5.3.0.bundle.js', 'vue@3.4.0/dist/vue.js', 'lodash-4.17.21.js']
+    for i in range(scripts):
+        if i % 50 == 0:
+            parts.append(f'<script src="https://cdn.example.com/{libs[(i // 50) % len(libs)]}"></script>')
+        else:
+            parts.append(f'<script src="/static/js/chunk.{i:05d}.a1b2c3d4.js"></script>')
+        if i % 10 == 0:
+            parts.append(f'<link rel="stylesheet" href="/static/css/chunk.{i:05d}.e5f6.css">')
+    
+    filler = 'function f(a,b){return a.map(function(x){return x*b})};var config={api:"/api/v1",retries:3};'
+    bundle = filler * max(1, (inline_kb * 1024) // len(filler))
+    parts.append(f'<script>{bundle}window.app={{reactVersion: "18.2.0"}};</script>')
+    parts.append('</head><body><div id="root"></div></body></html>')
+    return ''.join(parts)
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scripts", type=int, default=2000, help="Cantidad de tags <script src>")
+    parser.add_argument("--inline-kb", type=int, default=2048, help="Tamaño del script inline en KB")
+    args = parser.parse_args(argv)
+    
+    page = build_spa_page(args.scripts, args.inline_kb)
+    urls = re.findall(r'(?:src|href)="([^"]+)"', page)
+    inline = page[page.rindex('<script>') + 8:page.rindex('</script>')]
+    size_mb = len(page.encode()) / 1e6
+    
+    print(f"Página sintética: {size_mb:.2f} MB, {len(urls)} URLs, script inline de {len(inline) / 1e6:.2f} MB")
+    print(f"Bibliotecas en el detector: {len(DEFAULT_DETECTOR.names)}")
+    
+    legacy_urls = timed(lambda: [legacy_scan_url(u) for u in urls])
+    new_urls = timed(lambda: [DEFAULT_DETECTOR.scan_url(u.lower()) for u in urls])
+    print(f"URLs   - original: {legacy_urls * 1000:8.2f} ms   detector: {new_urls * 1000:8.2f} ms   ({legacy_urls / new_urls:5.1f}x)")
+    
+    legacy_inline = timed(lambda: legacy_scan_script(inline))
+    new_inline = timed(lambda: DEFAULT_DETECTOR.scan_script(inline.lower()))
+    print(f"Inline - original: {legacy_inline * 1000:8.2f} ms   detector: {new_inline * 1000:8.2f} ms   ({legacy_inline / new_inline:5.1f}x)")
+    
+    def parse():
+        html_parser = HTMLTagParser()
+        html_parser.feed(page)
+        return html_parser
+    
+    parse_time = timed(parse, repeat=3)
+    detected = parse().detected_versions
+    print(f"HTMLTagParser.feed: {parse_time * 1000:8.2f} ms  ({size_mb / parse_time:6.1f} MB/s)")
+    print(f"Versiones detectadas: {detected}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark del índice de palabras clave: tiempo de los chequeos de contenido
+según el tamaño de la página, comparado con la búsqueda original (una copia
+en minúsculas y un recorrido completo del documento por cada palabra clave).
+
+Uso:
+    python benchmarks/bench_page_index.py [--sizes-kb 64 512 2048 8192]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker import SecurityChecker
+from pageindex import PageIndex
+
+def legacy_scan(content):
+    """Chequeos originales: cada grupo vuelve a bajar a minúsculas y recorrer el documento"""
+    found = {}
+    for group, keywords in SecurityChecker.KEYWORD_GROUPS.items():
+        found[group] = any(keyword in content.lower() for keyword in keywords)
+    return found
+
+def index_scan(content):
+    page = PageIndex(SecurityChecker.MATCHER)
+    for start in range(0, len(content), SecurityChecker.CHUNK_SIZE):
+        page.feed(content[start:start + SecurityChecker.CHUNK_SIZE])
+    page.finish()
+    return {group: page.has_any(group) for group in SecurityChecker.KEYWORD_GROUPS}
+
+def build_page(size_kb: int) -> str:
+    """Página sin palabras clave salvo al final, el peor caso para la búsqueda original"""
+    filler = '<div class="card"><p>Trámites y servicios de la Ciudad</p><a href="/tramites">Ver más</a></div>\n'
+    body = filler * max(1, (size_kb * 1024) // len(filler))
+    return f'<html><body>{body}<form><input type="password"> Iniciar sesión</form></body></html>'
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[64, 512, 2048, 8192], help="Tamaños de página en KB")
+    args = parser.parse_args(argv)
+    
+    keywords = len(SecurityChecker.MATCHER.keywords)
+    print(f"Palabras clave indexadas: {keywords} en {len(SecurityChecker.KEYWORD_GROUPS)} grupos")
+    print(f"{'Tamaño':>10}  {'original':>12}  {'índice':>12}  {'MB/s índice':>12}  {'mejora':>7}")
+    
+    for size_kb in args.sizes_kb:
+        page = build_page(size_kb)
+        assert legacy_scan(page) == index_scan(page)
+        legacy = timed(lambda: legacy_scan(page))
+        indexed = timed(lambda: index_scan(page))
+        size_mb = len(page) / 1e6
+        print(f"{size_kb:>7} KB  {legacy * 1000:>9.2f} ms  {indexed * 1000:>9.2f} ms  {size_mb / indexed:>12.1f}  {legacy / indexed:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extraer_version dirigido por tabla: primero verifica cada caso
+de la tabla y luego mide extracciones por segundo de la implementación
+original (cinco expresiones regulares en orden) frente al patrón único
+precompilado: sin memo (textos distintos, con una o con varias versiones
+candidatas que hay que desempatar) y con memo (textos repetidos, como en
+un SBOM o en las páginas de un mismo sitio).
+
+Uso:
+    python benchmarks/bench_version.py [--textos 200000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from estandar import extraer_version
+
+# (texto, versión esperada, versión de la implementación original)
+CASOS = [
+    ("jquery-3.6.4.min.js", "3.6.4", "3.6.4"),
+    ("bootstrap 5.3.0", "5.3.0", "5.3.0"),
+    ("angular version 17.3.12", "17.3.12", "17.3.12"),
+    ("react v18.2.0", "18.2.0", "18.2.0"),
+    ("python 3.11", "3.11", "3.11"),
+    ("vue3", "3", "3"),
+    ("vue@3.4.0/dist/vue.js", "3.4.0", "3.4.0"),
+    ("software sin version", None, None),
+    ("oracle 19c", "19c", "19"),
+    ("openssl 1.1.1k", "1.1.1k", "1.1.1"),
+    ("1.0.0-beta.1+build.5", "1.0.0-beta.1+build.5", "1.0.0"),
+    ("angular 17.0.0-next.3", "17.0.0-next.3", "17.0.0"),
+    ("spring-boot-3.2.0-SNAPSHOT.jar", "3.2.0-snapshot", "3.2.0"),
+    ("jquery-3.6.4-min.js", "3.6.4", "3.6.4"),
+    ("Windows 10 v1809", "1809", "10"),
+    ("Versión: 2.1", "2.1", "2.1"),
+    ("3rd party 2", "2", "3"),
+]
+
+def legacy_extraer_version(texto):
+    """Implementación original: cinco patrones probados en orden sobre todo el texto"""
+    patrones = [
+        r'(\d+\.\d+\.\d+)',
+        r'(\d+\.\d+)',
+        r'(\d+)',
+        r'v(\d+\.\d+\.\d+)',
+        r'version\s*(\d+\.\d+\.\d+)',
+    ]
+    for patron in patrones:
+        match = re.search(patron, texto, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+def build_texts(count, distinct, candidates=1):
+    """Textos al estilo de nombres de archivo y SBOM; con candidates=2 llevan además un número suelto"""
+    rng = random.Random(7)
+    names = ['jquery', 'bootstrap', 'react', 'angular', 'node', 'oracle', 'openssl', 'spring-boot']
+    forms = ['{n}-{v}.min.js', '{n} {v}', '{n} v{v}', '{n} version {v}', '{n}@{v}/dist/{n}.js', '{n}-{v}-rc.1']
+    pool = []
+    for i in range(distinct):
+        version = f"{rng.randint(0, 30)}.{rng.randint(0, 20)}.{rng.randint(0, 99)}"
+        pool.append(rng.choice(forms).format(n=rng.choice(names), v=version) + (f' #{i}' if candidates > 1 else ''))
+    return [rng.choice(pool) for _ in range(count)]
+
+def rate(func, texts):
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return len(texts) / (time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--textos", type=int, default=200000, help="Cantidad de extracciones por medición")
+    args = parser.parse_args(argv)
+    
+    errores = 0
+    for texto, esperado, original in CASOS:
+        obtenido = extraer_version(texto)
+        estado = "ok" if obtenido == esperado else "ERROR"
+        errores += obtenido != esperado
+        cambio = "" if original == esperado else f"  (antes: {original})"
+        print(f"  {estado:5} {texto!r:36} -> {obtenido!r}{cambio}")
+        assert legacy_extraer_version(texto) == original, texto
+    if errores:
+        sys.exit(f"{errores} casos de la tabla fallaron")
+    
+    print(f"{'':32}{'original':>12}{'patrón único':>14}")
+    for titulo, candidatas in (("Una candidata", 1), ("Varias candidatas", 2)):
+        distintos = build_texts(args.textos, args.textos, candidatas)
+        legacy_rate = rate(legacy_extraer_version, distintos)
+        extraer_version.cache_clear()
+        cold_rate = rate(extraer_version, distintos)
+        print(f"{titulo + ' (textos/s)':32}{legacy_rate:>12,.0f}{cold_rate:>14,.0f}  ({cold_rate / legacy_rate:4.1f}x)")
+    
+    repetidos = build_texts(args.textos, 500)
+    legacy_rate = rate(legacy_extraer_version, repetidos)
+    extraer_version.cache_clear()
+    warm_rate = rate(extraer_version, repetidos)
+    print(f"{'500 textos repetidos (memo)':32}{legacy_rate:>12,.0f}{warm_rate:>14,.0f}  ({warm_rate / legacy_rate:4.1f}x)")
+    print(f"Memo: {extraer_version.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Sitios de prueba para los benchmarks: páginas generadas de forma
+determinista y un servidor HTTP local que las sirve en lugar de los sitios
+reales, para que los tiempos sean reproducibles.
+
+Sitios:
+    /pequena/       página institucional chica (unos 8 KB)
+    /spa/           SPA de 5 MB: bundles inline, JSON de estado y muchos scripts
+    /formularios/   página con cientos de formularios, inputs y scripts
+    /lenta/         página chica; con FixtureServer(delay=SLOW_DELAY) todas las
+                    respuestas del servidor, incluidos los sondeos, se demoran
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+# Demora de cada respuesta del sitio lento (segundos)
+SLOW_DELAY = 0.2
+
+LIBRARIES = [('jquery', '3.6.4'), ('bootstrap', '5.3.0'), ('react', '18.2.0'), ('vue', '3.4.21'),
+             ('angular', '17.3.0'), ('lodash', '4.17.21'), ('moment', '2.29.4'), ('chart', '4.4.1')]
+
+def small_page() -> str:
+    cards = ''.join(f'<div class="card"><h3>Trámite {i}</h3><p>Información sobre el trámite {i} '
+                    f'de la Ciudad.</p><a href="/tramites/{i}">Ver más</a></div>\n' for i in range(40))
+    return f"""<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>Servicios</title>
+<link rel="stylesheet" href="/css/bootstrap-5.3.0.min.css">
+<script src="/js/jquery-3.6.4.min.js"></script></head>
+<body><header><nav><a href="/">Inicio</a><a href="/login">Iniciar sesión</a></nav></header>
+<main>{cards}</main><footer>Buenos Aires Ciudad</footer></body></html>"""
+
+def spa_page(size: int = 5 * 1024 * 1024) -> str:
+    """SPA del tamaño pedido: la mayor parte son bundles inline y el estado inicial en JSON"""
+    head = ''.join(f'<script src="/static/js/{name}-{version}.min.js"></script>\n' for name, version in LIBRARIES)
+    chunks = ''.join(f'<script src="/static/js/chunk-{i:04d}.{i * 7919 % 100000:05x}.js" defer></script>\n'
+                     for i in range(400))
+    module = ('function m{0}(e,t,n){{"use strict";var r=n({0});e.exports=function(o){{return r.render(o,'
+              '{{id:"componente-{0}",version:"1.{0}.0"}})}}}}\n')
+    state = '{"items":[' + ','.join(f'{{"id":{i},"nombre":"Elemento {i}","activo":true}}' for i in range(200)) + ']}'
+    parts = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>App</title>\n{head}</head><body>'
+             f'<div id="root"></div>\n{chunks}<script>window.__STATE__={state};</script>\n<script>']
+    total, i = sum(len(part) for part in parts), 0
+    while total < size - 64:
+        line = module.format(i)
+        parts.append(line)
+        total += len(line)
+        i += 1
+    parts.append('</script></body></html>')
+    return ''.join(parts)
+
+def forms_page(forms: int = 300) -> str:
+    """Página con muchos formularios, campos con validación y scripts inline"""
+    blocks = []
+    for i in range(forms):
+        blocks.append(f"""<form id="f{i}" action="/enviar/{i}" method="post" onsubmit="return validar{i}()">
+  <label for="nombre{i}">Nombre</label><input type="text" id="nombre{i}" name="nombre" required maxlength="80">
+  <input type="email" name="email" pattern="[^@]+@[^@]+" required>
+  <select name="opcion"><option value="1">Uno</option><option value="2">Dos</option></select>
+  <textarea name="comentario" rows="3"></textarea>
+  {'<input type="file" name="adjunto" accept=".pdf">' if i % 10 == 0 else ''}
+  <button type="submit">Enviar</button>
+</form>
+<script>function validar{i}(){{var f=document.getElementById("f{i}");return f.checkValidity();}}</script>
+""")
+    return f"""<!DOCTYPE html><html><head><title>Formularios</title>
+<script src="/js/jquery-3.6.4.min.js"></script><script src="/js/vue-3.4.21.js"></script>
+<script>var config={{version:"2.1.0",captcha:"recaptcha"}};</script></head>
+<body><div class="g-recaptcha" data-sitekey="clave"></div>{''.join(blocks)}</body></html>"""
+
+PAGES: Dict[str, str] = {}
+
+def page(name: str) -> bytes:
+    """Contenido del sitio (se genera una vez por proceso)"""
+    if name not in PAGES:
+        builders = {'pequena': small_page, 'spa': spa_page, 'formularios': forms_page, 'lenta': small_page}
+        PAGES[name] = builders[name]()
+    return PAGES[name].encode('utf-8')
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Sirve los sitios de prueba; cualquier otra ruta de un sitio responde 404"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self, send_body=True):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        site, _, rest = self.path.lstrip('/').partition('/')
+        if site in ('pequena', 'spa', 'formularios', 'lenta') and rest in ('', 'index.html'):
+            status, body = 200, page(site)
+        else:
+            status, body = 404, b"<html><body>No encontrado</body></html>"
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Frame-Options', 'SAMEORIGIN')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer:
+    """Servidor local de los sitios de prueba, en un hilo de fondo"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, delay: float = 0.0):
+        self.server = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.server.daemon_threads = True
+        self.server.delay = delay
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def url(self, site: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{site}/"
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks con línea base: throughput de HTMLTagParser, latencia de
+run_checks, tiempo de check_security de punta a punta contra los sitios de
+prueba locales (fixtures.py), tasa de consultas al catálogo de estandar y
+latencia de las consultas del historial de escaneos.
+
+Cada medición se compara con benchmarks/baseline.json; si alguna empeora
+más que la tolerancia, la suite lo informa como REGRESIÓN y termina con
+código 1. Los tiempos de CPU se normalizan con una carga de calibración
+medida en cada corrida, de modo que la línea base sirva en otra máquina
+más rápida o más lenta (los tiempos de red del sitio lento no se escalan).
+
+Uso:
+    python benchmarks/suite.py                 # comparar con la línea base
+    python benchmarks/suite.py --save          # medir y guardar la línea base
+    python benchmarks/suite.py --only parser. estandar.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import estandar
+from checker import HTMLTagParser, SecurityChecker
+from fixtures import SLOW_DELAY, FixtureServer, page
+from history import HistoryDB
+from pageindex import PageIndex
+from probes import ProbeBatch, ProbeResult
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+TOLERANCE = 0.30
+SITES = ('pequena', 'spa', 'formularios')
+# Rutas sondeadas en los escaneos de punta a punta: pocas, para que la suite dure segundos
+PROBE_PATHS = ['/admin', '/backup', '/config', '/logs', '/uploads', '/.git/config', '/icons', '/api']
+
+class Measurement(NamedTuple):
+    name: str
+    value: float
+    unit: str
+    # True si un valor mayor es mejor (throughput); False para tiempos
+    higher_is_better: bool
+    # Se normaliza con la calibración de CPU (no para tiempos dominados por la red)
+    cpu_bound: bool = True
+
+def best_of(func: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Segundos de una carga fija de Python puro (diccionarios, cadenas y
+    aritmética), sin el recolector de basura para que no dependa de cuánta
+    memoria ocuparon los benchmarks anteriores
+    """
+    def work():
+        counts = {}
+        for i in range(200000):
+            key = f"k{i % 997}"
+            counts[key] = counts.get(key, 0) + i * 3 // 7
+        return sorted(counts.items())
+    
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return best_of(work, repeat)
+    finally:
+        if enabled:
+            gc.enable()
+
+def bench_parser(repeat: int) -> List[Measurement]:
+    results = []
+    for site in SITES:
+        html = page(site).decode('utf-8')
+        
+        def parse():
+            parser = HTMLTagParser()
+            for start in range(0, len(html), SecurityChecker.CHUNK_SIZE):
+                parser.feed(html[start:start + SecurityChecker.CHUNK_SIZE])
+            parser.close()
+        
+        seconds = best_of(parse, repeat)
+        results.append(Measurement(f"parser.{site}", len(html) / 1e6 / seconds, "MB/s", True))
+    return results
+
+def fixture_checker(url: str, **kwargs) -> SecurityChecker:
+    """Checker de los sitios de prueba: no usa el historial ni la base de huellas de ./reports"""
+    checker = SecurityChecker(url, wordlist=PROBE_PATHS, **kwargs)
+    checker.history = None
+    checker.fingerprints = None
+    return checker
+
+def bench_run_checks(repeat: int) -> List[Measurement]:
+    """Latencia de run_checks con la página ya parseada y los sondeos resueltos (sin red)"""
+    results = []
+    headers = {'Content-Type': 'text/html; charset=utf-8', 'X-Frame-Options': 'SAMEORIGIN'}
+    for site in SITES:
+        html = page(site).decode('utf-8')
+        checker = fixture_checker(f"http://fixture.invalid/{site}/", fetch_assets=False)
+        parser = HTMLTagParser(checker.detector)
+        parser.feed(html)
+        page_index = PageIndex.from_text(html, checker.MATCHER)
+        probes = checker.build_probes()
+        probe_results = [ProbeResult(probe.key, probe.url, status=404, body=b"<html>No encontrado</html>")
+                         for probe in probes]
+        batch = ProbeBatch.from_results(probes, probe_results)
+        
+        seconds = best_of(lambda: checker.run_checks(None, page_index, headers, parser, batch), repeat)
+        results.append(Measurement(f"run_checks.{site}", seconds * 1000, "ms", False))
+    return results
+
+def bench_check_security(repeat: int) -> List[Measurement]:
+    results = []
+    with FixtureServer() as server:
+        for site in SITES:
+            url = server.url(site)
+            seconds = best_of(lambda: fixture_checker(url).check_security(), repeat)
+            results.append(Measurement(f"check_security.{site}", seconds * 1000, "ms", False))
+    
+    # Sitio lento: el tiempo lo domina la espera, los sondeos deben superponerse
+    with FixtureServer(delay=SLOW_DELAY) as server:
+        url = server.url('lenta')
+        seconds = best_of(lambda: fixture_checker(url).check_security(), max(1, repeat // 2))
+        results.append(Measurement("check_security.lenta", seconds * 1000, "ms", False, cpu_bound=False))
+    return results
+
+def lookup_queries(count: int):
+    rng = random.Random(42)
+    names = list(estandar.VERSIONES_HOMOLOGADAS) + ['Node.js', 'Chart.js', 'Spring Boot', 'desconocido']
+    versions = [v for lista in estandar.VERSIONES_HOMOLOGADAS.values() for v in lista] + ['2.0.0', '4.1.3', '1.0']
+    return [(rng.choice(names), rng.choice(versions)) for _ in range(count)]
+
+def bench_estandar(repeat: int, lookups: int = 50000) -> List[Measurement]:
+    catalogo = estandar.obtener_catalogo()
+    queries = lookup_queries(lookups)
+    textos = [f"{nombre} {version}" for nombre, version in queries]
+    
+    def buscar():
+        for texto in textos:
+            estandar.buscar_version_homologada(texto, catalogo=catalogo)
+    
+    return [
+        Measurement("estandar.buscar_version_homologada", lookups / best_of(buscar, repeat), "consultas/s", True),
+        Measurement("estandar.verificar_lote", lookups / best_of(lambda: estandar.verificar_lote(textos, catalogo), repeat),
+                    "consultas/s", True),
+    ]
+
+def fill_history(db: HistoryDB, scans: int, urls: int = 2000, days: int = 365):
+    """Historial sintético: cada escaneo falla cada chequeo con probabilidad 0,15"""
+    rng = random.Random(42)
+    now = datetime.now()
+    for _ in range(scans):
+        failed = {i for i in range(1, 15) if rng.random() < 0.15}
+        checks = [(f"{i}. Chequeo {i}", i not in failed, "Detalles del chequeo") for i in range(1, 15)]
+        result = {'checks': checks, 'total': 14, 'passed': 14 - len(failed), 'failed': len(failed),
+                  'status': 'NO APROBADO' if failed else 'APROBADO'}
+        created = now - timedelta(days=rng.random() * days)
+        db.record(f"https://app{rng.randrange(urls)}.gob.ar", True, result,
+                  {'nombre': f"Proyecto{rng.randrange(50)}"}, created.timestamp())
+
+def bench_history(repeat: int, scans: int = 20000) -> List[Measurement]:
+    """Consultas de la pestaña Historial sobre un historial de un año"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = HistoryDB(os.path.join(directory, 'historial.sqlite'))
+        fill_history(db, scans)
+        month = datetime.now() - timedelta(days=30)
+        year = datetime.now() - timedelta(days=365)
+        queries = {
+            'history.failing': lambda: db.failing(3, month),
+            'history.trend_dia': lambda: db.trend(year),
+            'history.trend_chequeo_mes': lambda: db.trend(year, bucket='mes', check_id=3),
+            'history.check_rates': lambda: db.check_rates(month),
+        }
+        results = [Measurement(name, best_of(query, repeat) * 1000, "ms", False) for name, query in queries.items()]
+        db.close()
+    return results
+
+BENCHMARKS = {
+    'parser.': bench_parser,
+    'run_checks.': bench_run_checks,
+    'check_security.': bench_check_security,
+    'estandar.': bench_estandar,
+    'history.': bench_history,
+}
+
+def run_suite(repeat: int = 5, only: Optional[List[str]] = None) -> Dict:
+    """Ejecuta los benchmarks (los que empiezan con alguno de los prefijos de only) y devuelve las mediciones"""
+    calibration = calibrate()
+    measurements = []
+    for prefix, bench in BENCHMARKS.items():
+        if not only or any(prefix.startswith(o) or o.startswith(prefix) for o in only):
+            measurements += bench(repeat)
+    if only:
+        measurements = [m for m in measurements if m.name.startswith(tuple(only))]
+    # Se calibra antes y después y se toma la mejor, por si la máquina tuvo otra carga en un momento
+    calibration = min(calibration, calibrate())
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'maquina': platform.machine(),
+        'calibracion': calibration,
+        'mediciones': {m.name: {'valor': m.value, 'unidad': m.unit, 'mayor_es_mejor': m.higher_is_better,
+                                'cpu': m.cpu_bound} for m in measurements},
+    }
+
+def compare(current: Dict, baseline: Dict, tolerance: float = TOLERANCE) -> List[Dict]:
+    """
+    Compara cada medición con la línea base, normalizada por la calibración.
+    cambio es la mejora relativa (negativa si empeoró); estado es 'ok',
+    'mejora', 'REGRESIÓN' o 'nuevo'.
+    """
+    speed = baseline['calibracion'] / current['calibracion']
+    rows = []
+    for name, measurement in current['mediciones'].items():
+        value = measurement['valor']
+        base = baseline['mediciones'].get(name)
+        if base is None:
+            rows.append({'nombre': name, 'valor': value, 'unidad': measurement['unidad'], 'base': None,
+                         'cambio': None, 'estado': 'nuevo'})
+            continue
+        
+        expected = base['valor']
+        if measurement['cpu']:
+            # En una máquina el doble de rápida se esperan la mitad del tiempo y el doble de throughput
+            expected = expected * speed if measurement['mayor_es_mejor'] else expected / speed
+        if measurement['mayor_es_mejor']:
+            change = value / expected - 1
+        else:
+            change = expected / value - 1
+        if change < -tolerance:
+            status = 'REGRESIÓN'
+        elif change > tolerance:
+            status = 'mejora'
+        else:
+            status = 'ok'
+        rows.append({'nombre': name, 'valor': value, 'unidad': measurement['unidad'], 'base': expected,
+                     'cambio': change, 'estado': status})
+    return rows
+
+def print_report(rows: List[Dict]):
+    print(f"{'Benchmark':<38} {'valor':>14} {'esperado':>14} {'cambio':>8}  estado")
+    for row in rows:
+        base = f"{row['base']:>14,.2f}" if row['base'] is not None else f"{'-':>14}"
+        change = f"{row['cambio'] * 100:>+7.1f}%" if row['cambio'] is not None else f"{'-':>8}"
+        print(f"{row['nombre']:<38} {row['valor']:>14,.2f} {base} {change}  {row['estado']} ({row['unidad']})")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", action="store_true", help="Guardar las mediciones como nueva línea base")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Archivo de la línea base")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Empeoramiento relativo admitido antes de fallar (0.30 = 30%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medición (se toma la mejor)")
+    parser.add_argument("--only", nargs="+", help="Ejecutar solo los benchmarks con estos prefijos")
+    parser.add_argument("--no-confirm", action="store_true",
+                        help="Fallar sin volver a medir los benchmarks que empeoraron")
+    args = parser.parse_args(argv)
+    
+    current = run_suite(args.repeat, args.only)
+    
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"Línea base guardada en {args.baseline} ({len(current['mediciones'])} mediciones)")
+        return 0
+    
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except OSError:
+        print(f"No hay línea base en {args.baseline}; generarla con --save", file=sys.stderr)
+        return 2
+    
+    rows = compare(current, baseline, args.tolerance)
+    regressions = [row['nombre'] for row in rows if row['estado'] == 'REGRESIÓN']
+    if regressions and not args.no_confirm:
+        # Una regresión tiene que repetirse para contar: un pico de carga de la máquina no alcanza
+        print(f"Volviendo a medir: {', '.join(regressions)}", file=sys.stderr)
+        again = {row['nombre']: row for row in compare(run_suite(args.repeat, regressions), baseline, args.tolerance)}
+        rows = [again.get(row['nombre'], row) for row in rows]
+        regressions = [row['nombre'] for row in rows if row['estado'] == 'REGRESIÓN']
+    
+    print_report(rows)
+    if regressions:
+        print(f"\nREGRESIÓN en {len(regressions)} benchmark(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
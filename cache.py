@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Caché de resultados de escaneo en memoria y en disco (bajo ./reports),
+indexada por URL y por la huella del catálogo y de la configuración del
+checker, con vencimiento (TTL), desalojo LRU y revalidación por ETag /
+Last-Modified. Cada entrada guarda además las entradas de los chequeos
+(artifacts) para los reescaneos incrementales (incremental.py).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Cambiar al modificar los chequeos para invalidar los resultados guardados
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get('CHECKPOINT_CACHE_DIR',
+                           os.path.join(os.environ.get('CHECKPOINT_REPORTS_DIR', 'reports'), 'cache'))
+DEFAULT_TTL = float(os.environ.get('CHECKPOINT_CACHE_TTL', 3600))
+
+class CacheEntry:
+    """Resultado de un escaneo guardado en la caché"""
+    
+    __slots__ = ("key", "url", "result", "validators", "created", "checked", "artifacts")
+    
+    def __init__(self, key, url, result, validators=None, created=None, checked=None, artifacts=None):
+        self.key = key
+        self.url = url
+        self.result = result
+        self.validators = validators or {}
+        self.created = created or time.time()
+        # Última vez que se confirmó que la página no cambió
+        self.checked = checked or self.created
+        # Cabeceras, hash del cuerpo y huellas de las entradas de cada chequeo (SecurityChecker.scan_artifacts)
+        self.artifacts = artifacts
+    
+    def age(self, now=None) -> float:
+        return (now or time.time()) - self.checked
+    
+    def to_dict(self) -> Dict:
+        return {
+            'cache_version': CACHE_VERSION,
+            'key': self.key,
+            'url': self.url,
+            'result': self.result,
+            'validators': self.validators,
+            'created': self.created,
+            'checked': self.checked,
+            'artifacts': self.artifacts,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CacheEntry":
+        result = dict(data['result'])
+        # JSON no conserva tuplas: los chequeos vuelven a ser (nombre, estado, detalles)
+        result['checks'] = [tuple(check) for check in result.get('checks', [])]
+        return cls(data['key'], data['url'], result, data.get('validators'),
+                   data.get('created'), data.get('checked'), data.get('artifacts'))
+
+class ScanCache:
+    """
+    Caché LRU de dos niveles: un diccionario en memoria acotado a
+    max_entries y archivos JSON en directory acotados a max_disk_entries.
+    Solo se guardan escaneos exitosos.
+    """
+    
+    def __init__(self, directory: Optional[str] = CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_entries: int = 128, max_disk_entries: int = 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0}
+    
+    def key_for(self, checker) -> str:
+        """Clave de la URL más la huella del catálogo y de la configuración que afecta el resultado"""
+        material = json.dumps({'version': CACHE_VERSION, 'url': checker.url,
+                               'config': checker.config_fingerprint()}, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key: str) -> Tuple[Optional[CacheEntry], Optional[str]]:
+        """Devuelve (entrada, nivel) con nivel 'memoria' o 'disco', o (None, None)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            self._mark_used(key)
+            return entry, 'memoria'
+        
+        if not self.directory:
+            return None, None
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('cache_version') != CACHE_VERSION:
+                return None, None
+            entry = CacheEntry.from_dict(data)
+        except (OSError, ValueError, KeyError):
+            return None, None
+        
+        self._mark_used(key)
+        
+        self._remember(entry)
+        return entry, 'disco'
+    
+    def _mark_used(self, key: str):
+        # La fecha de modificación del archivo ordena el desalojo LRU del disco
+        if self.directory:
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+    
+    def put(self, entry: CacheEntry):
+        self._remember(entry)
+        with self._lock:
+            self.stats['stores'] += 1
+        if self.directory:
+            self._write(entry)
+    
+    def touch(self, entry: CacheEntry):
+        """Renueva el vencimiento de una entrada revalidada"""
+        entry.checked = time.time()
+        if self.directory:
+            self._write(entry)
+    
+    def invalidate(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+    
+    def clear(self):
+        with self._lock:
+            keys = list(self._memory)
+            self._memory.clear()
+        if self.directory and os.path.isdir(self.directory):
+            keys = [name[:-5] for name in os.listdir(self.directory) if name.endswith('.json')]
+        for key in keys:
+            self.invalidate(key)
+    
+    def _remember(self, entry: CacheEntry):
+        with self._lock:
+            self._memory[entry.key] = entry
+            self._memory.move_to_end(entry.key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+    
+    def _write(self, entry: CacheEntry):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Escritura atómica: otro proceso nunca lee un archivo a medio escribir
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(entry.key))
+            self._evict_disk()
+        except OSError:
+            pass
+    
+    def _evict_disk(self):
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.json')]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path))
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+def _store(cache: ScanCache, key: str, checker, success: bool, result) -> Dict:
+    """Guarda un escaneo exitoso y devuelve el info de cached_check"""
+    info = {'source': 'scan', 'layer': None, 'age': 0.0, 'created': datetime.now().isoformat()}
+    if success:
+        stored = result
+        if 'incremental' in result:
+            # Las marcas del reescaneo incremental valen solo para esta respuesta
+            stored = {name: value for name, value in result.items() if name != 'incremental'}
+            info.update(source='incremental', reused=len(result['incremental']['reused']))
+        cache.put(CacheEntry(key, checker.url, stored, checker.details.get('validators'),
+                             artifacts=checker.details.get('artifacts')))
+    return info
+
+def _checked_headers(entry: CacheEntry) -> Dict[str, str]:
+    """
+    Cabeceras que leen los chequeos guardadas con el escaneo: un 304 solo
+    renueva la entrada si siguen iguales. Una entrada sin artefactos se compara
+    contra ninguna, así que cualquiera de esas cabeceras la invalida.
+    """
+    return (entry.artifacts or {}).get('headers', {})
+
+def cached_check(checker, cache: ScanCache, force: bool = False, incremental: bool = False):
+    """
+    Ejecuta checker.check_security() usando la caché. Una entrada vigente se
+    devuelve sin tráfico de red; una vencida con ETag o Last-Modified se
+    revalida con una petición condicional y solo se vuelve a escanear si la
+    página o las cabeceras que leen los chequeos cambiaron.
+    
+    Con incremental siempre se vuelve a escanear, pero a partir de la entrada
+    guardada (vigente o no): solo se recalculan los chequeos cuyas entradas
+    cambiaron y result['incremental'] indica cuáles se reutilizaron.
+    
+    Returns:
+        (success, result, info) donde info indica el origen del resultado
+    """
+    key = cache.key_for(checker)
+    if incremental:
+        entry, _ = cache.get(key)
+        success, result = checker.check_security(previous=entry)
+        return success, result, _store(cache, key, checker, success, result)
+    entry, layer = (None, None) if force else cache.get(key)
+    
+    if entry is not None:
+        fresh = entry.age() <= cache.ttl
+        if not fresh and entry.validators and checker.is_unchanged(entry.validators, _checked_headers(entry)):
+            cache.touch(entry)
+            cache._count('revalidated')
+            fresh, layer = True, 'revalidado'
+        if fresh:
+            cache._count('hits')
+            return True, entry.result, {
+                'source': 'cache',
+                'layer': layer,
+                'age': time.time() - entry.created,
+                'created': datetime.fromtimestamp(entry.created).isoformat(),
+            }
+    
+    cache._count('misses')
+    success, result = checker.check_security()
+    return success, result, _store(cache, key, checker, success, result)
+
+async def cached_check_async(checker, cache: ScanCache, force: bool = False, incremental: bool = False):
+    """cached_check para AsyncSecurityChecker: la revalidación y el escaneo no bloquean el event loop"""
+    key = cache.key_for(checker)
+    if incremental:
+        entry, _ = cache.get(key)
+        success, result = await checker.check_security_async(previous=entry)
+        return success, result, _store(cache, key, checker, success, result)
+    entry, layer = (None, None) if force else cache.get(key)
+    
+    if entry is not None:
+        fresh = entry.age() <= cache.ttl
+        if not fresh and entry.validators and await checker.is_unchanged_async(entry.validators, _checked_headers(entry)):
+            cache.touch(entry)
+            cache._count('revalidated')
+            fresh, layer = True, 'revalidado'
+        if fresh:
+            cache._count('hits')
+            return True, entry.result, {
+                'source': 'cache',
+                'layer': layer,
+                'age': time.time() - entry.created,
+                'created': datetime.fromtimestamp(entry.created).isoformat(),
+            }
+    
+    cache._count('misses')
+    success, result = await checker.check_security_async()
+    return success, result, _store(cache, key, checker, success, result)
+
+_shared_caches: Dict[str, ScanCache] = {}
+_shared_lock = threading.Lock()
+
+def get_cache(directory: Optional[str] = CACHE_DIR, ttl: float = DEFAULT_TTL) -> ScanCache:
+    """Caché compartida por proceso para un directorio (sobrevive a las re-ejecuciones de Streamlit)"""
+    with _shared_lock:
+        cache = _shared_caches.get(directory)
+        if cache is None:
+            cache = ScanCache(directory, ttl=ttl)
+            _shared_caches[directory] = cache
+        cache.ttl = ttl
+        return cache
@@ -0,0 +1,975 @@
+#!/usr/bin/env python3
+"""
+Motor de análisis de seguridad: parser HTML y SecurityChecker, sin dependencias
+de la interfaz Streamlit
+"""
+
+import urllib.error
+import urllib.parse
+import codecs
+import hashlib
+import io
+import json
+import http.client
+import re
+from http.cookiejar import CookieJar
+from html.parser import HTMLParser
+
+from assets import (ASSET_CACHE, AssetBody, analyzer_id, asset_probes, asset_urls, conditional_headers,
+                    summarize as summarize_assets)
+from fingerprints import get_fingerprint_db
+from history import get_history_db
+from incremental import (BODY_CHANGED, BODY_NOT_MODIFIED, BODY_SAME, check_headers, conditional_request,
+                         input_digests, needs_body, reusable_checks, session_cookies, summarize as summarize_rescan)
+from metrics import DISABLED, ScanMetrics
+from probes import Probe, ProbeResult, ProbeScheduler
+from pageindex import KeywordMatcher, PageIndex
+from transport import HTTPTransport
+from exposure import DEFAULT_WORDLIST, SoftNotFound, classify_exposures, load_wordlist
+
+# Importar módulo de estándares
+try:
+    from estandar import (VERSIONES_HOMOLOGADAS, buscar_version_homologada, cargar_catalogo_desde_archivo,
+                          obtener_catalogo)
+    ESTANDAR_DISPONIBLE = True
+except ImportError:
+    ESTANDAR_DISPONIBLE = False
+    VERSIONES_HOMOLOGADAS = dict.fromkeys(['jquery', 'bootstrap', 'react', 'angular', 'vue', 'font-awesome'], [])
+    def buscar_version_homologada(nombre_software, archivo_txt, catalogo=None):
+        return {"error": f"No se pudo verificar {nombre_software} - módulo estándar no disponible"}
+    def obtener_catalogo():
+        return None
+    def cargar_catalogo_desde_archivo(archivo_path):
+        raise ValueError("El módulo de estándares no está disponible")
+
+class VersionDetector:
+    """
+    Detector de versiones de bibliotecas construido a partir del catálogo.
+    
+    En lugar de probar una expresión regular por biblioteca, se busca una sola
+    vez el ancla común (el número de versión, o la palabra "version" en los
+    scripts) y luego se resuelve qué biblioteca la precede con una tabla de
+    sufijos indexada por longitud. Cada texto se recorre una única vez.
+    """
+    
+    # lib-1.2.3, lib.1.2.3, lib@1.2.3 (URLs de scripts y hojas de estilo)
+    URL_PATTERN = re.compile(r'[.@-](\d+\.\d+\.\d+)')
+    # libVersion: "1.2.3", lib version = '1.2.3' (contenido de scripts); empieza
+    # con un literal para que el motor de regex use búsqueda rápida de prefijo
+    SCRIPT_PATTERN = re.compile(r'version[\s\'"]?[:=]\s*[\'"](\d+\.\d+\.\d+)[\'"]')
+    SCRIPT_SEPARATORS = ' \t\n\r\f\v\'"'
+    # Banners de los archivos distribuidos: "jquery v3.6.4", "bootstrap v5.3.0", "chart.js v4.4.1"
+    BANNER_PATTERN = re.compile(r'[ @]v?(\d+\.\d+\.\d+)')
+    
+    def __init__(self, libraries):
+        names = {name.lower().strip() for name in libraries if name and name.strip()}
+        # Longitudes de mayor a menor para que "nodejs" gane sobre "node"
+        self.lengths = sorted({len(name) for name in names}, reverse=True)
+        self.names = frozenset(names)
+        # Identifica los productos detectables (la clave de los análisis guardados en fingerprints.py)
+        self.fingerprint = hashlib.sha256('\n'.join(sorted(names)).encode('utf-8')).hexdigest()[:16]
+    
+    def _library_before(self, text, end):
+        for length in self.lengths:
+            start = end - length
+            if start < 0:
+                continue
+            candidate = text[start:end]
+            if candidate in self.names and (start == 0 or not text[start - 1].isalnum()):
+                return candidate
+        return None
+    
+    def scan_url(self, url):
+        """Versiones presentes en una URL (src/href); el texto ya debe estar en minúsculas"""
+        found = {}
+        for match in self.URL_PATTERN.finditer(url):
+            library = self._library_before(url, match.start())
+            if library and library not in found:
+                found[library] = match.group(1)
+        return found
+    
+    def scan_script(self, content):
+        """Versiones declaradas en el contenido de un script; el texto ya debe estar en minúsculas"""
+        found = {}
+        if 'version' not in content:
+            return found
+        
+        for match in self.SCRIPT_PATTERN.finditer(content):
+            end = match.start()
+            library = self._library_before(content, end)
+            if library is None and end > 0 and content[end - 1] in self.SCRIPT_SEPARATORS:
+                library = self._library_before(content, end - 1)
+            if library and library not in found:
+                found[library] = match.group(1)
+        return found
+    
+    def scan_banner(self, content):
+        """Versiones de los banners de licencia de scripts y hojas de estilo; el texto ya debe estar en minúsculas"""
+        found = {}
+        for match in self.BANNER_PATTERN.finditer(content):
+            end = match.start()
+            library = self._library_before(content, end)
+            if library is None and content.endswith('.js', 0, end):
+                library = self._library_before(content, end - 3)
+            if library and library not in found:
+                found[library] = match.group(1)
+        return found
+
+DEFAULT_DETECTOR = VersionDetector(VERSIONES_HOMOLOGADAS)
+# Detectores de los catálogos cargados desde archivo, por huella del catálogo
+_DETECTORS = {}
+MAX_DETECTORS = 64
+
+def detector_for(catalog):
+    """Detector con los productos del catálogo (el predeterminado si no hay catálogo)"""
+    if catalog is None:
+        return DEFAULT_DETECTOR
+    detector = _DETECTORS.get(catalog.huella)
+    if detector is None:
+        if len(_DETECTORS) >= MAX_DETECTORS:
+            _DETECTORS.clear()
+        detector = _DETECTORS.setdefault(catalog.huella, VersionDetector(catalog.productos))
+    return detector
+
+# HTML Parser personalizado (mismo que el original)
+class HTMLTagParser(HTMLParser):
+    def __init__(self, detector=None):
+        super().__init__()
+        self.detector = detector or DEFAULT_DETECTOR
+        self.forms, self.scripts, self.links = [], [], []
+        self.images, self.iframes, self.anchors, self.inputs = [], [], [], []
+        self.current_form = None
+        self.current_form_content = self.current_script_content = ""
+        self.in_script = self.in_form = False
+        self.detected_versions = {}
+    
+    def handle_starttag(self, tag, attrs):
+        attrs_dict = dict(attrs)
+        
+        if tag == 'form':
+            self.current_form = attrs_dict
+            self.current_form_content = ""
+            self.in_form = True
+        elif tag == 'script':
+            if 'src' in attrs_dict:
+                self.scripts.append(attrs_dict)
+                
+                # Detectar versiones en scripts
+                self.detected_versions.update(self.detector.scan_url((attrs_dict['src'] or '').lower()))
+            
+            self.in_script = True
+            self.current_script_content = ""
+        elif tag == 'link' and 'href' in attrs_dict:
+            self.links.append(attrs_dict)
+            
+            # Detectar versiones en stylesheets
+            self.detected_versions.update(self.detector.scan_url((attrs_dict['href'] or '').lower()))
+        
+        elif tag == 'img' and 'src' in attrs_dict:
+            self.images.append(attrs_dict)
+        elif tag == 'iframe' and 'src' in attrs_dict:
+            self.iframes.append(attrs_dict)
+        elif tag == 'a' and 'href' in attrs_dict:
+            self.anchors.append(attrs_dict)
+        elif tag in ['input', 'textarea', 'select']:
+            self.inputs.append(attrs_dict)
+    
+    def handle_endtag(self, tag):
+        if tag == 'form' and self.current_form is not None:
+            self.current_form['content'] = self.current_form_content
+            self.forms.append(self.current_form)
+            self.current_form = None
+            self.in_form = False
+        elif tag == 'script' and self.in_script:
+            self.scripts.append({'content': self.current_script_content})
+            
+            # Buscar versiones en el contenido del script
+            self.detected_versions.update(self.detector.scan_script(self.current_script_content.lower()))
+            
+            self.in_script = False
+    
+    def handle_data(self, data):
+        if self.in_form:
+            self.current_form_content += data
+        if self.in_script:
+            self.current_script_content += data
+
+class SecurityChecker:
+    ERROR_PATH = '/non_existent_page_12345'
+    COMMON_PATHS = ['/icons', '/icons/small', '/images', '/fonts', '/.htaccess', '/.gitignore', '/web.config', '/info.php', '/phpinfo.php', '/update.php']
+    
+    KEYWORD_GROUPS = {
+        'captcha': [
+            'recaptcha', 'grecaptcha', 'g-recaptcha', 'captcha', 
+            'https://www.google.com/recaptcha', 
+            'data-sitekey', 'class="g-recaptcha"'
+        ],
+        'auth': [
+            'login', 'iniciar sesión', 'ingresar', 'acceder', 'autenticar', 'usuario', 'contraseña',
+            'sesión', 'session', 'token', 'auth', 'jwt',
+            'acceso restringido', 'acceso denegado', 'debe iniciar sesión', 'área protegida',
+            'oauth', 'openid', 'saml', 'ldap'
+        ],
+        'login': ['login'],
+        'login_form': ['password', 'contraseña', 'login'],
+        'ad_auth': ['ad authentication', 'active directory', 'ldap', 'saml', 'openid', 'sso', 'oauth', 'windows authentication'],
+        'validation': ['validate', 'validation', 'checkvalidity', 'isvalid'],
+        'stack_trace': ['stack trace', 'exception', 'traceback', 'system.web',
+                        'runtime error', 'server error', 'php error', 'sql syntax'],
+        'sensitive_comment': ['password', 'usuario', 'token'],
+    }
+    
+    # Buscador único sobre todos los grupos, compilado una sola vez
+    MATCHER = KeywordMatcher(KEYWORD_GROUPS)
+    
+    CHUNK_SIZE = 64 * 1024
+    MAX_BODY_SIZE = 10 * 1024 * 1024
+    # Cuerpo leído de cada ruta sondeada para compararlo con la página de error
+    EXPOSURE_BODY_SIZE = 64 * 1024
+    RATE_LIMIT = 100.0
+    
+    def __init__(self, url, verbose=False, max_workers=8, per_host_limit=4, scan_deadline=30.0,
+                 max_body_size=MAX_BODY_SIZE, pool_size=4, connect_timeout=10.0, read_timeout=10.0,
+                 wordlist=None, rate_limit=RATE_LIMIT, catalogo=None, instrument=False, fetch_assets=True,
+                 project=None):
+        self.url = url.rstrip('/')
+        # Catálogo de la sesión (o ruta a un archivo de estándares, para los procesos del lote)
+        if isinstance(catalogo, str):
+            catalogo = cargar_catalogo_desde_archivo(catalogo)
+        self.catalogo = catalogo or obtener_catalogo()
+        self.detector = detector_for(self.catalogo)
+        self.verbose = verbose
+        self.max_body_size = max_body_size
+        # Con instrument, cada análisis deja sus tiempos en details['performance']
+        self.instrument = instrument
+        self.metrics = DISABLED
+        # Descargar los scripts y hojas de estilo de la página para los chequeos 5 y 14 (assets.py)
+        self.fetch_assets = fetch_assets
+        self.asset_cache = ASSET_CACHE
+        # Análisis ya hechos de cada contenido, compartidos entre escaneos y procesos
+        self.fingerprints = get_fingerprint_db()
+        # Cada análisis queda en el historial con los datos del proyecto (claves del informe)
+        self.project = project or {}
+        self.history = get_history_db()
+        self.exposure_paths = self._load_exposure_paths(wordlist)
+        self.results = {}
+        self.details = {}
+        self.cookie_jar = CookieJar()
+        self.transport = HTTPTransport(self.cookie_jar, pool_size=pool_size,
+                                       connect_timeout=connect_timeout, read_timeout=read_timeout)
+        self.headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'}
+        self.allowed_domains = ['buenosaires.gob.ar', 'google', 'googleapis.com', 'gstatic.com', 'jquery', 'cloudflare', 'bootstrap']
+        self.scheduler = ProbeScheduler(self.fetch_probe, max_workers=max_workers,
+                                        per_host=per_host_limit, deadline=scan_deadline,
+                                        rate_limit=rate_limit)
+    
+    def config_fingerprint(self):
+        """Configuración que afecta el resultado del escaneo (clave de la caché de resultados)"""
+        if self.catalogo is not None:
+            catalog = self.catalogo.huella
+        elif ESTANDAR_DISPONIBLE:
+            catalog = obtener_catalogo().huella
+        else:
+            catalog = hashlib.sha256(json.dumps(VERSIONES_HOMOLOGADAS, sort_keys=True).encode('utf-8')).hexdigest()
+        return {
+            'catalog': catalog,
+            'max_body_size': self.max_body_size,
+            'exposure_paths': hashlib.sha256('\n'.join(self.exposure_paths).encode('utf-8')).hexdigest(),
+            'allowed_domains': self.allowed_domains,
+            'keyword_groups': self.KEYWORD_GROUPS,
+            'fetch_assets': self.fetch_assets,
+        }
+    
+    def is_unchanged(self, validators, headers=None):
+        """
+        Petición condicional a la página principal: True si responde 304 Not
+        Modified y, si se pasan headers (las cabeceras guardadas que leen los
+        chequeos, ver check_headers), ninguna de ellas cambió. Un 304 no
+        informa las cabeceras quitadas: se confirman con un HEAD.
+        """
+        conditional = conditional_request(validators)
+        if not conditional:
+            return False
+        
+        try:
+            response = self.make_request(self.url, additional_headers=conditional)
+            response.close()
+            if response.getcode() != 304:
+                return False
+            return headers is None or check_headers(self._current_headers(headers, response)) == headers
+        except Exception:
+            return False
+        finally:
+            self.transport.close()
+    
+    def make_request(self, url, method="GET", additional_headers=None):
+        headers = dict(self.headers)
+        if additional_headers:
+            headers.update(additional_headers)
+        
+        # Las respuestas de error (4xx/5xx) se devuelven igual que las exitosas
+        try:
+            return self.transport.request(url, method=method, headers=headers)
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            raise Exception(f"No se pudo conectar a {url}: {str(e)}")
+    
+    def _load_exposure_paths(self, wordlist):
+        if wordlist is not None:
+            return load_wordlist(wordlist)
+        try:
+            return load_wordlist(DEFAULT_WORDLIST)
+        except OSError:
+            return list(self.COMMON_PATHS)
+    
+    def fetch_probe(self, probe):
+        limit = probe.max_bytes or self.max_body_size
+        if probe.head_first:
+            result = self._fetch(probe, "HEAD", 0)
+            # HEAD alcanza para descartar la ruta; un 200 se confirma con GET para compararlo con la página de error
+            if result.status not in (200, 405, 501):
+                return result
+            if not self.scheduler.limiter.acquire(probe.deadline):
+                return ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado")
+        return self._fetch(probe, probe.method, limit if probe.read_body else 0)
+    
+    def _fetch(self, probe, method, limit):
+        response = self.make_request(probe.url, method=method)
+        try:
+            body = response.read(limit) if limit else b''
+        finally:
+            response.close()
+        return ProbeResult(probe.key, probe.url, status=response.getcode(),
+                           headers=dict(response.info()), body=body,
+                           method=method, final_url=response.geturl())
+    
+    def build_asset_probes(self, parser, base_url):
+        """Descargas de los scripts y hojas de estilo de la página (ninguna si fetch_assets está apagado)"""
+        if not self.fetch_assets:
+            return []
+        return asset_probes(asset_urls(parser, base_url, self.allowed_domains))
+    
+    def fetch_asset(self, probe):
+        return self.asset_cache.load(probe, self._download_asset, analyzer_id(self.detector))
+    
+    def _download_asset(self, probe, stale):
+        """Lee el recurso por bloques y lo analiza (o lo busca por hash); con stale, la petición es condicional"""
+        response = self.make_request(probe.url, additional_headers=conditional_headers(stale))
+        body = AssetBody()
+        try:
+            if response.getcode() == 200:
+                while body.bytes_read < probe.max_bytes:
+                    chunk = response.read(min(self.CHUNK_SIZE, probe.max_bytes - body.bytes_read))
+                    if not chunk:
+                        break
+                    body.append(chunk)
+                body.truncated = body.bytes_read >= probe.max_bytes and bool(response.read(1))
+        finally:
+            response.close()
+        return body.result(probe.key, probe.url, response, self.detector, self.fingerprints)
+    
+    def read_page(self, response, parser):
+        """Lee el cuerpo por bloques hasta max_body_size alimentando el parser en la misma pasada"""
+        page = PageIndex(self.MATCHER)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        feed = self.metrics.timed('parse', page.feed)
+        digest = hashlib.sha256()
+        
+        while page.bytes_read < self.max_body_size:
+            chunk = response.read(min(self.CHUNK_SIZE, self.max_body_size - page.bytes_read))
+            if not chunk:
+                break
+            page.bytes_read += len(chunk)
+            digest.update(chunk)
+            feed(decoder.decode(chunk), parser)
+        else:
+            page.truncated = bool(response.read(1))
+        
+        feed(decoder.decode(b'', final=True), parser)
+        response.close()
+        page.digest = digest.hexdigest()
+        return page.finish()
+    
+    def read_body(self, response):
+        """
+        Lee el cuerpo crudo hasta max_body_size sin parsearlo. Devuelve (bytes,
+        info) con info igual a details['body']: así el reescaneo incremental
+        decide por el hash si hace falta parsear.
+        """
+        digest = hashlib.sha256()
+        chunks, size, truncated = [], 0, False
+        while size < self.max_body_size:
+            chunk = response.read(min(self.CHUNK_SIZE, self.max_body_size - size))
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            chunks.append(chunk)
+        else:
+            truncated = bool(response.read(1))
+        response.close()
+        return b''.join(chunks), {'bytes_read': size, 'truncated': truncated, 'digest': digest.hexdigest()}
+    
+    def parse_body(self, raw, info):
+        """Parsea un cuerpo leído con read_body: devuelve (page, parser)"""
+        parser = HTMLTagParser(self.detector)
+        page = self.read_page(io.BytesIO(raw), parser)
+        page.truncated = info['truncated']
+        return page, parser
+    
+    def _as_page(self, content):
+        if isinstance(content, PageIndex):
+            return content
+        return PageIndex.from_text(content, self.MATCHER)
+    
+    def build_probes(self):
+        """Peticiones salientes del escaneo (chequeos 9 y 13), en orden fijo"""
+        probes = [Probe('error_page', urllib.parse.urljoin(self.url, self.ERROR_PATH))]
+        for path in self.exposure_paths:
+            probes.append(Probe(f'path:{path}', urllib.parse.urljoin(self.url, path),
+                                head_first=True, max_bytes=self.EXPOSURE_BODY_SIZE))
+        return probes
+    
+    def check_x_frame_options(self, headers):
+        xframe_value = headers.get('X-Frame-Options', '')
+        if xframe_value:
+            xframe_value = xframe_value.upper()
+        
+        if not xframe_value and 'x-frame-options' in headers:
+            xframe_value = headers.get('x-frame-options', '').upper()
+        
+        csp = headers.get('Content-Security-Policy', '')
+        has_csp_frame = 'frame-ancestors' in csp
+        
+        if xframe_value == 'SAMEORIGIN':
+            return True, f"Cabecera X-Frame-Options: {xframe_value}"
+        elif xframe_value == 'DENY':
+            return True, f"Cabecera X-Frame-Options: {xframe_value}"
+        elif xframe_value.startswith('ALLOW-FROM '):
+            return True, f"Cabecera X-Frame-Options: {xframe_value}"
+        elif has_csp_frame:
+            csp_frame_rule = re.search(r'frame-ancestors\s+([^;]+)', csp)
+            csp_value = csp_frame_rule.group(1) if csp_frame_rule else "configurado"
+            return True, f"CSP con frame-ancestors: {csp_value}"
+        else:
+            return False, "No se configuró X-Frame-Options adecuadamente ni CSP frame-ancestors"
+    
+    def check_captcha(self, content, parser):
+        forms = parser.forms
+        page = self._as_page(content)
+        
+        has_recaptcha_script = any(
+            'recaptcha/api.js' in script.get('src', '') 
+            for script in parser.scripts 
+            if 'src' in script
+        )
+        
+        has_captcha_in_content = page.has_any('captcha')
+        
+        # El texto de los formularios es parte de la página: solo se revisan si el índice tuvo coincidencias
+        has_captcha_in_forms = False
+        if forms and has_captcha_in_content:
+            has_captcha_in_forms = any(
+                self.MATCHER.has_any(str(form.get('content', '')).lower(), 'captcha')
+                for form in forms
+            )
+        
+        has_captcha = has_recaptcha_script or has_captcha_in_content or has_captcha_in_forms
+        
+        if has_captcha:
+            details = []
+            if has_recaptcha_script:
+                details.append("Script de reCAPTCHA detectado")
+            if has_captcha_in_content:
+                details.append("Referencias a CAPTCHA en el código fuente")
+            if has_captcha_in_forms:
+                details.append("CAPTCHA en formularios")
+            
+            return True, f"Se encontró CAPTCHA: {', '.join(details)}"
+        
+        elif not forms:
+            return False, "No se encontraron formularios ni implementación de CAPTCHA"
+        else:
+            return False, "No se encontró implementación de CAPTCHA"
+    
+    def check_protected_access(self, content, parser, cookies=None):
+        # cookies: nombres de las cookies de sesión de la página (session_cookies)
+        page = self._as_page(content)
+        
+        login_forms = page.has_any('login_form') and any(
+            self.MATCHER.has_any(str(form.get('content', '')).lower(), 'login_form')
+            for form in parser.forms
+        )
+        
+        auth_in_content = page.has_any('auth')
+        
+        has_session_cookie = bool(session_cookies(self.cookie_jar) if cookies is None else cookies)
+        
+        has_protection = login_forms or auth_in_content or has_session_cookie
+        
+        if has_protection:
+            details = []
+            if login_forms:
+                details.append("Formularios de login detectados")
+            if auth_in_content:
+                details.append("Referencias a autenticación en el código")
+            if has_session_cookie:
+                details.append("Cookies de sesión identificadas")
+            
+            return True, f"Se encontró protección de acceso: {', '.join(details)}"
+        else:
+            return False, "No se detectaron mecanismos de protección de acceso"
+    
+    def check_software_versions(self, parser, versions=None):
+        # versions: las de la página más las de sus scripts y hojas de estilo
+        detected_versions = parser.detected_versions if versions is None else versions
+        vulnerable_versions = []
+        
+        for software, version in detected_versions.items():
+            result = buscar_version_homologada(software, 'standar.txt', catalogo=self.catalogo)
+            
+            if "error" in result:
+                vulnerable_versions.append(f"{software} {version}")
+            else:
+                version_homologada = False
+                if "versiones_homologadas" in result:
+                    for version_info in result["versiones_homologadas"]:
+                        if version in version_info:
+                            version_homologada = True
+                            break
+                
+                if not version_homologada:
+                    vulnerable_versions.append(f"{software} {version}")
+        
+        if vulnerable_versions:
+            return False, f"Versiones Vulnerables detectadas: {', '.join(vulnerable_versions)}"
+        elif detected_versions:
+            return True, f"Versiones verificadas y homologadas: {', '.join([f'{s} {v}' for s, v in detected_versions.items()])}"
+        else:
+            return True, "No se detectaron versiones de software específicas"
+    
+    def run_checks(self, response, content, headers, parser, probe_batch=None, asset_batch=None, base_url=None,
+                   reuse=None, cookies=None, deadline=None):
+        """
+        Evalúa los 14 chequeos. reuse: chequeos del escaneo anterior por número
+        (incremental.py); esos se copian sin volver a evaluarse. cookies: las
+        cookies de sesión de la respuesta principal (session_cookies), tomadas
+        antes de lanzar los sondeos y los recursos, que guardan sus Set-Cookie
+        en el mismo cookie_jar. deadline: vencimiento del escaneo para los
+        lotes que se lancen acá (ProbeScheduler.scan_deadline).
+        """
+        checks = self.metrics.check_list()
+        if cookies is None:
+            cookies = session_cookies(self.cookie_jar)
+        page = self._as_page(content)
+        content = page.text
+        reuse = reuse or {}
+        
+        def reused(number):
+            if number not in reuse:
+                return False
+            checks.append(reuse[number])
+            return True
+        
+        # Los sondeos de red y la descarga de recursos corren en paralelo mientras se evalúa el contenido
+        if deadline is None:
+            deadline = self.scheduler.scan_deadline()
+        if probe_batch is None:
+            probe_batch = self.scheduler.submit(self.build_probes(), deadline=deadline)
+        if asset_batch is None:
+            base_url = base_url or (response.geturl() if response is not None else self.url)
+            asset_batch = self.scheduler.submit(self.build_asset_probes(parser, base_url), fetch=self.fetch_asset,
+                                                deadline=deadline)
+        
+        # 1. Check CAPTCHA
+        if not reused(1):
+            captcha_status, captcha_details = self.check_captcha(page, parser)
+            checks.append(("1. Captcha", captcha_status, captcha_details))
+        
+        # 2. Check client-side validation
+        if not reused(2):
+            validation_found = any(any(input_tag.get(attr) for attr in ['required', 'pattern', 'min', 'max']) for input_tag in parser.inputs)
+            
+            if not validation_found:
+                validation_found = any(any(form.get(event) for event in ['onsubmit', 'oninput', 'onchange']) for form in parser.forms)
+            
+            if not validation_found and page.has_any('validation'):
+                validation_found = any(
+                    'content' in script and self.MATCHER.has_any(script['content'].lower(), 'validation')
+                    for script in parser.scripts
+                )
+            
+            checks.append(("2. Validación del lado del cliente y servidor", validation_found, 
+                          "Se detectaron mecanismos de validación" if validation_found else "No se detectaron validaciones"))
+        
+        # 3. Check X-FRAME-OPTIONS
+        if not reused(3):
+            x_frame_status, x_frame_details = self.check_x_frame_options(headers)
+            checks.append(("3. X-FRAME OPTIONS", x_frame_status, x_frame_details))
+        
+        # 4. Check version disclosure
+        if not reused(4):
+            version_headers = ['Server', 'X-Powered-By', 'X-AspNet-Version', 'X-AspNetMvc-Version']
+            disclosed_versions = [f"{h}: {headers[h]}" for h in version_headers if h in headers and re.search(r'[\d\.]+', headers[h])]
+            
+            html_versions = re.findall(r'(jquery-\d+\.\d+\.\d+|bootstrap-\d+\.\d+\.\d+|angular[\s\-]?\d+\.\d+\.\d+|react[\s\-]?\d+\.\d+\.\d+|vue[\s\-]?\d+\.\d+\.\d+)', content, re.IGNORECASE)
+            
+            if disclosed_versions or html_versions:
+                checks.append(("4. No divulgar versiones", False, f"Versiones: {', '.join(disclosed_versions + html_versions)}"))
+            else:
+                checks.append(("4. No divulgar versiones", True, "No se detectaron versiones"))
+        
+        # 5. Check software versions against standard
+        with self.metrics.waiting(checks):
+            asset_results = asset_batch.results()
+        self.details['assets'] = summarize_assets(asset_results)
+        self.metrics.count_bytes(self.details['assets']['bytes_read'])
+        assets = [result for result in asset_results if result.ok and result.status == 200]
+        if not reused(5):
+            detected_versions = dict(parser.detected_versions)
+            for asset in assets:
+                for software, version in asset.versions.items():
+                    detected_versions.setdefault(software, version)
+            version_status, version_details = self.check_software_versions(parser, detected_versions)
+            checks.append(("5. Verificación de versiones", version_status, version_details))
+        
+        # 6. Session validation
+        # El contenido de los formularios está incluido en el índice de la página
+        has_login = page.has_any('login')
+        
+        if not reused(6):
+            if has_login:
+                session_validation = True
+                session_details = "La aplicación cuenta con función de login/logout"
+            else:
+                session_validation = True
+                session_details = "No requiere usuario y password"
+            
+            checks.append(("6. Validación de sesión", session_validation, session_details))
+        
+        # 7. Access to URLs without session
+        if not reused(7):
+            protected_status, protected_details = self.check_protected_access(page, parser, cookies)
+            checks.append(("7. Acceso a URL o archivos sin iniciar sesión", protected_status, protected_details))
+        
+        # 8. File upload validation
+        if not reused(8):
+            has_file_upload = any(
+                input_tag.get('type') == 'file' for input_tag in parser.inputs
+            )
+            
+            if has_file_upload:
+                file_restrictions = any(
+                    input_tag.get('accept') or 'enctype="multipart/form-data"' in str(form.get('content', ''))
+                    for input_tag in parser.inputs
+                    for form in parser.forms
+                    if input_tag.get('type') == 'file'
+                )
+                
+                checks.append(("8. Validación de archivos a subir", file_restrictions, 
+                              "Se detectaron restricciones de tipo de archivo" if file_restrictions else "No se detectaron restricciones de tipo de archivo"))
+            else:
+                checks.append(("8. Validación de archivos a subir", True, "no cuenta con la funcionalidad"))
+        
+        # 9. Error messages
+        with self.metrics.waiting(checks):
+            error_probe = probe_batch.get('error_page')
+        error_url = error_probe.url
+        if not reused(9):
+            if error_probe.ok:
+                has_stack_trace = PageIndex.from_text(error_probe.text(), self.MATCHER).has_any('stack_trace')
+                
+                if has_stack_trace:
+                    checks.append(("9. Mensajes de error personalizados", False, f"Errores de sistema detectados. URL probada: {error_url}"))
+                else:
+                    checks.append(("9. Mensajes de error personalizados", True, f"No se detectan errores durante las pruebas. URL probada: {error_url}"))
+            else:
+                checks.append(("9. Mensajes de error personalizados", True, "No se detectan errores durante las pruebas."))
+        
+        # 10. Check Active Directory authentication
+        if not reused(10):
+            has_ad_auth = page.has_any('ad_auth')
+            
+            if has_login and not has_ad_auth:
+                checks.append(("10. Autenticación contra Active Directory", False, "No se detecta validación contra Active Directory para las credenciales de usuario"))
+            elif has_login and has_ad_auth:
+                checks.append(("10. Autenticación contra Active Directory", True, "Se detecta autenticación con Active Directory"))
+            else:
+                checks.append(("10. Autenticación contra Active Directory", False, "No cuenta con validación de usuario/contraseña contra Active Directory"))
+        
+        # 11. Check CORS headers
+        if not reused(11):
+            cors_header = headers.get('Access-Control-Allow-Origin')
+            if cors_header is None:
+                checks.append(("11. ACCESS-CONTROL-ALLOW-ORIGIN", True, "No se encuentra configurado"))
+            elif cors_header == '*':
+                checks.append(("11. ACCESS-CONTROL-ALLOW-ORIGIN", False, "Configuración insegura: *"))
+            else:
+                checks.append(("11. ACCESS-CONTROL-ALLOW-ORIGIN", True, f"Valor: {cors_header}"))
+        
+        # 12. Check GET requests
+        if not reused(12):
+            external_resources = []
+            
+            for collection, attr_name in [
+                (parser.scripts, 'src'), 
+                (parser.images, 'src'), 
+                (parser.links, 'href'), 
+                (parser.iframes, 'src')
+            ]:
+                for item in collection:
+                    url = item.get(attr_name, '')
+                    if url and url.startswith(('http://', 'https://')):
+                        parsed = urllib.parse.urlparse(url)
+                        if parsed.netloc and not any(domain in parsed.netloc.lower() for domain in self.allowed_domains):
+                            external_resources.append(f"{attr_name}: {url}")
+            
+            if external_resources:
+                truncated = external_resources[:5]
+                details = f"Recursos externos: {', '.join(truncated)}"
+                if len(external_resources) > 5:
+                    details += f" y {len(external_resources) - 5} más"
+                checks.append(("12. Peticiones GET de la Aplicación", False, details))
+            else:
+                checks.append(("12. Peticiones GET de la Aplicación", True, "No se detectaron recursos externos"))
+        
+        # 13. Unauthorized access to common directories/files
+        soft_404 = SoftNotFound(error_probe, self.ERROR_PATH)
+        with self.metrics.waiting(checks):
+            probe_results = probe_batch.results()
+        self.metrics.record_probes(probe_results)
+        exposure = classify_exposures(probe_results, soft_404)
+        unauthorized_access = exposure['exposed']
+        self.details['exposure'] = {
+            'probed': exposure['probed'],
+            'exposed': len(unauthorized_access),
+            'soft_404': len(exposure['soft_404']),
+            'errors': exposure['errors'],
+        }
+        
+        if not reused(13):
+            if unauthorized_access:
+                details = f"Acceso a: {', '.join(unauthorized_access[:10])}"
+                if len(unauthorized_access) > 10:
+                    details += f" y {len(unauthorized_access) - 10} más"
+                checks.append(("13. Acceso no autorizado a Directorios y/o archivos comunes", False, details))
+            else:
+                checks.append(("13. Acceso no autorizado a Directorios y/o archivos comunes", True, f"No se detectaron accesos a directorios no autorizados durante las pruebas ({exposure['probed']} rutas probadas)"))
+        
+        # 14. Frontend code analysis
+        if not reused(14):
+            ip_addresses = re.findall(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', content)
+            sensitive_comments = page.has_any('sensitive_comment') and any(
+                self.MATCHER.has_any(comment, 'sensitive_comment')
+                for comment in re.findall(r'<!--.*?-->', page.lower, re.DOTALL)
+            )
+            
+            asset_ips = list(dict.fromkeys(ip for asset in assets for ip in asset.ips))
+            asset_credentials = [f"{asset.name} ({', '.join(asset.credentials[:3])})" for asset in assets if asset.credentials]
+            
+            if ip_addresses or sensitive_comments or asset_ips or asset_credentials:
+                details = []
+                if ip_addresses:
+                    details.append(f"IPs encontradas: {', '.join(ip_addresses[:3])}")
+                if sensitive_comments:
+                    details.append("Código comentado con información sensible")
+                if asset_ips:
+                    details.append(f"IPs en scripts y hojas de estilo: {', '.join(asset_ips[:3])}")
+                if asset_credentials:
+                    details.append(f"Posibles credenciales en: {', '.join(asset_credentials[:3])}")
+                
+                checks.append(("14. Chequeo del Código frontend de la Aplicación", False, "; ".join(details)))
+            else:
+                checks.append(("14. Chequeo del Código frontend de la Aplicación", True, "No se detectaron problemas en el código frontend"))
+        
+        # Con la instrumentación, checks registra los tiempos; el resultado es una lista común
+        return list(checks)
+    
+    def record_history(self, success, result):
+        """Guarda el resultado en el historial de escaneos (history.py), si está activo"""
+        if self.history is not None:
+            self.details['history_id'] = self.history.record(self.url, success, result, self.project)
+    
+    def check_security(self, previous=None):
+        """
+        Analiza la URL. Con previous (cache.CacheEntry de un escaneo anterior
+        con artifacts) el análisis es incremental: ver _rescan.
+        """
+        if previous is not None and previous.artifacts:
+            success, result = self._rescan(previous)
+        else:
+            success, result = self._check_security()
+        self.record_history(success, result)
+        return success, result
+    
+    def scan_artifacts(self, headers, body, asset_batch, inputs):
+        """Entradas del escaneo que necesita el próximo reescaneo incremental (se guardan en la caché)"""
+        return {
+            'headers': check_headers(headers),
+            'body': dict(body),
+            'asset_urls': [result.url for result in asset_batch.results()],
+            'inputs': inputs,
+        }
+    
+    def _inputs(self, headers, body, probe_batch, asset_batch, cookies):
+        return input_digests(headers, body['digest'], probe_batch.results(), asset_batch.results(), cookies)
+    
+    def _current_headers(self, stored, not_modified):
+        try:
+            response = self.make_request(self.url, method="HEAD")
+            response.close()
+            if response.getcode() == 200:
+                return dict(response.info())
+        except Exception:
+            pass
+        headers = dict(stored)
+        headers.update(not_modified.info())
+        return headers
+    
+    @staticmethod
+    def _summary(checks):
+        total = len(checks)
+        passed = sum(1 for _, result, _ in checks if result)
+        failed = total - passed
+        
+        return {
+            'checks': checks,
+            'total': total,
+            'passed': passed,
+            'failed': failed,
+            'status': 'APROBADO' if failed == 0 else 'NO APROBADO'
+        }
+    
+    def _check_security(self):
+        self.metrics = metrics = ScanMetrics() if self.instrument else DISABLED
+        # Un único plazo para todos los lotes del escaneo
+        deadline = self.scheduler.scan_deadline()
+        try:
+            with metrics.phase('request'):
+                response = self.make_request(self.url)
+            if response.getcode() != 200:
+                response.close()
+                return False, f"Error: No se pudo acceder a la URL. Código de estado: {response.getcode()}"
+            
+            headers = dict(response.info())
+            self.details['validators'] = {
+                'etag': response.info().get('ETag'),
+                'last_modified': response.info().get('Last-Modified'),
+            }
+            
+            parser = HTMLTagParser(self.detector)
+            with metrics.phase('body'):
+                page = self.read_page(response, parser)
+            self.details['body'] = {'bytes_read': page.bytes_read, 'truncated': page.truncated, 'digest': page.digest}
+            metrics.count_bytes(page.bytes_read)
+            
+            # Los sondeos de red y la descarga de recursos corren en paralelo mientras se evalúa el contenido
+            cookies = session_cookies(self.cookie_jar)
+            probe_batch = self.scheduler.submit(self.build_probes(), deadline=deadline)
+            asset_batch = self.scheduler.submit(self.build_asset_probes(parser, response.geturl()), fetch=self.fetch_asset,
+                                                deadline=deadline)
+            with metrics.phase('checks'):
+                checks = self.run_checks(response, page, headers, parser, probe_batch, asset_batch, cookies=cookies)
+            
+            inputs = self._inputs(headers, self.details['body'], probe_batch, asset_batch, cookies)
+            self.details['artifacts'] = self.scan_artifacts(headers, self.details['body'], asset_batch, inputs)
+            
+            # Calcular estadísticas
+            return True, self._summary(checks)
+        
+        except Exception as e:
+            return False, f"Error durante la evaluación: {str(e)}"
+        
+        finally:
+            self.details['transport'] = self.transport.metrics()
+            if metrics.enabled:
+                self.details['performance'] = metrics.to_dict(self.details['transport'])
+            self.transport.close()
+    
+    def _rescan(self, previous):
+        """
+        Reescaneo incremental. La página se pide con los validadores del
+        escaneo anterior: con 304 (o con el mismo hash del cuerpo) no se
+        parsea y sus recursos son los de antes. Los sondeos y los recursos se
+        vuelven a pedir, y solo se evalúan los chequeos cuyas entradas
+        cambiaron (incremental.py); el resto se copia de previous.result.
+        
+        Un 304 puede omitir cabeceras y no informa las que se quitaron (el
+        arreglo habitual del chequeo 4): las cabeceras se confirman con un
+        HEAD y, si falla, se usan las guardadas actualizadas con las del 304.
+        """
+        artifacts = previous.artifacts
+        self.metrics = metrics = ScanMetrics() if self.instrument else DISABLED
+        deadline = self.scheduler.scan_deadline()
+        try:
+            with metrics.phase('request'):
+                response = self.make_request(self.url, additional_headers=conditional_request(previous.validators))
+            status = response.getcode()
+            if status not in (200, 304):
+                response.close()
+                return False, f"Error: No se pudo acceder a la URL. Código de estado: {status}"
+            
+            if status == 304:
+                response.close()
+                headers = self._current_headers(artifacts['headers'], response)
+                raw, body, state = None, artifacts['body'], BODY_NOT_MODIFIED
+            else:
+                headers = dict(response.info())
+                with metrics.phase('body'):
+                    raw, body = self.read_body(response)
+                metrics.count_bytes(body['bytes_read'])
+                state = BODY_SAME if body['digest'] == artifacts['body']['digest'] else BODY_CHANGED
+            self.details['validators'] = {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            }
+            self.details['body'] = dict(body)
+            
+            cookies = session_cookies(self.cookie_jar)
+            probe_batch = self.scheduler.submit(self.build_probes(), deadline=deadline)
+            page = parser = None
+            if state == BODY_CHANGED:
+                page, parser = self.parse_body(raw, body)
+                probes = self.build_asset_probes(parser, response.geturl())
+            else:
+                probes = asset_probes(artifacts['asset_urls']) if self.fetch_assets else []
+            asset_batch = self.scheduler.submit(probes, fetch=self.fetch_asset, deadline=deadline)
+            
+            inputs = self._inputs(headers, body, probe_batch, asset_batch, cookies)
+            reuse = reusable_checks(previous.result['checks'], artifacts.get('inputs'), inputs)
+            if page is None and needs_body(reuse):
+                if raw is None:
+                    # La página respondió 304 pero cambió otra entrada de un chequeo del cuerpo
+                    # (un recurso, una cookie): se la vuelve a pedir completa
+                    with metrics.phase('request'):
+                        response = self.make_request(self.url)
+                    if response.getcode() != 200:
+                        response.close()
+                        return False, f"Error: No se pudo acceder a la URL. Código de estado: {response.getcode()}"
+                    with metrics.phase('body'):
+                        raw, full = self.read_body(response)
+                    metrics.count_bytes(full['bytes_read'])
+                    if full['digest'] != body['digest']:
+                        # El servidor respondió 304 con otra página: no hay nada confiable que reutilizar
+                        return self._check_security()
+                page, parser = self.parse_body(raw, body)
+            if page is None:
+                # Todos los chequeos que leen el cuerpo se reutilizan
+                page, parser = PageIndex.from_text('', self.MATCHER), HTMLTagParser(self.detector)
+            
+            with metrics.phase('checks'):
+                checks = self.run_checks(response, page, headers, parser, probe_batch, asset_batch, reuse=reuse,
+                                         cookies=cookies)
+            self.details['artifacts'] = self.scan_artifacts(headers, body, asset_batch, inputs)
+            
+            result = self._summary(checks)
+            result['incremental'] = summarize_rescan(checks, reuse, state)
+            return True, result
+        
+        except Exception as e:
+            return False, f"Error durante la evaluación: {str(e)}"
+        
+        finally:
+            self.details['transport'] = self.transport.metrics()
+            if metrics.enabled:
+                self.details['performance'] = metrics.to_dict(self.details['transport'])
+            self.transport.close()
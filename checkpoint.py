@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Línea de comandos del Checkpoint de Seguridad GCABA (sin Streamlit)
+
+Uso:
+    python checkpoint.py scan https://ejemplo.buenosaires.gob.ar
+    python checkpoint.py scan https://ejemplo.buenosaires.gob.ar --crawl --max-pages 50
+    python checkpoint.py scan https://ejemplo.buenosaires.gob.ar --incremental
+    python checkpoint.py batch urls.txt --workers 8
+    python checkpoint.py sbom package-lock.json --solo-problemas
+    python checkpoint.py estandar config/ES0901.pdf
+    python checkpoint.py historial --falla 3 --desde 2026-10-01
+"""
+
+import argparse
+import json
+import sys
+
+from cache import DEFAULT_TTL, cached_check, get_cache
+from checker import SecurityChecker
+from estandar import cargar_catalogo_desde_archivo
+from report import build_report_data
+
+def cmd_scan(args) -> int:
+    url = args.url
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    
+    catalogo = None
+    if args.estandar:
+        try:
+            catalogo = cargar_catalogo_desde_archivo(args.estandar)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo cargar el archivo de estándares: {e}", file=sys.stderr)
+            return 2
+    
+    project = {'nombre': args.proyecto, 'autor': args.autor, 'ticket': args.ticket, 'version': args.version}
+    checker = SecurityChecker(url, verbose=args.verbose, max_workers=args.max_workers,
+                              scan_deadline=args.deadline,
+                              max_body_size=int(args.max_body_mb * 1024 * 1024),
+                              pool_size=args.pool_size, connect_timeout=args.timeout,
+                              read_timeout=args.timeout, wordlist=args.wordlist,
+                              rate_limit=args.rate_limit, catalogo=catalogo, instrument=args.rendimiento,
+                              fetch_assets=not args.sin_recursos, project=project)
+    if args.crawl:
+        # El recorrido no pasa por la caché: su resultado depende de todas las páginas
+        from crawler import crawl_site
+        success, result = crawl_site(checker, max_depth=args.max_depth, max_pages=args.max_pages)
+    elif args.cache or args.incremental:
+        success, result, cache_info = cached_check(checker, get_cache(ttl=args.cache_ttl), incremental=args.incremental)
+        if cache_info['source'] == 'cache':
+            print(f"Resultado recuperado de la caché ({cache_info['layer']}, {cache_info['created']})", file=sys.stderr)
+        elif cache_info['source'] == 'incremental':
+            print(f"Reescaneo incremental: {cache_info['reused']} chequeos reutilizados del escaneo anterior",
+                  file=sys.stderr)
+    else:
+        success, result = checker.check_security()
+    if not success:
+        print(json.dumps({'url': url, 'error': result}, indent=2, ensure_ascii=False))
+        return 2
+    
+    report_data = build_report_data(url, result, project, checker.details.get('performance'))
+    json_str = json.dumps(report_data, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json_str)
+    else:
+        print(json_str)
+    
+    if args.pdf:
+        from report import generate_pdf_report
+        pdf_buffer = generate_pdf_report(url, result, {
+            'estado': result['status'],
+            'autor': args.autor or 'Sistema Automático',
+            'proyecto': args.proyecto or 'N/A',
+            'ticket': args.ticket or 'N/A',
+            'version': args.version
+        })
+        with open(args.pdf, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
+    
+    return 0 if result['status'] == 'APROBADO' else 1
+
+def cmd_batch(args) -> int:
+    import batch
+    return batch.main(args.extra_args)
+
+def cmd_sbom(args) -> int:
+    import sbom
+    return sbom.main(args.extra_args)
+
+def cmd_estandar(args) -> int:
+    import snapshot
+    return snapshot.main(args.extra_args)
+
+def cmd_historial(args) -> int:
+    import history
+    return history.main(args.extra_args)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="checkpoint", description="Checkpoint de Seguridad GCABA")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    scan = subparsers.add_parser("scan", help="Analizar una URL y emitir el resultado en JSON")
+    scan.add_argument("url", help="URL de la aplicación a analizar")
+    scan.add_argument("-o", "--output", help="Archivo JSON de salida (por defecto, stdout)")
+    scan.add_argument("--pdf", help="Generar además el informe PDF en esta ruta")
+    scan.add_argument("--proyecto", default="", help="Nombre del proyecto")
+    scan.add_argument("--autor", default="", help="Email del autor")
+    scan.add_argument("--ticket", default="", help="Ticket JIRA")
+    scan.add_argument("--version", default="01.00.00", help="Versión del sistema")
+    scan.add_argument("--max-workers", type=int, default=8, help="Sondeos simultáneos por escaneo")
+    scan.add_argument("--deadline", type=float, default=30.0, help="Plazo máximo de los sondeos (segundos)")
+    scan.add_argument("--max-body-mb", type=float, default=SecurityChecker.MAX_BODY_SIZE / (1024 * 1024),
+                      help="Tamaño máximo a leer de la página principal (MB)")
+    scan.add_argument("--pool-size", type=int, default=4, help="Conexiones keep-alive conservadas por host")
+    scan.add_argument("--timeout", type=float, default=10.0, help="Tiempo límite de conexión y lectura (segundos)")
+    scan.add_argument("--wordlist", help="Archivo con las rutas a sondear en el chequeo 13 (una por línea)")
+    scan.add_argument("--rate-limit", type=float, default=SecurityChecker.RATE_LIMIT,
+                      help="Peticiones por segundo máximas durante los sondeos (0: sin límite)")
+    scan.add_argument("--estandar", help="Archivo de estándares (.txt o .pdf) a usar en lugar del catálogo predeterminado")
+    scan.add_argument("--cache", action="store_true", help="Reutilizar un resultado reciente de la caché de escaneos")
+    scan.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL, help="Vigencia de la caché (segundos)")
+    scan.add_argument("--incremental", action="store_true",
+                      help="Reescanear a partir del resultado guardado en la caché: solo se recalculan los "
+                           "chequeos cuyas cabeceras, cuerpo o sondeos cambiaron")
+    scan.add_argument("--sin-recursos", action="store_true",
+                      help="No descargar los scripts y hojas de estilo de la página (chequeos 5 y 14)")
+    scan.add_argument("--crawl", action="store_true",
+                      help="Recorrer las páginas internas del mismo origen y combinar sus chequeos")
+    scan.add_argument("--max-depth", type=int, default=2, help="Profundidad máxima del recorrido (--crawl)")
+    scan.add_argument("--max-pages", type=int, default=25, help="Páginas máximas del recorrido (--crawl)")
+    scan.add_argument("--rendimiento", action="store_true",
+                      help="Incluir en el JSON los tiempos por fase y por chequeo del análisis")
+    scan.add_argument("-v", "--verbose", action="store_true", help="Modo detallado")
+    scan.set_defaults(func=cmd_scan)
+    
+    batch = subparsers.add_parser("batch", help="Analizar una lista de URLs (ver batch.py --help)",
+                                  add_help=False)
+    batch.set_defaults(func=cmd_batch)
+    
+    sbom = subparsers.add_parser("sbom", help="Verificar un lockfile o SBOM contra el catálogo ES0901 "
+                                              "(ver sbom.py --help)", add_help=False)
+    sbom.set_defaults(func=cmd_sbom)
+    
+    estandar = subparsers.add_parser("estandar", help="Actualizar el catálogo ES0901 a partir del documento "
+                                                      "del estándar (ver snapshot.py --help)", add_help=False)
+    estandar.set_defaults(func=cmd_estandar)
+    
+    historial = subparsers.add_parser("historial", help="Consultar el historial de escaneos "
+                                                        "(ver history.py --help)", add_help=False)
+    historial.set_defaults(func=cmd_historial)
+    
+    # Los argumentos del lote, del SBOM, del actualizador y del historial se delegan sin cambios a su módulo
+    args, extra_args = parser.parse_known_args(argv)
+    args.extra_args = extra_args
+    if args.extra_args and args.func not in (cmd_batch, cmd_sbom, cmd_estandar, cmd_historial):
+        parser.error(f"argumentos no reconocidos: {' '.join(args.extra_args)}")
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Modo crawl: recorre en anchura las páginas del mismo origen enlazadas desde
+la página principal (enlaces y acciones de formularios), ejecuta los 14
+chequeos en cada una y combina los resultados en un veredicto del sitio.
+
+Los sondeos de los chequeos 9 y 13 se hacen una sola vez (son del sitio,
+no de cada página). El recorrido respeta robots.txt, el límite de
+peticiones por segundo del checker, una profundidad y una cantidad máxima
+de páginas y un plazo total; las páginas con el mismo contenido (por
+ejemplo, la misma página con otros parámetros) se analizan una sola vez.
+"""
+
+import hashlib
+import threading
+import time
+import urllib.parse
+import urllib.robotparser
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from checker import HTMLTagParser
+from incremental import session_cookies
+from metrics import DISABLED, ScanMetrics
+
+MAX_DEPTH = 2
+MAX_PAGES = 25
+CRAWL_DEADLINE = 120.0
+
+# Chequeos que el sitio cumple si los cumple alguna página (por ejemplo, el
+# CAPTCHA del formulario de login); el resto debe cumplirse en todas
+ANY_PAGE_CHECKS = frozenset({'1', '2', '7', '10'})
+# Chequeos de los sondeos, iguales en todas las páginas
+SITE_CHECKS = frozenset({'9', '13'})
+
+# Enlaces a archivos que no son páginas HTML
+SKIP_EXTENSIONS = ('.pdf', '.zip', '.rar', '.7z', '.gz', '.tar', '.doc', '.docx', '.xls', '.xlsx', '.ppt',
+                   '.pptx', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json',
+                   '.xml', '.mp3', '.mp4', '.avi', '.woff', '.woff2', '.ttf', '.exe', '.msi', '.apk')
+
+def normalize_url(url: str) -> Optional[str]:
+    """URL sin fragmento, con esquema y host en minúsculas y sin el puerto por defecto; None si no es http(s)"""
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+    host = parts.hostname
+    if parts.port and parts.port != {'http': 80, 'https': 443}[scheme]:
+        host = f"{host}:{parts.port}"
+    return urllib.parse.urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+def origin(url: str) -> Tuple[str, str]:
+    parts = urllib.parse.urlsplit(url)
+    return parts.scheme, parts.netloc
+
+def merge_checks(page_checks: List[Tuple[str, List[tuple]]]) -> List[tuple]:
+    """
+    Veredicto del sitio a partir de los chequeos de cada página (la
+    principal primero). Los detalles indican en qué página se cumplió un
+    chequeo de ANY_PAGE_CHECKS o en cuáles falló uno de los demás.
+    """
+    landing_url, landing = page_checks[0]
+    merged = []
+    for i, (name, status, details) in enumerate(landing):
+        number = name.split('.')[0]
+        results = [(url, checks[i]) for url, checks in page_checks]
+        if number in SITE_CHECKS:
+            merged.append((name, status, details))
+        elif number in ANY_PAGE_CHECKS:
+            url, check = next(((url, check) for url, check in results if check[1]), (landing_url, landing[i]))
+            merged.append((name, check[1], check[2] if url == landing_url else f"{check[2]} (en {url})"))
+        else:
+            failing = [(url, check) for url, check in results if not check[1]]
+            if not failing:
+                merged.append((name, True, details))
+                continue
+            url, check = failing[0]
+            where = f"en {url}" + (f" y {len(failing) - 1} página(s) más" if len(failing) > 1 else "")
+            merged.append((name, False, f"{check[2]} ({where})"))
+    return merged
+
+class PageVisit:
+    """Página descargada y parseada, pendiente de sus chequeos"""
+    
+    __slots__ = ("url", "depth", "status", "headers", "page", "parser", "links", "error", "duplicate")
+    
+    def __init__(self, url, depth, status=None, headers=None, page=None, parser=None, links=(), error=None,
+                 duplicate=False):
+        self.url = url
+        self.depth = depth
+        self.status = status
+        self.headers = headers
+        self.page = page
+        self.parser = parser
+        self.links = links
+        self.error = error
+        self.duplicate = duplicate
+
+class SiteCrawler:
+    """
+    Recorrido acotado de un sitio con un SecurityChecker: comparte su
+    transporte (conexiones keep-alive y cookies), su limitador de tasa y su
+    catálogo.
+    """
+    
+    def __init__(self, checker, max_depth: int = MAX_DEPTH, max_pages: int = MAX_PAGES, workers: int = 4,
+                 respect_robots: bool = True, deadline: float = CRAWL_DEADLINE):
+        self.checker = checker
+        self.max_depth = max(0, max_depth)
+        self.max_pages = max(1, max_pages)
+        self.workers = max(1, workers)
+        self.respect_robots = respect_robots
+        self.deadline_seconds = deadline
+        self.origin = origin(normalize_url(checker.url) or checker.url)
+        self.robots = None
+        self.visited = set()
+        self.hashes = set()
+        self.cookies = []
+        self._lock = threading.Lock()
+        self.stats = {'pages': 0, 'duplicates': 0, 'robots_blocked': 0, 'errors': 0, 'skipped': 0,
+                      'budget_exhausted': False}
+    
+    def _load_robots(self):
+        robots_url = urllib.parse.urlunsplit(self.origin + ('/robots.txt', '', ''))
+        try:
+            response = self.checker.make_request(robots_url)
+            body = response.read(512 * 1024) if response.getcode() == 200 else b''
+            response.close()
+        except Exception:
+            return
+        if body:
+            self.robots = urllib.robotparser.RobotFileParser(robots_url)
+            self.robots.parse(body.decode('utf-8', errors='ignore').splitlines())
+    
+    def allowed(self, url: str) -> bool:
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch(self.checker.headers.get('User-Agent', '*'), url)
+    
+    def links_of(self, base_url: str, parser) -> List[str]:
+        """Enlaces y acciones de formularios GET del mismo origen, normalizados y sin repetir"""
+        candidates = [anchor.get('href') for anchor in parser.anchors]
+        # Las acciones de formularios POST (login, borrado, envío) no se visitan
+        candidates += [form.get('action') for form in parser.forms
+                       if (form.get('method') or 'get').lower() == 'get']
+        links, seen = [], set()
+        for href in candidates:
+            if not href:
+                continue
+            url = normalize_url(urllib.parse.urljoin(base_url, href.strip()))
+            if url is None or url in seen or origin(url) != self.origin:
+                continue
+            if urllib.parse.urlsplit(url).path.lower().endswith(SKIP_EXTENSIONS):
+                continue
+            seen.add(url)
+            links.append(url)
+        return links
+    
+    def visit(self, url: str, depth: int, deadline: float) -> PageVisit:
+        """Descarga y parsea una página; los chequeos se ejecutan aparte"""
+        checker = self.checker
+        if not checker.scheduler.limiter.acquire(deadline):
+            return PageVisit(url, depth, error="Tiempo límite del recorrido agotado")
+        try:
+            with checker.metrics.phase('request'):
+                response = checker.make_request(url)
+        except Exception as e:
+            return PageVisit(url, depth, error=str(e))
+        
+        status, headers = response.getcode(), dict(response.info())
+        final_url = normalize_url(response.geturl()) or url
+        if depth == 0:
+            # La página principal puede redirigir (por ejemplo, de http a https): su destino define el origen
+            self.origin = origin(final_url)
+        content_type = response.info().get('Content-Type', 'text/html')
+        if status != 200 or origin(final_url) != self.origin or 'html' not in content_type.lower():
+            response.close()
+            return PageVisit(url, depth, status=status, headers=headers)
+        if depth == 0:
+            checker.details['validators'] = {
+                'etag': response.info().get('ETag'),
+                'last_modified': response.info().get('Last-Modified'),
+            }
+        
+        parser = HTMLTagParser(checker.detector)
+        with checker.metrics.phase('body'):
+            page = checker.read_page(response, parser)
+        checker.metrics.count_bytes(page.bytes_read)
+        digest = hashlib.sha256(page.text.encode('utf-8', errors='ignore')).digest()
+        with self._lock:
+            duplicate = digest in self.hashes
+            self.hashes.add(digest)
+        if duplicate:
+            return PageVisit(url, depth, status=status, duplicate=True)
+        return PageVisit(url, depth, status, headers, page, parser, self.links_of(final_url, parser))
+    
+    def run(self) -> Tuple[bool, object]:
+        """(success, result) con la forma de check_security más 'pages' (el resumen de cada página)"""
+        success, result = self._run()
+        # El historial guarda el veredicto combinado del sitio, no cada página
+        self.checker.record_history(success, result)
+        return success, result
+    
+    def _run(self) -> Tuple[bool, object]:
+        checker = self.checker
+        checker.metrics = metrics = ScanMetrics() if checker.instrument else DISABLED
+        deadline = time.monotonic() + self.deadline_seconds
+        start_url = normalize_url(checker.url) or checker.url
+        try:
+            landing = self.visit(start_url, 0, deadline)
+            if landing.error:
+                return False, f"Error durante la evaluación: {landing.error}"
+            if landing.status != 200 or landing.page is None:
+                return False, f"Error: No se pudo acceder a la URL. Código de estado: {landing.status}"
+            checker.details['body'] = {'bytes_read': landing.page.bytes_read, 'truncated': landing.page.truncated}
+            
+            # Los sondeos del sitio corren mientras se recorren las páginas, con el plazo del recorrido; el
+            # chequeo 7 usa las cookies de sesión de la página principal, no las que dejen los sondeos en el
+            # cookie_jar compartido
+            self.cookies = session_cookies(checker.cookie_jar)
+            probe_batch = checker.scheduler.submit(checker.build_probes(), deadline=deadline)
+            if self.respect_robots:
+                self._load_robots()
+            
+            self.visited.add(start_url)
+            pages = self._crawl(landing, probe_batch, deadline)
+            
+            checked = [(page['url'], page.pop('checks')) for page in pages if 'checks' in page]
+            # El veredicto parte de los chequeos de la página principal: sin ellos no hay resultado
+            if not checked or checked[0][0] != landing.url:
+                error = next((page['error'] for page in pages if page['depth'] == 0 and 'error' in page),
+                             "Tiempo límite del recorrido agotado antes de evaluar la página principal")
+                return False, f"Error durante la evaluación: {error}"
+            checks = merge_checks(checked)
+            total = len(checks)
+            passed = sum(1 for _, result, _ in checks if result)
+            failed = total - passed
+            self.stats['pages'] = len(checked)
+            checker.details['crawl'] = dict(self.stats)
+            
+            return True, {
+                'checks': checks,
+                'total': total,
+                'passed': passed,
+                'failed': failed,
+                'status': 'APROBADO' if failed == 0 else 'NO APROBADO',
+                'pages': pages,
+            }
+        
+        except Exception as e:
+            return False, f"Error durante la evaluación: {str(e)}"
+        
+        finally:
+            checker.details['transport'] = checker.transport.metrics()
+            if metrics.enabled:
+                checker.details['performance'] = metrics.to_dict(checker.details['transport'])
+            checker.transport.close()
+    
+    def _crawl(self, landing: PageVisit, probe_batch, deadline: float) -> List[Dict]:
+        """
+        Frontera concurrente: cada página descargada agenda sus chequeos y las
+        visitas de sus enlaces en el mismo pool, sin esperar a que terminen
+        los chequeos de las anteriores
+        """
+        pages: List[Dict] = []
+        admitted = 1
+        
+        def summary(visit):
+            entry = {'url': visit.url, 'depth': visit.depth}
+            if visit.error:
+                entry['error'] = visit.error
+            elif visit.duplicate:
+                entry['duplicate'] = True
+            else:
+                entry['http_status'] = visit.status
+            return entry
+        
+        def check(visit):
+            with self.checker.metrics.phase('checks'):
+                checks = self.checker.run_checks(None, visit.page, visit.headers, visit.parser, probe_batch,
+                                                     base_url=visit.url, cookies=self.cookies, deadline=deadline)
+            entry = summary(visit)
+            entry['passed'] = sum(1 for _, result, _ in checks if result)
+            entry['failed'] = len(checks) - entry['passed']
+            entry['checks'] = checks
+            return entry
+        
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            pending = {}
+            
+            def schedule(visit):
+                nonlocal admitted
+                pending[pool.submit(check, visit)] = (visit.url, visit.depth, True)
+                if visit.depth >= self.max_depth:
+                    return
+                for link in visit.links:
+                    if link in self.visited:
+                        continue
+                    if admitted >= self.max_pages:
+                        self.stats['budget_exhausted'] = True
+                        return
+                    self.visited.add(link)
+                    if self.respect_robots and not self.allowed(link):
+                        self.stats['robots_blocked'] += 1
+                        continue
+                    admitted += 1
+                    pending[pool.submit(self.visit, link, visit.depth + 1, deadline)] = (link, visit.depth + 1, False)
+            
+            schedule(landing)
+            while pending:
+                done, _ = wait(list(pending), timeout=max(0.0, deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    # Plazo agotado: lo que falta no entra en el veredicto
+                    for future in pending:
+                        future.cancel()
+                    self.stats['skipped'] += len(pending)
+                    break
+                for future in done:
+                    url, depth, is_check = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Una página que falla al leerse o al evaluarse no frena el recorrido
+                        self.stats['errors'] += 1
+                        pages.append({'url': url, 'depth': depth, 'error': str(e)})
+                        continue
+                    if is_check:
+                        pages.append(result)
+                    elif result.page is not None:
+                        schedule(result)
+                    else:
+                        if result.error:
+                            self.stats['errors'] += 1
+                        if result.duplicate:
+                            self.stats['duplicates'] += 1
+                        pages.append(summary(result))
+        finally:
+            # Sin esperar a las tareas en vuelo al salir: CRAWL_DEADLINE es el plazo total del recorrido
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        # La página principal primero y el resto por profundidad y URL, sin importar el orden de llegada
+        pages.sort(key=lambda page: (page['depth'], page['url'] != landing.url, page['url']))
+        return pages
+
+def crawl_site(checker, **options) -> Tuple[bool, object]:
+    """Atajo: SiteCrawler(checker, **options).run()"""
+    return SiteCrawler(checker, **options).run()
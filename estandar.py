@@ -5,15 +5,45 @@ Módulo para verificación de versiones homologadas según estándares GCABA
 
 import re
 import os
-import requests
-from typing import Dict, List, Optional, Union
+import io
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple,
+                    Union)
 import logging
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy es opcional: sin él verificar_lote usa la implementación en Python puro.
+# Solo se importa en la primera verificación por lotes, no al importar este módulo
+NUMPY_DISPONIBLE = find_spec('numpy') is not None
+
+@lru_cache(maxsize=None)
+def _numpy():
+    import numpy
+    return numpy
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Versiones homologadas basadas en el estándar ES0901 v4.7
+VERSION_ESTANDAR = "ES0901 v4.7"
+FECHA_ESTANDAR = "Enero 2025"
+
+# Instantánea binaria del catálogo generada por snapshot.py; si existe, reemplaza al catálogo incorporado
+RUTA_SNAPSHOT = os.environ.get('CHECKPOINT_ESTANDAR_SNAPSHOT', os.path.join('config', 'es0901.snapshot'))
+
+# Catálogo incorporado: es la base de solo lectura. Las instantáneas y los archivos
+# cargados se consultan con obtener_catalogo(), nunca modificando este diccionario
 VERSIONES_HOMOLOGADAS = {
     # Lenguajes
     "php": ["8.1.30", "8.2.24"],
@@ -79,53 +109,370 @@ VERSIONES_HOMOLOGADAS = {
     "kubernetes": ["1.28.0", "1.29.0"],
 }
 
+# Nombres alternativos de software (se consultan ya en minúsculas)
+ALIAS_SOFTWARE = MappingProxyType({
+    "node.js": "nodejs",
+    "node js": "nodejs",
+    "react.js": "react",
+    "vue.js": "vue",
+    "angular.js": "angular",
+    "next.js": "nextjs",
+    "nest.js": "nestjs",
+    "express.js": "express",
+    "fastify.js": "fastify",
+    "spring boot": "springboot",
+    "chart.js": "chartjs",
+    "font awesome": "fontawesome",
+    "font-awesome": "fontawesome",
+    "open jdk": "openjdk",
+    "red hat": "redhat",
+    "red hat enterprise linux": "rhel",
+})
+
 def normalizar_nombre_software(nombre: str) -> str:
     """
     Normaliza el nombre del software para la búsqueda
     """
     nombre = nombre.lower().strip()
+    return ALIAS_SOFTWARE.get(nombre, nombre)
+
+# Versión dentro de un texto, en una sola pasada: núcleo numérico (x, x.y,
+# x.y.z...), sufijo de una letra (19c, 1.1.1k), prerelease (-beta.1, -rc1;
+# solo etiquetas conocidas, para no tomar "-min.js" de un nombre de archivo;
+# también pegado al núcleo a la PEP 440: 1.2.3a1, 4.2.0rc1) y build de semver
+# (+build.5). El núcleo no empieza ni termina en medio de un número, así un
+# sufijo desconocido con dígitos (1.2.3x64) se descarta entero en lugar de
+# retroceder hasta "1.2"; un sufijo de solo letras ("3rd") anula la candidata.
+# Empieza con un dígito y sin banderas globales para que el motor de regex
+# avance rápido hasta cada candidata.
+_PATRON_VERSION = re.compile(r"""
+    (?<!\d)(?<!\d\.)(?<!\d[a-zA-Z])\d+(?:\.\d+)*(?!\.?\d)
+    (?:[a-zA-Z](?![a-zA-Z0-9]))?
+    (?:-?(?i:alpha|beta|rc|pre|preview|dev|next|snapshot|canary|nightly)(?:[.-]?\d+)*|(?i:a|b)\d+)?
+    (?:\+[0-9a-zA-Z]+(?:\.[0-9a-zA-Z]+)*)?
+    (?![a-zA-Z]+(?!\d))
+""", re.VERBOSE)
+# La misma candidata con el prefijo "v" / "version" que la precede, para desempatar
+_PATRON_VERSION_CON_PREFIJO = re.compile(
+    r'((?<![0-9a-zA-Z])(?i:v(?:ersi[oó]n)?)[\s:=]*)?(' + _PATRON_VERSION.pattern + ')', re.VERBOSE)
+# Prerelease pegado al final del núcleo (1.2.3a1 -> 1.2.3)
+_PRERELEASE_PEGADO = re.compile(
+    r'(?:(?i:alpha|beta|rc|pre|preview|dev|next|snapshot|canary|nightly)(?:[.-]?\d+)*|(?i:a|b)\d+)$')
+
+def _componentes_version(version: str) -> int:
+    """Componentes del núcleo (sin prerelease ni build) para desempatar, hasta x.y.z"""
+    return min(version.split('-', 1)[0].split('+', 1)[0].count('.'), 2)
+
+@lru_cache(maxsize=16384)
+def extraer_version(texto: str) -> Optional[str]:
+    """
+    Extrae la versión de un texto usando una única expresión regular
     
-    # Mapeo de nombres alternativos
-    mapeo = {
-        "node.js": "nodejs",
-        "node js": "nodejs",
-        "react.js": "react",
-        "vue.js": "vue",
-        "angular.js": "angular",
-        "next.js": "nextjs",
-        "nest.js": "nestjs",
-        "express.js": "express",
-        "fastify.js": "fastify",
-        "spring boot": "springboot",
-        "chart.js": "chartjs",
-        "font awesome": "fontawesome",
-        "font-awesome": "fontawesome",
-        "open jdk": "openjdk",
-        "red hat": "redhat",
-        "red hat enterprise linux": "rhel",
-    }
+    Si hay varias candidatas gana la precedida por "v" o "version", luego la
+    de más componentes y por último la primera del texto.
+    """
+    if not texto:
+        return None
+    candidatas = _PATRON_VERSION.findall(texto)
+    if len(candidatas) <= 1:
+        # Caso común: una sola candidata, sin desempates
+        return candidatas[0].lower() if candidatas else None
     
-    return mapeo.get(nombre, nombre)
+    if 'v' not in texto and 'V' not in texto:
+        # Sin prefijos posibles: gana la de más componentes (max conserva la primera)
+        return max(candidatas, key=_componentes_version).lower()
+    
+    mejor, puntaje = None, None
+    for prefijo, version in _PATRON_VERSION_CON_PREFIJO.findall(texto):
+        candidato = (bool(prefijo), _componentes_version(version))
+        if puntaje is None or candidato > puntaje:
+            mejor, puntaje = version, candidato
+    return mejor.lower()
 
-def extraer_version(texto: str) -> Optional[str]:
+@lru_cache(maxsize=4096)
+def _partes_version(version: str) -> Optional[Tuple[int, ...]]:
     """
-    Extrae la versión de un texto usando expresiones regulares
+    Componentes numéricos de una versión ("3.6.4" -> (3, 6, 4), "3.6.4-rc1" y
+    "3.6.4rc1" -> (3, 6, 4)); None si alguno no es numérico
     """
-    # Patrones comunes de versiones
-    patrones = [
-        r'(\d+\.\d+\.\d+)',  # x.y.z
-        r'(\d+\.\d+)',       # x.y
-        r'(\d+)',            # x
-        r'v(\d+\.\d+\.\d+)', # vx.y.z
-        r'version\s*(\d+\.\d+\.\d+)', # version x.y.z
-    ]
+    try:
+        # El prerelease y el build de semver no cuentan para la regla mayor.menor
+        nucleo = version.split('+', 1)[0].split('-', 1)[0]
+        return tuple(int(parte) for parte in _PRERELEASE_PEGADO.sub('', nucleo).split('.'))
+    except ValueError:
+        return None
+
+class ProductoHomologado(NamedTuple):
+    """
+    Versiones homologadas de un producto, preprocesadas: el texto exacto y
+    los índices por versión mayor y por (mayor, menor) que usa la regla de
+    compatibilidad.
+    """
+    nombre: str
+    versiones: Tuple[str, ...]
+    exactas: FrozenSet[str]
+    # (mayor, menor) de las versiones con al menos dos componentes
+    mayor_menor: FrozenSet[Tuple[int, ...]]
+    # Mayores de todas las versiones numéricas (para versiones detectadas sin menor)
+    mayores: FrozenSet[int]
+    # Mayores de versiones homologadas sin menor (aceptan cualquier menor)
+    mayores_sueltas: FrozenSet[int]
+    
+    @classmethod
+    def desde_versiones(cls, nombre: str, versiones) -> "ProductoHomologado":
+        versiones = tuple(versiones)
+        partes = [_partes_version(version) for version in versiones]
+        return cls(
+            nombre=nombre,
+            versiones=versiones,
+            exactas=frozenset(versiones),
+            mayor_menor=frozenset(p[:2] for p in partes if p and len(p) >= 2),
+            mayores=frozenset(p[0] for p in partes if p),
+            mayores_sueltas=frozenset(p[0] for p in partes if p and len(p) == 1),
+        )
+    
+    def es_compatible(self, version_detectada: str) -> bool:
+        if not version_detectada:
+            return False
+        if version_detectada in self.exactas:
+            return True
+        
+        partes = _partes_version(version_detectada)
+        if not partes:
+            return False
+        if len(partes) == 1:
+            return partes[0] in self.mayores
+        return partes[:2] in self.mayor_menor or partes[0] in self.mayores_sueltas
+
+# Bits de cada componente en las claves enteras: producto (15) | mayor (24) | menor (24)
+_BITS_COMPONENTE = 24
+_LIMITE_COMPONENTE = 1 << _BITS_COMPONENTE
+
+def _clave_mayor(producto_id, mayor):
+    return (producto_id << _BITS_COMPONENTE) | mayor
+
+def _clave_mayor_menor(producto_id, mayor, menor):
+    return (((producto_id << _BITS_COMPONENTE) | mayor) << _BITS_COMPONENTE) | menor
+
+# Claves de ClavesNumericas que se comparan como arreglos
+CLAVES_ARREGLOS = ('mayores', 'mayor_menor', 'mayores_sueltas')
+
+class ClavesNumericas:
+    """
+    Índices del catálogo codificados como enteros de 64 bits, para comparar
+    columnas enteras de versiones con una sola operación de pertenencia
+    (numpy.isin o conjuntos de Python si numpy no está instalado).
+    """
+    
+    __slots__ = ("exactas", "mayores", "mayor_menor", "mayores_sueltas", "_buffers", "_arreglos")
+    
+    def __init__(self, exactas: FrozenSet[Tuple[int, str]], mayores: FrozenSet[int], mayor_menor: FrozenSet[int],
+                 mayores_sueltas: FrozenSet[int], buffers: Optional[Mapping[str, object]] = None):
+        self.exactas = exactas
+        self.mayores = mayores
+        self.mayor_menor = mayor_menor
+        self.mayores_sueltas = mayores_sueltas
+        self._buffers = buffers
+        self._arreglos = None
     
-    for patron in patrones:
-        match = re.search(patron, texto, re.IGNORECASE)
-        if match:
-            return match.group(1)
+    @property
+    def arreglos(self) -> Dict[str, "np.ndarray"]:
+        """Las mismas claves como arreglos int64 ordenados (se arman en el primer uso; requiere numpy)"""
+        arreglos = self._arreglos
+        if arreglos is None:
+            np = _numpy()
+            if self._buffers is not None:
+                # Sin copiar: por ejemplo, vistas del mapeo de una instantánea
+                arreglos = {nombre: np.frombuffer(self._buffers[nombre], dtype='<i8') for nombre in CLAVES_ARREGLOS}
+            else:
+                arreglos = {nombre: np.array(sorted(getattr(self, nombre)), dtype=np.int64)
+                            for nombre in CLAVES_ARREGLOS}
+            self._arreglos = arreglos
+        return arreglos
     
-    return None
+    @classmethod
+    def desde_productos(cls, productos: Iterable[ProductoHomologado],
+                        buffers: Optional[Mapping[str, object]] = None) -> "ClavesNumericas":
+        exactas, mayores, mayor_menor, sueltas = set(), set(), set(), set()
+        for producto_id, producto in enumerate(productos):
+            exactas.update((producto_id, version) for version in producto.exactas)
+            mayores.update(_clave_mayor(producto_id, m) for m in producto.mayores if m < _LIMITE_COMPONENTE)
+            sueltas.update(_clave_mayor(producto_id, m) for m in producto.mayores_sueltas if m < _LIMITE_COMPONENTE)
+            mayor_menor.update(_clave_mayor_menor(producto_id, m, n) for m, n in producto.mayor_menor
+                               if m < _LIMITE_COMPONENTE and n < _LIMITE_COMPONENTE)
+        return cls(frozenset(exactas), frozenset(mayores), frozenset(mayor_menor), frozenset(sueltas), buffers)
+
+class CatalogoCompilado:
+    """
+    Catálogo de versiones homologadas compilado una sola vez e inmutable:
+    productos con versiones preprocesadas y tabla de alias, de modo que
+    cada consulta es un acceso a diccionario.
+    
+    Un catálogo puede superponerse a otro (superponer): comparte los
+    productos compilados y la tabla de alias del catálogo base y solo
+    compila los productos que cambian. Como nada se modifica después de
+    construirlo, las consultas no toman locks.
+    """
+    
+    __slots__ = ("productos", "alias", "por_versiones", "huella", "nombres", "ids", "metadatos", "base",
+                 "_claves", "_arreglos")
+    
+    def __init__(self, versiones: Mapping[str, List[str]], alias: Mapping[str, str] = ALIAS_SOFTWARE,
+                 metadatos: Optional[Mapping[str, str]] = None, arreglos: Optional[Mapping[str, object]] = None):
+        productos = {nombre: ProductoHomologado.desde_versiones(nombre, lista) for nombre, lista in versiones.items()}
+        self._armar(productos, MappingProxyType(dict(alias)), metadatos, None, arreglos)
+    
+    def _armar(self, productos, alias, metadatos, base, arreglos=None):
+        object.__setattr__(self, 'productos', MappingProxyType(productos))
+        object.__setattr__(self, 'alias', alias)
+        object.__setattr__(self, 'base', base)
+        # Identificador numérico de cada producto; las claves enteras para la
+        # verificación por lotes se arman en el primer uso (ver claves)
+        object.__setattr__(self, 'nombres', tuple(productos))
+        object.__setattr__(self, 'ids', MappingProxyType({nombre: i for i, nombre in enumerate(productos)}))
+        object.__setattr__(self, '_claves', None)
+        object.__setattr__(self, '_arreglos', arreglos)
+        # Versión y fecha del estándar del que proviene el catálogo
+        metadatos = metadatos or {'version_estandar': VERSION_ESTANDAR, 'fecha_actualizacion': FECHA_ESTANDAR}
+        object.__setattr__(self, 'metadatos', MappingProxyType(dict(metadatos)))
+        # Índice por lista de versiones para verificar_version_compatible
+        por_versiones = {producto.versiones: producto for producto in productos.values()}
+        object.__setattr__(self, 'por_versiones', MappingProxyType(por_versiones))
+        versiones = {nombre: list(producto.versiones) for nombre, producto in productos.items()}
+        contenido = json.dumps({'versiones': versiones, 'alias': dict(alias)}, sort_keys=True)
+        object.__setattr__(self, 'huella', hashlib.sha256(contenido.encode('utf-8')).hexdigest())
+    
+    def superponer(self, versiones: Mapping[str, List[str]],
+                   metadatos: Optional[Mapping[str, str]] = None) -> "CatalogoCompilado":
+        """
+        Catálogo con las versiones indicadas sobre las de este (copy-on-write):
+        los productos que no cambian son los mismos objetos del catálogo base
+        """
+        productos = dict(self.productos)
+        for nombre, lista in versiones.items():
+            productos[nombre] = ProductoHomologado.desde_versiones(nombre, lista)
+        catalogo = object.__new__(CatalogoCompilado)
+        catalogo._armar(productos, self.alias, metadatos or self.metadatos, self)
+        return catalogo
+    
+    @property
+    def claves(self) -> ClavesNumericas:
+        """Claves numéricas de la verificación por lotes (se arman en el primer uso)"""
+        claves = self._claves
+        if claves is None:
+            # Sin lock: si dos hilos llegan a la vez, ambos arman las mismas claves
+            claves = ClavesNumericas.desde_productos(self.productos.values(), self._arreglos)
+            object.__setattr__(self, '_claves', claves)
+        return claves
+    
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("El catálogo compilado es inmutable")
+    
+    def __len__(self):
+        return len(self.productos)
+    
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self.productos
+    
+    def id_producto(self, nombre: str) -> int:
+        """Identificador del producto (posición en nombres) o -1 si no está en el catálogo"""
+        producto = self.producto(nombre)
+        return self.ids[producto.nombre] if producto is not None else -1
+    
+    def producto(self, nombre: str) -> Optional[ProductoHomologado]:
+        """Producto por nombre (ya normalizado o alias en minúsculas)"""
+        producto = self.productos.get(nombre)
+        if producto is None:
+            producto = self.productos.get(self.alias.get(nombre, nombre))
+        return producto
+    
+    def es_compatible(self, nombre: str, version: str) -> bool:
+        producto = self.producto(nombre)
+        return producto is not None and producto.es_compatible(version)
+
+_catalogo: Optional[CatalogoCompilado] = None
+_catalogo_lock = threading.Lock()
+# Catálogo de la sesión: cada hilo (o tarea asyncio) tiene su propio valor
+_catalogo_sesion: ContextVar[Optional[CatalogoCompilado]] = ContextVar('catalogo_sesion', default=None)
+
+def obtener_catalogo() -> CatalogoCompilado:
+    """Catálogo vigente: el de la sesión (ver usar_catalogo) o, si no hay, el global"""
+    catalogo = _catalogo_sesion.get()
+    return catalogo if catalogo is not None else obtener_catalogo_base()
+
+def activar_catalogo(catalogo: Optional[CatalogoCompilado]) -> Token:
+    """
+    Establece el catálogo de la sesión en el contexto actual (el hilo o la
+    tarea que llama); None vuelve al catálogo global. Los demás hilos no lo ven.
+    """
+    return _catalogo_sesion.set(catalogo)
+
+@contextmanager
+def usar_catalogo(catalogo: Optional[CatalogoCompilado]) -> Iterator[Optional[CatalogoCompilado]]:
+    """Usa el catálogo como catálogo de la sesión dentro del bloque with"""
+    token = activar_catalogo(catalogo)
+    try:
+        yield catalogo
+    finally:
+        _catalogo_sesion.reset(token)
+
+def obtener_catalogo_base() -> CatalogoCompilado:
+    """
+    Catálogo global, compilado en el primer uso: la instantánea de
+    RUTA_SNAPSHOT si existe y es válida, o si no el de VERSIONES_HOMOLOGADAS
+    """
+    global _catalogo
+    catalogo = _catalogo
+    if catalogo is None:
+        with _catalogo_lock:
+            if _catalogo is None:
+                _catalogo = _cargar_catalogo_base()
+            catalogo = _catalogo
+    return catalogo
+
+def _cargar_catalogo_base() -> CatalogoCompilado:
+    return _catalogo_desde_snapshot(RUTA_SNAPSHOT) or CatalogoCompilado(VERSIONES_HOMOLOGADAS)
+
+def _catalogo_desde_snapshot(ruta: str) -> Optional[CatalogoCompilado]:
+    """Catálogo mapeado desde la instantánea, o None si no existe o no es válida"""
+    if not os.path.exists(ruta):
+        return None
+    from snapshot import load_snapshot
+    
+    try:
+        catalogo = load_snapshot(ruta)
+    except (OSError, ValueError) as e:
+        logger.warning(f"No se pudo leer la instantánea del catálogo {ruta}: {str(e)}")
+        return None
+    return catalogo
+
+def usar_snapshot(ruta: Optional[str] = None) -> CatalogoCompilado:
+    """
+    Reemplaza el catálogo global por la instantánea (por ejemplo, después
+    de actualizarla); los catálogos ya obtenidos siguen siendo válidos
+    
+    Raises:
+        ValueError: si la instantánea no existe o no es válida
+    """
+    global _catalogo
+    ruta = ruta or RUTA_SNAPSHOT
+    with _catalogo_lock:
+        catalogo = _catalogo_desde_snapshot(ruta)
+        if catalogo is None:
+            raise ValueError(f"No hay una instantánea válida del catálogo en {ruta}")
+        _catalogo = catalogo
+    return catalogo
+
+def recompilar_catalogo() -> CatalogoCompilado:
+    """
+    Vuelve a cargar el catálogo global igual que en el primer uso (ver
+    obtener_catalogo_base), con los metadatos de lo que se cargó; los
+    catálogos ya obtenidos siguen siendo válidos
+    """
+    global _catalogo
+    with _catalogo_lock:
+        _catalogo = _cargar_catalogo_base()
+    return _catalogo
 
 def verificar_version_compatible(version_detectada: str, versiones_homologadas: List[str]) -> bool:
     """
@@ -134,92 +481,101 @@ def verificar_version_compatible(version_detectada: str, versiones_homologadas:
     if not version_detectada or not versiones_homologadas:
         return False
     
-    # Verificación exacta
-    if version_detectada in versiones_homologadas:
-        return True
+    # Las listas del catálogo ya están preprocesadas; otras se preprocesan al vuelo
+    versiones = tuple(versiones_homologadas)
+    producto = obtener_catalogo().por_versiones.get(versiones)
+    if producto is None:
+        producto = ProductoHomologado.desde_versiones('', versiones)
+    return producto.es_compatible(version_detectada)
+
+# Nombre seguido de la versión: "jquery 3.6.4", "react v18.2.0", "angular version 17.3.12", "vue3"
+_NOMBRE_CON_VERSION = re.compile(r'^(.+?)[\s\-_@/]+(?:v|version\s*)?(\d.*)$', re.IGNORECASE)
+_NOMBRE_PEGADO_A_VERSION = re.compile(r'^(.+?)(\d.*)$')
+
+def _separar_nombre_version(texto: str, catalogo: CatalogoCompilado):
+    """
+    Devuelve (nombre normalizado, producto o None, versión o None). Prueba el
+    texto completo, luego el nombre antes de una versión separada por espacio
+    o guion y por último el nombre pegado a la versión.
+    """
+    nombre = normalizar_nombre_software(texto)
+    producto = catalogo.producto(nombre)
+    if producto is not None:
+        return producto.nombre, producto, None
     
-    # Verificación de compatibilidad por versión mayor
-    try:
-        partes_detectada = [int(x) for x in version_detectada.split('.')]
+    primer_candidato = None
+    for patron in (_NOMBRE_CON_VERSION, _NOMBRE_PEGADO_A_VERSION):
+        match = patron.match(texto.strip())
+        if not match:
+            continue
+        candidato = normalizar_nombre_software(match.group(1))
+        version = extraer_version(match.group(2))
+        producto = catalogo.producto(candidato)
+        if producto is not None:
+            return producto.nombre, producto, version
+        if primer_candidato is None:
+            primer_candidato = (candidato, version)
+    
+    if primer_candidato is not None:
+        return primer_candidato[0], None, primer_candidato[1]
+    return nombre, None, extraer_version(texto)
+
+def _resultado_busqueda(nombre_software: str, nombre_normalizado: str, producto: Optional[ProductoHomologado],
+                        version_detectada: Optional[str], compatible: bool) -> Dict:
+    """Arma el resultado (con mensaje y recomendación) de buscar_version_homologada"""
+    if producto is not None:
+        versiones_disponibles = list(producto.versiones)
         
-        for version_homologada in versiones_homologadas:
-            try:
-                partes_homologada = [int(x) for x in version_homologada.split('.')]
-                
-                # Comparar versión mayor
-                if len(partes_detectada) >= 1 and len(partes_homologada) >= 1:
-                    if partes_detectada[0] == partes_homologada[0]:
-                        # Misma versión mayor, verificar menor
-                        if len(partes_detectada) >= 2 and len(partes_homologada) >= 2:
-                            if partes_detectada[1] == partes_homologada[1]:
-                                return True
-                        else:
-                            return True
-                            
-            except ValueError:
-                continue
-                
-    except ValueError:
-        pass
+        resultado = {
+            "software": nombre_normalizado,
+            "version_detectada": version_detectada,
+            "versiones_homologadas": versiones_disponibles,
+            "estado": "encontrado",
+            "compatible": compatible
+        }
+        
+        # Verificar compatibilidad si se detectó una versión
+        if version_detectada:
+            if compatible:
+                resultado["mensaje"] = f"✅ {nombre_software} v{version_detectada} es compatible con las versiones homologadas"
+            else:
+                resultado["mensaje"] = f"⚠️ {nombre_software} v{version_detectada} no está en la lista de versiones homologadas"
+                resultado["recomendacion"] = f"Versiones recomendadas: {', '.join(versiones_disponibles)}"
+        else:
+            resultado["mensaje"] = f"ℹ️ {nombre_software} está en el catálogo de software homologado"
+            resultado["recomendacion"] = f"Versiones homologadas: {', '.join(versiones_disponibles)}"
+        
+        return resultado
     
-    return False
+    # Software no encontrado en el catálogo
+    return {
+        "software": nombre_normalizado,
+        "version_detectada": version_detectada,
+        "estado": "no_encontrado",
+        "compatible": False,
+        "mensaje": f"❌ {nombre_software} no se encuentra en el catálogo de software homologado",
+        "recomendacion": "Verifique el estándar ES0901 para software homologado"
+    }
 
-def buscar_version_homologada(nombre_software: str, archivo_txt: Optional[str] = None) -> Dict:
+def buscar_version_homologada(nombre_software: str, archivo_txt: Optional[str] = None,
+                              catalogo: Optional[CatalogoCompilado] = None) -> Dict:
     """
     Busca si una versión de software está homologada según los estándares GCABA
     
     Args:
         nombre_software: Nombre del software a verificar
         archivo_txt: Archivo de texto con versiones (opcional)
+        catalogo: Catálogo a consultar (por defecto, el catálogo global)
         
     Returns:
         Dict con el resultado de la búsqueda
     """
     try:
-        # Normalizar nombre del software
-        nombre_normalizado = normalizar_nombre_software(nombre_software)
-        
-        # Extraer versión si está incluida en el nombre
-        version_detectada = extraer_version(nombre_software)
-        
-        # Buscar en versiones homologadas
-        if nombre_normalizado in VERSIONES_HOMOLOGADAS:
-            versiones_disponibles = VERSIONES_HOMOLOGADAS[nombre_normalizado]
-            
-            resultado = {
-                "software": nombre_normalizado,
-                "version_detectada": version_detectada,
-                "versiones_homologadas": versiones_disponibles,
-                "estado": "encontrado",
-                "compatible": False
-            }
-            
-            # Verificar compatibilidad si se detectó una versión
-            if version_detectada:
-                resultado["compatible"] = verificar_version_compatible(
-                    version_detectada, versiones_disponibles
-                )
-                
-                if resultado["compatible"]:
-                    resultado["mensaje"] = f"✅ {nombre_software} v{version_detectada} es compatible con las versiones homologadas"
-                else:
-                    resultado["mensaje"] = f"⚠️ {nombre_software} v{version_detectada} no está en la lista de versiones homologadas"
-                    resultado["recomendacion"] = f"Versiones recomendadas: {', '.join(versiones_disponibles)}"
-            else:
-                resultado["mensaje"] = f"ℹ️ {nombre_software} está en el catálogo de software homologado"
-                resultado["recomendacion"] = f"Versiones homologadas: {', '.join(versiones_disponibles)}"
-            
-            return resultado
-        else:
-            # Software no encontrado en el catálogo
-            return {
-                "software": nombre_normalizado,
-                "version_detectada": version_detectada,
-                "estado": "no_encontrado",
-                "compatible": False,
-                "mensaje": f"❌ {nombre_software} no se encuentra en el catálogo de software homologado",
-                "recomendacion": "Verifique el estándar ES0901 para software homologado"
-            }
+        # Separar el nombre del software de la versión incluida en el texto
+        catalogo = catalogo or obtener_catalogo()
+        nombre_normalizado, producto, version_detectada = _separar_nombre_version(nombre_software, catalogo)
+        compatible = producto is not None and bool(version_detectada) and producto.es_compatible(version_detectada)
+        return _resultado_busqueda(nombre_software, nombre_normalizado, producto, version_detectada, compatible)
             
     except Exception as e:
         logger.error(f"Error al buscar versión homologada para {nombre_software}: {str(e)}")
@@ -231,7 +587,10 @@ def buscar_version_homologada(nombre_software: str, archivo_txt: Optional[str] =
 
 def cargar_versiones_desde_archivo(archivo_path: str) -> bool:
     """
-    Carga versiones homologadas desde un archivo de texto
+    Carga versiones homologadas desde un archivo de texto: se superponen al
+    catálogo vigente (el de la sesión o, si no hay, el global) y el resultado
+    se activa como catálogo de la sesión en el contexto actual (ver
+    activar_catalogo). Ni el catálogo global ni VERSIONES_HOMOLOGADAS cambian.
     """
     try:
         if not os.path.exists(archivo_path):
@@ -241,17 +600,9 @@ def cargar_versiones_desde_archivo(archivo_path: str) -> bool:
         with open(archivo_path, 'r', encoding='utf-8') as f:
             contenido = f.read()
             
-        # Procesar el contenido del archivo
         # Formato esperado: nombre_software:version1,version2,version3
-        lineas = contenido.strip().split('\n')
-        
-        for linea in lineas:
-            if ':' in linea:
-                nombre, versiones = linea.split(':', 1)
-                nombre = normalizar_nombre_software(nombre.strip())
-                versiones_list = [v.strip() for v in versiones.split(',')]
-                VERSIONES_HOMOLOGADAS[nombre] = versiones_list
-                
+        versiones = parsear_estandar_txt(contenido)
+        activar_catalogo(obtener_catalogo().superponer(versiones))
         logger.info(f"Versiones cargadas desde {archivo_path}")
         return True
         
@@ -259,35 +610,138 @@ def cargar_versiones_desde_archivo(archivo_path: str) -> bool:
         logger.error(f"Error al cargar versiones desde archivo: {str(e)}")
         return False
 
+# Carga de archivos de estándares por sesión
+# Catálogos compilados a partir de archivos subidos, por hash del contenido
+MAX_CATALOGOS_CARGADOS = 16
+_catalogos_cargados: "OrderedDict[Tuple[str, str], CatalogoCompilado]" = OrderedDict()
+_catalogos_cargados_lock = threading.Lock()
+
+# Fila de una tabla del PDF: nombre seguido de una o más versiones ("PHP 8.1.30 / 8.2.24")
+_VERSION_EN_TABLA = re.compile(r'\bv?(\d+(?:\.\d+)*[a-z]?)(?![\w.])', re.IGNORECASE)
+
+def parsear_estandar_txt(texto: str) -> Dict[str, List[str]]:
+    """
+    Versiones de un archivo de texto con líneas "nombre_software:version1,version2";
+    se ignoran las líneas vacías, los comentarios (#) y las que no tienen ":"
+    """
+    versiones = {}
+    for linea in texto.splitlines():
+        linea = linea.strip().lstrip('\ufeff')
+        if not linea or linea.startswith('#') or ':' not in linea:
+            continue
+        nombre, lista = linea.split(':', 1)
+        nombre = normalizar_nombre_software(nombre.strip())
+        lista = [v.strip() for v in lista.split(',') if v.strip()]
+        if nombre and lista:
+            versiones[nombre] = lista
+    return versiones
+
+def _texto_pdf(contenido: bytes) -> str:
+    from PyPDF2 import PdfReader
+    
+    return "\n".join(pagina.extract_text() or "" for pagina in PdfReader(io.BytesIO(contenido)).pages)
+
+def parsear_texto_pdf(texto: str, conocidos: Optional[CatalogoCompilado] = None) -> Dict[str, List[str]]:
+    """
+    Versiones del texto extraído de un PDF del estándar. Se toman las líneas
+    "nombre: versiones" y las filas de tabla cuyo nombre es un producto o
+    alias del catálogo seguido de sus versiones; el resto del texto
+    (títulos, numeración de páginas) se descarta.
+    """
+    conocidos = conocidos or obtener_catalogo()
+    versiones = parsear_estandar_txt(texto)
+    for linea in texto.splitlines():
+        match = _VERSION_EN_TABLA.search(linea)
+        if not match or ':' in linea:
+            continue
+        nombre = normalizar_nombre_software(linea[:match.start()].strip(' \t|-–'))
+        producto = conocidos.producto(nombre)
+        if producto is not None:
+            lista = _VERSION_EN_TABLA.findall(linea, match.start())
+            versiones.setdefault(producto.nombre, [])
+            versiones[producto.nombre].extend(v for v in lista if v not in versiones[producto.nombre])
+    return versiones
+
+def parsear_estandar_pdf(contenido: bytes, conocidos: Optional[CatalogoCompilado] = None) -> Dict[str, List[str]]:
+    """Versiones de un PDF del estándar (requiere PyPDF2)"""
+    return parsear_texto_pdf(_texto_pdf(contenido), conocidos)
+
+def leer_estandar(contenido: bytes, nombre_archivo: str = "",
+                  conocidos: Optional[CatalogoCompilado] = None) -> Tuple[str, Dict[str, List[str]]]:
+    """Texto y versiones de un archivo de estándares .txt o .pdf (se reconoce por la firma %PDF)"""
+    if contenido[:5] == b'%PDF-' or nombre_archivo.lower().endswith('.pdf'):
+        texto = _texto_pdf(contenido)
+        return texto, parsear_texto_pdf(texto, conocidos)
+    texto = contenido.decode('utf-8', errors='replace')
+    return texto, parsear_estandar_txt(texto)
+
+def parsear_estandar(contenido: bytes, nombre_archivo: str = "") -> Dict[str, List[str]]:
+    """Versiones de un archivo de estándares .txt o .pdf"""
+    return leer_estandar(contenido, nombre_archivo)[1]
+
+def cargar_catalogo(contenido: bytes, nombre_archivo: str = "",
+                    base: Optional[CatalogoCompilado] = None) -> CatalogoCompilado:
+    """
+    Compila un catálogo inmutable con las versiones del archivo superpuestas
+    al catálogo base (por defecto el global), sin modificar
+    VERSIONES_HOMOLOGADAS. El resultado se
+    guarda por hash del contenido: cargar otra vez el mismo archivo (por
+    ejemplo en cada re-ejecución de Streamlit) devuelve el mismo catálogo.
+    
+    Raises:
+        ValueError: si el archivo no contiene versiones reconocibles
+    """
+    base = base or obtener_catalogo_base()
+    clave = (hashlib.sha256(contenido).hexdigest(), base.huella)
+    with _catalogos_cargados_lock:
+        catalogo = _catalogos_cargados.get(clave)
+        if catalogo is not None:
+            _catalogos_cargados.move_to_end(clave)
+            return catalogo
+    
+    versiones_archivo = parsear_estandar(contenido, nombre_archivo)
+    if not versiones_archivo:
+        raise ValueError(f"No se reconocieron versiones homologadas en {nombre_archivo or 'el archivo'}")
+    catalogo = base.superponer(versiones_archivo, dict(base.metadatos, archivo=nombre_archivo))
+    
+    with _catalogos_cargados_lock:
+        catalogo = _catalogos_cargados.setdefault(clave, catalogo)
+        while len(_catalogos_cargados) > MAX_CATALOGOS_CARGADOS:
+            _catalogos_cargados.popitem(last=False)
+    return catalogo
+
+def cargar_catalogo_desde_archivo(archivo_path: str, base: Optional[CatalogoCompilado] = None) -> CatalogoCompilado:
+    with open(archivo_path, 'rb') as f:
+        return cargar_catalogo(f.read(), os.path.basename(archivo_path), base)
+
 def descargar_estandar_oficial() -> bool:
     """
-    Descarga el estándar oficial desde la web de GCABA
+    Actualiza el catálogo con el documento ES0901 más reciente dejado en
+    ./config (PDF o txt), sin acceso a la red: se genera la instantánea
+    binaria (ver snapshot.py) y se activa en este proceso. El documento se
+    obtiene de la web oficial de la Agencia:
+    https://buenosaires.gob.ar/agencia-de-sistemas-de-informacion/estandares-de-la-agencia
     """
     try:
-        url = "https://buenosaires.gob.ar/agencia-de-sistemas-de-informacion/estandares-de-la-agencia"
-        
-        # Nota: En un entorno real, aquí se implementaría la lógica para:
-        # 1. Descargar el PDF del estándar
-        # 2. Extraer las versiones homologadas
-        # 3. Actualizar el diccionario VERSIONES_HOMOLOGADAS
-        
-        logger.info("Función de descarga de estándar oficial no implementada")
-        logger.info("Utilizando versiones homologadas predeterminadas basadas en ES0901 v4.7")
+        from snapshot import update_catalog
         
+        metadatos = update_catalog()
+        logger.info(f"Catálogo actualizado: {metadatos['version_estandar']} ({metadatos['fecha_actualizacion']})")
         return True
         
     except Exception as e:
-        logger.error(f"Error al descargar estándar oficial: {str(e)}")
+        logger.error(f"Error al actualizar el estándar oficial: {str(e)}")
         return False
 
 def obtener_catalogo_completo() -> Dict:
     """
     Obtiene el catálogo completo de software homologado
     """
+    catalogo = obtener_catalogo()
     return {
-        "version_estandar": "ES0901 v4.7",
-        "fecha_actualizacion": "Enero 2025",
-        "total_software": len(VERSIONES_HOMOLOGADAS),
+        "version_estandar": catalogo.metadatos.get("version_estandar", VERSION_ESTANDAR),
+        "fecha_actualizacion": catalogo.metadatos.get("fecha_actualizacion", FECHA_ESTANDAR),
+        "total_software": len(catalogo),
         "categorias": {
             "lenguajes": ["php", "python", "java", "nodejs"],
             "frameworks_frontend": ["angular", "react", "vue", "nextjs"],
@@ -297,34 +751,219 @@ def obtener_catalogo_completo() -> Dict:
             "bibliotecas_js": ["jquery", "bootstrap", "chart.js", "moment"],
             "sistemas_operativos": ["rhel", "android", "ios"]
         },
-        "software_homologado": VERSIONES_HOMOLOGADAS
+        "software_homologado": {nombre: list(producto.versiones) for nombre, producto in catalogo.productos.items()}
     }
 
-def generar_reporte_verificacion(software_list: List[str]) -> Dict:
+# Verificación por lotes
+# Estado por fila de VerificacionLote.estados
+ESTADO_COMPATIBLE = 0
+ESTADO_NO_COMPATIBLE = 1
+ESTADO_SIN_VERSION = 2
+ESTADO_NO_ENCONTRADO = 3
+
+class VerificacionLote:
     """
-    Genera un reporte de verificación para una lista de software
+    Resultado columnar de verificar_lote: una columna por atributo y una fila
+    por elemento verificado, en el orden de entrada. Los mensajes legibles
+    no se arman al verificar; detalle(i) y detalles() los construyen a pedido
+    con el mismo formato que buscar_version_homologada.
+    
+    Con numpy instalado, productos, estados y compatibles son arreglos
+    (int32, int8 y bool); sin numpy son listas.
     """
-    reporte = {
-        "fecha_verificacion": "2025-01-01",
-        "total_verificados": len(software_list),
-        "compatibles": 0,
-        "no_compatibles": 0,
-        "no_encontrados": 0,
-        "detalles": []
-    }
     
-    for software in software_list:
-        resultado = buscar_version_homologada(software)
-        reporte["detalles"].append(resultado)
-        
-        if resultado.get("estado") == "encontrado":
-            if resultado.get("compatible", False):
-                reporte["compatibles"] += 1
-            else:
-                reporte["no_compatibles"] += 1
+    __slots__ = ("entradas", "software", "versiones", "productos", "estados", "compatibles", "catalogo")
+    
+    def __init__(self, entradas, software, versiones, productos, estados, compatibles, catalogo):
+        self.entradas = entradas
+        self.software = software
+        self.versiones = versiones
+        self.productos = productos
+        self.estados = estados
+        self.compatibles = compatibles
+        self.catalogo = catalogo
+    
+    def __len__(self):
+        return len(self.entradas)
+    
+    def resumen(self) -> Dict[str, int]:
+        """Cantidad de filas por resultado, con las claves de generar_reporte_verificacion"""
+        if NUMPY_DISPONIBLE and not isinstance(self.estados, list):
+            cuentas = _numpy().bincount(self.estados, minlength=4).tolist()
         else:
-            reporte["no_encontrados"] += 1
+            cuentas = [0] * 4
+            for estado in self.estados:
+                cuentas[estado] += 1
+        return {
+            "total_verificados": len(self),
+            "compatibles": cuentas[ESTADO_COMPATIBLE],
+            "no_compatibles": cuentas[ESTADO_NO_COMPATIBLE] + cuentas[ESTADO_SIN_VERSION],
+            "no_encontrados": cuentas[ESTADO_NO_ENCONTRADO],
+        }
+    
+    def indices(self, estado: int) -> List[int]:
+        """Filas con el estado indicado (por ejemplo ESTADO_NO_COMPATIBLE)"""
+        if NUMPY_DISPONIBLE and not isinstance(self.estados, list):
+            return _numpy().flatnonzero(self.estados == estado).tolist()
+        return [i for i, valor in enumerate(self.estados) if valor == estado]
+    
+    def detalle(self, i: int) -> Dict:
+        """Resultado de la fila i en el formato de buscar_version_homologada"""
+        producto_id = int(self.productos[i])
+        producto = self.catalogo.productos[self.catalogo.nombres[producto_id]] if producto_id >= 0 else None
+        return _resultado_busqueda(self.entradas[i], self.software[i], producto,
+                                   self.versiones[i], bool(self.compatibles[i]))
+    
+    def detalles(self, filas: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+        for i in (range(len(self)) if filas is None else filas):
+            yield self.detalle(i)
+
+def verificar_lote(elementos: Iterable[Union[str, Tuple[str, Optional[str]]]],
+                   catalogo: Optional[CatalogoCompilado] = None) -> VerificacionLote:
+    """
+    Verifica muchos elementos de una vez (por ejemplo los componentes de un
+    SBOM o de un lockfile de dependencias).
     
+    Args:
+        elementos: Pares (software, versión) o textos "software versión"
+        catalogo: Catálogo compilado (por defecto el de VERSIONES_HOMOLOGADAS)
+    
+    Returns:
+        VerificacionLote con una fila por elemento
+    
+    Los nombres y las versiones repetidos se normalizan y se parsean una sola
+    vez; la regla de compatibilidad se aplica sobre columnas de claves
+    enteras en lugar de elemento por elemento.
+    """
+    catalogo = catalogo or obtener_catalogo()
+    
+    # Normalizar cada entrada distinta una sola vez
+    entradas, software, versiones, productos = [], [], [], []
+    separadas = {}
+    for elemento in elementos:
+        clave = elemento if isinstance(elemento, str) else (elemento[0], elemento[1] or None)
+        separada = separadas.get(clave)
+        if separada is None:
+            if isinstance(elemento, str):
+                nombre, producto, version = _separar_nombre_version(elemento, catalogo)
+            else:
+                nombre = normalizar_nombre_software(clave[0])
+                producto = catalogo.producto(nombre)
+                # La versión de un par se normaliza igual que la de un texto; si no se
+                # reconoce ninguna (por ejemplo "latest") se conserva tal cual
+                version = str(clave[1]).strip() if clave[1] is not None else None
+                version = (extraer_version(version) or version) if version else None
+                nombre = producto.nombre if producto is not None else nombre
+            entrada = elemento if isinstance(elemento, str) else elemento[0]
+            separada = (entrada, nombre, version or None,
+                        catalogo.ids[producto.nombre] if producto is not None else -1)
+            separadas[clave] = separada
+        entradas.append(separada[0])
+        software.append(separada[1])
+        versiones.append(separada[2])
+        productos.append(separada[3])
+    
+    # Parsear cada versión distinta una sola vez: columnas de mayor, menor y cantidad de componentes
+    codigos = {}
+    mayores, menores, componentes = [], [], []
+    filas_version = []
+    for version in versiones:
+        codigo = codigos.get(version)
+        if codigo is None:
+            codigo = codigos[version] = len(mayores)
+            partes = _partes_version(version) if version else None
+            if partes and all(p < _LIMITE_COMPONENTE for p in partes[:2]):
+                mayores.append(partes[0])
+                menores.append(partes[1] if len(partes) > 1 else 0)
+                componentes.append(min(len(partes), 2))
+            else:
+                # 0: no numérica (solo coincidencia exacta); -1: numérica fuera de rango
+                mayores.append(0)
+                menores.append(0)
+                componentes.append(-1 if partes else 0)
+        filas_version.append(codigo)
+    
+    # Coincidencias exactas sobre los pares (producto, versión) distintos
+    exactas_catalogo = catalogo.claves.exactas
+    exactas, filas_exactas = {}, []
+    for par in zip(productos, versiones):
+        exacta = exactas.get(par)
+        if exacta is None:
+            exacta = exactas[par] = par[0] >= 0 and bool(par[1]) and par in exactas_catalogo
+        filas_exactas.append(exacta)
+    
+    if NUMPY_DISPONIBLE:
+        estados, compatibles, productos = _clasificar_numpy(catalogo.claves, productos, versiones, filas_version,
+                                                            mayores, menores, componentes, filas_exactas)
+    else:
+        estados, compatibles = _clasificar_python(catalogo.claves, productos, versiones, filas_version,
+                                                  mayores, menores, componentes, filas_exactas)
+    
+    # Componentes que no entran en las claves enteras (versiones tipo fecha): regla fila por fila
+    fuera_de_rango = [i for i, fila in enumerate(filas_version) if componentes[fila] < 0]
+    for i in fuera_de_rango:
+        producto_id = int(productos[i])
+        if producto_id >= 0 and catalogo.productos[catalogo.nombres[producto_id]].es_compatible(versiones[i]):
+            estados[i], compatibles[i] = ESTADO_COMPATIBLE, True
+    return VerificacionLote(entradas, software, versiones, productos, estados, compatibles, catalogo)
+
+def _clasificar_numpy(claves, productos, versiones, filas_version, mayores, menores, componentes, exactas):
+    np = _numpy()
+    productos = np.asarray(productos, dtype=np.int32)
+    filas_version = np.asarray(filas_version, dtype=np.intp)
+    mayor = np.asarray(mayores, dtype=np.int64)[filas_version]
+    menor = np.asarray(menores, dtype=np.int64)[filas_version]
+    partes = np.asarray(componentes, dtype=np.int8)[filas_version]
+    
+    encontrado = productos >= 0
+    con_version = np.fromiter((bool(v) for v in versiones), dtype=bool, count=len(versiones))
+    pid = np.where(encontrado, productos, 0).astype(np.int64)
+    clave_mayor = (pid << _BITS_COMPONENTE) | mayor
+    clave_mayor_menor = (clave_mayor << _BITS_COMPONENTE) | menor
+    
+    arreglos = claves.arreglos
+    compatibles = np.asarray(exactas, dtype=bool)
+    compatibles |= (partes == 1) & np.isin(clave_mayor, arreglos['mayores'])
+    compatibles |= (partes == 2) & (np.isin(clave_mayor_menor, arreglos['mayor_menor'])
+                                    | np.isin(clave_mayor, arreglos['mayores_sueltas']))
+    compatibles &= encontrado & con_version
+    
+    estados = np.full(len(productos), ESTADO_NO_ENCONTRADO, dtype=np.int8)
+    estados[encontrado & ~con_version] = ESTADO_SIN_VERSION
+    estados[encontrado & con_version] = ESTADO_NO_COMPATIBLE
+    estados[compatibles] = ESTADO_COMPATIBLE
+    return estados, compatibles, productos
+
+def _clasificar_python(claves, productos, versiones, filas_version, mayores, menores, componentes, exactas):
+    estados, compatibles = [], []
+    for producto_id, version, fila, exacta in zip(productos, versiones, filas_version, exactas):
+        if producto_id < 0:
+            estados.append(ESTADO_NO_ENCONTRADO)
+            compatibles.append(False)
+            continue
+        if not version:
+            estados.append(ESTADO_SIN_VERSION)
+            compatibles.append(False)
+            continue
+        partes = componentes[fila]
+        compatible = exacta
+        if not compatible and partes == 1:
+            compatible = _clave_mayor(producto_id, mayores[fila]) in claves.mayores
+        elif not compatible and partes == 2:
+            compatible = (_clave_mayor_menor(producto_id, mayores[fila], menores[fila]) in claves.mayor_menor
+                          or _clave_mayor(producto_id, mayores[fila]) in claves.mayores_sueltas)
+        estados.append(ESTADO_COMPATIBLE if compatible else ESTADO_NO_COMPATIBLE)
+        compatibles.append(compatible)
+    return estados, compatibles
+
+def generar_reporte_verificacion(software_list: List[str]) -> Dict:
+    """
+    Genera un reporte de verificación para una lista de software
+    """
+    lote = verificar_lote(software_list)
+    reporte = {"fecha_verificacion": "2025-01-01"}
+    reporte.update(lote.resumen())
+    reporte["detalles"] = list(lote.detalles())
     return reporte
 
 # Funciones de utilidad para Streamlit
@@ -339,15 +978,14 @@ def obtener_versiones_recomendadas(software: str) -> List[str]:
     """
     Obtiene las versiones recomendadas para un software específico
     """
-    nombre_normalizado = normalizar_nombre_software(software)
-    return VERSIONES_HOMOLOGADAS.get(nombre_normalizado, [])
+    producto = obtener_catalogo().producto(normalizar_nombre_software(software))
+    return list(producto.versiones) if producto is not None else []
 
 def es_software_homologado(software: str) -> bool:
     """
     Verifica si un software está en el catálogo homologado
     """
-    nombre_normalizado = normalizar_nombre_software(software)
-    return nombre_normalizado in VERSIONES_HOMOLOGADAS
+    return obtener_catalogo().producto(normalizar_nombre_software(software)) is not None
 
 if __name__ == "__main__":
     # Pruebas del módulo
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sondeo de exposición de directorios y archivos comunes (chequeo 13):
+lectura de la lista de rutas y descarte de soft-404 comparando cada
+respuesta con la de una ruta inexistente (chequeo 9)
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wordlists', 'common_paths.txt')
+
+def load_wordlist(source) -> List[str]:
+    """
+    Lee rutas desde un archivo (una por línea, # para comentarios) o desde
+    un iterable de cadenas. Normaliza la barra inicial y descarta duplicados
+    conservando el orden.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    else:
+        lines = list(source)
+    
+    paths = []
+    for line in lines:
+        path = line.strip()
+        if not path or path.startswith('#'):
+            continue
+        paths.append(path if path.startswith('/') else '/' + path)
+    return list(dict.fromkeys(paths))
+
+class SoftNotFound:
+    """
+    Huella de la respuesta a una ruta inexistente. Los sitios que responden
+    200 a cualquier ruta (SPA, páginas de error propias) devuelven casi el
+    mismo contenido para todas; esas respuestas no cuentan como exposición.
+    """
+    
+    SIMILARITY = 0.9
+    TOKEN_PATTERN = re.compile(r'\w+')
+    
+    def __init__(self, baseline=None, baseline_path: str = ''):
+        self.status = None
+        self.final_url = None
+        self.tokens = None
+        if baseline is not None and baseline.ok:
+            self.status = baseline.status
+            self.final_url = baseline.final_url
+            self.tokens = self._tokens(baseline.text(), baseline_path)
+    
+    def _tokens(self, text: str, path: str) -> set:
+        # La ruta pedida suele repetirse en la página de error: no debe influir en la comparación
+        text = text.lower()
+        if path:
+            text = text.replace(path.lower(), ' ')
+        return set(self.TOKEN_PATTERN.findall(text))
+    
+    def matches(self, result, path: str) -> bool:
+        """Indica si result es la misma respuesta genérica que la ruta inexistente"""
+        if self.status is None or result.status != self.status:
+            return False
+        if result.final_url == self.final_url and result.final_url != result.url:
+            # Ambas rutas redirigen al mismo destino (por ejemplo, el login)
+            return True
+        if result.method == 'HEAD':
+            return False
+        
+        tokens = self._tokens(result.text(), path)
+        if not tokens and not self.tokens:
+            return True
+        union = tokens | self.tokens
+        return len(tokens & self.tokens) / len(union) >= self.SIMILARITY
+
+def classify_exposures(results: Iterable, soft_404: SoftNotFound, prefix: str = 'path:') -> Dict:
+    """Resume los sondeos de rutas: expuestas, soft-404 descartados y errores"""
+    summary = {'probed': 0, 'exposed': [], 'soft_404': [], 'errors': 0}
+    for result in results:
+        if not result.key.startswith(prefix):
+            continue
+        path = result.key[len(prefix):]
+        summary['probed'] += 1
+        if not result.ok:
+            summary['errors'] += 1
+        elif result.status == 200:
+            if soft_404.matches(result, path):
+                summary['soft_404'].append(path)
+            else:
+                summary['exposed'].append(path)
+    return summary
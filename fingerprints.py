@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Base persistente de huellas de recursos de terceros (scripts y hojas de
+estilo): el hash SHA-256 del contenido apunta al análisis ya hecho
+(bibliotecas y versiones, IPs, posibles credenciales).
+
+Las mismas jquery-3.6.4.min.js o bootstrap aparecen en cientos de
+aplicaciones: con la huella conocida, assets.py resuelve el recurso con una
+consulta en lugar de recorrerlo con las expresiones regulares, en cualquier
+escaneo y en cualquier proceso que abra el mismo archivo. Se guarda en
+SQLite (modo WAL: varios procesos leen y escriben a la vez).
+
+Uso:
+    python fingerprints.py              # tamaño de la base
+    python fingerprints.py --vaciar
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+FINGERPRINT_DB = os.environ.get('CHECKPOINT_FINGERPRINT_DB',
+                                os.path.join(os.environ.get('CHECKPOINT_REPORTS_DIR', 'reports'), 'fingerprints.sqlite'))
+# Cambiar al modificar lo que se extrae de los recursos para invalidar los análisis guardados
+ANALYSIS_VERSION = 1
+MAX_ENTRIES = 200000
+# Cada cuántas escrituras se revisa el recorte de la base
+EVICT_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    digest TEXT NOT NULL,
+    analyzer TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    analysis TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (digest, analyzer)
+) WITHOUT ROWID
+"""
+
+class FingerprintDB:
+    """
+    Huellas de contenido en un archivo SQLite. analyzer identifica cómo se
+    hizo el análisis (versión de assets.py y productos del detector): un
+    catálogo con otras bibliotecas no reutiliza análisis ajenos. Los errores
+    de disco no interrumpen el escaneo: la base se comporta como vacía.
+    """
+    
+    def __init__(self, path: str = FINGERPRINT_DB, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Conexión abierta en el primer uso (y en cada proceso hijo del lote); con el lock tomado"""
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            # Una conexión heredada con fork no se usa ni se cierra: es del proceso padre
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+    
+    def get(self, digest: str, analyzer: str) -> Optional[Dict]:
+        """Análisis guardado para el contenido, o None"""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT analysis FROM fingerprints WHERE digest = ? AND analyzer = ?", (digest, analyzer)).fetchone()
+                self.stats['hits' if row else 'misses'] += 1
+        except (sqlite3.Error, OSError):
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def put(self, digest: str, analyzer: str, size: int, analysis: Dict):
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute("INSERT OR IGNORE INTO fingerprints VALUES (?, ?, ?, ?, ?)",
+                                   (digest, analyzer, size, json.dumps(analysis, ensure_ascii=False), time.time()))
+                self.stats['stores'] += 1
+                self._writes += 1
+                # El recorte se revisa cada tanto, no en cada escritura
+                if self._writes % EVICT_EVERY == 0:
+                    self._evict(connection)
+        except (sqlite3.Error, OSError):
+            pass
+    
+    def _evict(self, connection: sqlite3.Connection):
+        """Borra las huellas más antiguas por encima de max_entries"""
+        (count,) = connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()
+        if count > self.max_entries:
+            connection.execute("DELETE FROM fingerprints WHERE (digest, analyzer) IN (SELECT digest, analyzer "
+                               "FROM fingerprints ORDER BY created LIMIT ?)", (count - self.max_entries,))
+    
+    def count(self) -> int:
+        try:
+            with self._lock:
+                return self._connect().execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return 0
+    
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM fingerprints")
+            self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+    
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+                self._connection = None
+
+_shared_dbs: Dict[str, FingerprintDB] = {}
+_shared_lock = threading.Lock()
+
+def get_fingerprint_db(path: Optional[str] = FINGERPRINT_DB) -> Optional[FingerprintDB]:
+    """Base compartida por proceso para un archivo; None si path está vacío (base desactivada)"""
+    if not path:
+        return None
+    with _shared_lock:
+        db = _shared_dbs.get(path)
+        if db is None:
+            db = _shared_dbs[path] = FingerprintDB(path)
+        return db
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Base de huellas de scripts y hojas de estilo analizados")
+    parser.add_argument("--base", default=FINGERPRINT_DB, help="Archivo SQLite de la base")
+    parser.add_argument("--vaciar", action="store_true", help="Borrar todas las huellas guardadas")
+    args = parser.parse_args(argv)
+    
+    db = FingerprintDB(args.base)
+    try:
+        if args.vaciar:
+            db.clear()
+        size = os.path.getsize(args.base) if os.path.exists(args.base) else 0
+        print(f"{args.base}: {db.count()} huellas, {size} bytes")
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
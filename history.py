@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Historial de escaneos en SQLite: cada ejecución de check_security (y cada
+recorrido del modo crawl) guarda su resultado con la URL, el proyecto, el
+ticket y la fecha, y cada chequeo en una fila propia.
+
+Los índices por URL, proyecto, ticket, fecha y número de chequeo resuelven
+en milisegundos las consultas de la interfaz ("aplicaciones que fallan el
+chequeo 3 este mes", tasa de aprobación por día) aun con cientos de miles
+de escaneos. Modo WAL: los procesos del lote escriben a la vez.
+
+Uso:
+    python history.py                           # escaneos guardados
+    python history.py --falla 3 --desde 2026-10-01
+    python history.py --tendencia semana --proyecto Sistema_Eventos
+    python history.py --purgar 365              # borrar los de más de un año
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+HISTORY_DB = os.environ.get('CHECKPOINT_HISTORY_DB',
+                            os.path.join(os.environ.get('CHECKPOINT_REPORTS_DIR', 'reports'), 'history.sqlite'))
+
+# Cada cuántos escaneos guardados se actualizan las estadísticas del planificador de consultas
+ANALYZE_EVERY = 1000
+
+# Período de agrupación de las tendencias sobre la columna day (AAAA-MM-DD)
+BUCKETS = {
+    'dia': "day",
+    'semana': "strftime('%Y-%W', day)",
+    'mes': "substr(day, 1, 7)",
+}
+
+# day y project se repiten en checks para que las tendencias se resuelvan solo con el índice
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    project TEXT NOT NULL,
+    ticket TEXT NOT NULL,
+    author TEXT NOT NULL,
+    version TEXT NOT NULL,
+    created REAL NOT NULL,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_url ON scans (url, created);
+CREATE INDEX IF NOT EXISTS scans_project ON scans (project, created);
+CREATE INDEX IF NOT EXISTS scans_ticket ON scans (ticket, created);
+CREATE INDEX IF NOT EXISTS scans_created ON scans (created, url, status);
+CREATE INDEX IF NOT EXISTS scans_day ON scans (day, project, status);
+CREATE TABLE IF NOT EXISTS checks (
+    scan_id INTEGER NOT NULL,
+    check_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    details TEXT NOT NULL,
+    created REAL NOT NULL,
+    day TEXT NOT NULL,
+    project TEXT NOT NULL,
+    PRIMARY KEY (scan_id, check_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS checks_id ON checks (check_id, day, project, passed);
+CREATE INDEX IF NOT EXISTS checks_day ON checks (day, project, check_id, passed);
+"""
+
+def check_number(name: str) -> int:
+    """Número del chequeo a partir de su nombre ("3. X-FRAME OPTIONS" -> 3); 0 si no tiene"""
+    prefix = name.split('.', 1)[0].strip()
+    return int(prefix) if prefix.isdigit() else 0
+
+def timestamp(value) -> Optional[float]:
+    """Fecha de un filtro (datetime, date, 'AAAA-MM-DD' o segundos) como segundos desde la época"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return value.timestamp()
+
+class HistoryDB:
+    """
+    Historial de escaneos en un archivo SQLite. Como la base de huellas, un
+    error de disco no interrumpe el escaneo: record lo ignora y las
+    consultas devuelven listas vacías.
+    """
+    
+    def __init__(self, path: str = HISTORY_DB):
+        self.path = path
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Conexión abierta en el primer uso (y en cada proceso hijo del lote); con el lock tomado"""
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            # Sin estadísticas, SQLite elige mal el índice de las tendencias (segundos en lugar de
+            # milisegundos); con analysis_limit, ANALYZE lee una muestra y tarda pocos milisegundos
+            connection.execute("PRAGMA analysis_limit=1000")
+            connection.execute("ANALYZE")
+            # Una conexión heredada con fork no se usa ni se cierra: es del proceso padre
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+    
+    def _query(self, sql: str, params=()) -> List[Dict]:
+        try:
+            with self._lock:
+                return [dict(row) for row in self._connect().execute(sql, params).fetchall()]
+        except (sqlite3.Error, OSError):
+            return []
+    
+    def record(self, url: str, success: bool, result, project: Optional[Dict] = None,
+               created: Optional[float] = None) -> Optional[int]:
+        """Guarda un escaneo (o su error) y devuelve su id; project tiene las claves del informe"""
+        project = project or {}
+        created = created or time.time()
+        day = datetime.fromtimestamp(created).strftime('%Y-%m-%d')
+        name = project.get('nombre') or ''
+        if success:
+            status, error = result['status'], None
+            counts = (result['total'], result['passed'], result['failed'])
+            checks = result['checks']
+        else:
+            status, error, counts, checks = 'ERROR', str(result), (0, 0, 0), []
+        
+        try:
+            with self._lock:
+                connection = self._connect()
+                # Escaneo y chequeos en una sola transacción: una consulta nunca ve un escaneo a medias
+                with connection:
+                    connection.execute("BEGIN")
+                    cursor = connection.execute(
+                        "INSERT INTO scans (url, project, ticket, author, version, created, day, status, total, "
+                        "passed, failed, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (url, name, project.get('ticket') or '', project.get('autor') or '',
+                         project.get('version') or '', created, day, status) + counts + (error,))
+                    scan_id = cursor.lastrowid
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO checks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(scan_id, check_number(check_name), check_name, int(bool(passed)), str(details),
+                          created, day, name) for check_name, passed, details in checks])
+                self._writes += 1
+                if self._writes % ANALYZE_EVERY == 0:
+                    connection.execute("ANALYZE")
+            return scan_id
+        except (sqlite3.Error, OSError):
+            return None
+    
+    def scans(self, url: Optional[str] = None, project: Optional[str] = None, ticket: Optional[str] = None,
+              since=None, until=None, limit: int = 100) -> List[Dict]:
+        """Escaneos más recientes primero, con los filtros indicados"""
+        where, params = self._window(since, until)
+        for column, value in (('url', url), ('project', project), ('ticket', ticket)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        return self._query(f"SELECT * FROM scans {self._where(where)} ORDER BY created DESC, id DESC LIMIT ?",
+                           params + [limit])
+    
+    def checks_of(self, scan_id: int) -> List[Tuple]:
+        """Chequeos de un escaneo como (nombre, estado, detalles), en el orden del informe"""
+        rows = self._query("SELECT name, passed, details FROM checks WHERE scan_id = ? ORDER BY check_id",
+                           (scan_id,))
+        return [(row['name'], bool(row['passed']), row['details']) for row in rows]
+    
+    def failing(self, check_id: int, since=None, until=None, project: Optional[str] = None,
+                latest: bool = True) -> List[Dict]:
+        """
+        Aplicaciones que fallan un chequeo en el período. Con latest se mira
+        solo el último escaneo de cada URL en el período (una aplicación que ya
+        se corrigió no aparece); sin él, cada escaneo fallido.
+        """
+        where, params = self._window(since, until, 's.')
+        if project:
+            where.append("s.project = ?")
+            params.append(project)
+        
+        if latest:
+            sql = (f"WITH last AS (SELECT s.url, MAX(s.created) AS created FROM scans s "
+                   f"{self._where(where + ['s.status != ?'])} GROUP BY s.url) "
+                   "SELECT s.id, s.url, s.project, s.ticket, s.created, c.name, c.details "
+                   "FROM last JOIN scans s ON s.url = last.url AND s.created = last.created "
+                   "JOIN checks c ON c.scan_id = s.id AND c.check_id = ? WHERE c.passed = 0 ORDER BY s.url")
+            return self._query(sql, params + ['ERROR', check_id])
+        
+        # El rango de días recorre el índice checks_id; created ajusta los extremos
+        days, days_params = self._days(since, None, 'c.')
+        where = days + [clause.replace('s.created', 'c.created') for clause in where]
+        params = days_params + params
+        sql = ("SELECT s.id, s.url, s.project, s.ticket, s.created, c.name, c.details FROM checks c "
+               f"JOIN scans s ON s.id = c.scan_id {self._where(['c.check_id = ?', 'c.passed = 0'] + where)} "
+               "ORDER BY c.created DESC")
+        return self._query(sql, [check_id] + params)
+    
+    def trend(self, since=None, until=None, bucket: str = 'dia', check_id: Optional[int] = None,
+              project: Optional[str] = None) -> List[Dict]:
+        """
+        Tasa de aprobación por período: de los escaneos (sin errores de
+        conexión) o, con check_id, de ese chequeo
+        """
+        expression = BUCKETS[bucket]
+        where, params = self._days(since, until)
+        if project:
+            where.append("project = ?")
+            params.append(project)
+        if check_id is None:
+            table, passed = "scans", "status = 'APROBADO'"
+            where.append("status != 'ERROR'")
+        else:
+            table, passed = "checks", "passed"
+            where.append("check_id = ?")
+            params.append(check_id)
+        
+        rows = self._query(f"SELECT {expression} AS period, COUNT(*) AS scans, SUM({passed}) AS passed "
+                           f"FROM {table} {self._where(where)} GROUP BY period ORDER BY period", params)
+        for row in rows:
+            row['rate'] = row['passed'] / row['scans']
+        return rows
+    
+    def check_rates(self, since=None, until=None, project: Optional[str] = None) -> List[Dict]:
+        """Tasa de aprobación de cada chequeo en el período"""
+        where, params = self._days(since, until)
+        if project:
+            where.append("project = ?")
+            params.append(project)
+        rows = self._query("SELECT check_id, COUNT(*) AS scans, SUM(passed) AS passed FROM checks "
+                           f"{self._where(where)} GROUP BY check_id ORDER BY check_id", params)
+        for row in rows:
+            row['rate'] = row['passed'] / row['scans']
+        return rows
+    
+    def _window(self, since, until, prefix: str = '') -> Tuple[List[str], List]:
+        where, params = [], []
+        if since is not None:
+            where.append(f"{prefix}created >= ?")
+            params.append(timestamp(since))
+        if until is not None:
+            where.append(f"{prefix}created < ?")
+            params.append(timestamp(until))
+        return where, params
+    
+    def _days(self, since, until, prefix: str = '') -> Tuple[List[str], List]:
+        """Filtro por la columna day (la de los índices de las tendencias)"""
+        where, params = [], []
+        if since is not None:
+            where.append(f"{prefix}day >= ?")
+            params.append(datetime.fromtimestamp(timestamp(since)).strftime('%Y-%m-%d'))
+        if until is not None:
+            where.append(f"{prefix}day < ?")
+            params.append(datetime.fromtimestamp(timestamp(until)).strftime('%Y-%m-%d'))
+        return where, params
+    
+    @staticmethod
+    def _where(clauses: List[str]) -> str:
+        return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    
+    def count(self) -> int:
+        rows = self._query("SELECT COUNT(*) AS n FROM scans")
+        return rows[0]['n'] if rows else 0
+    
+    def prune(self, before) -> int:
+        """Borra los escaneos anteriores a before y devuelve cuántos"""
+        cutoff = timestamp(before)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute("DELETE FROM checks WHERE created < ?", (cutoff,))
+                return connection.execute("DELETE FROM scans WHERE created < ?", (cutoff,)).rowcount
+    
+    def clear(self):
+        self.prune(float('inf'))
+    
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+                self._connection = None
+
+_shared_dbs: Dict[str, HistoryDB] = {}
+_shared_lock = threading.Lock()
+
+def get_history_db(path: Optional[str] = HISTORY_DB) -> Optional[HistoryDB]:
+    """Historial compartido por proceso para un archivo; None si path está vacío (historial desactivado)"""
+    if not path:
+        return None
+    with _shared_lock:
+        db = _shared_dbs.get(path)
+        if db is None:
+            db = _shared_dbs[path] = HistoryDB(path)
+        return db
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Consultas al historial de escaneos")
+    parser.add_argument("--base", default=HISTORY_DB, help="Archivo SQLite del historial")
+    parser.add_argument("--desde", help="Fecha inicial AAAA-MM-DD (por defecto, hace 30 días)")
+    parser.add_argument("--hasta", help="Fecha final AAAA-MM-DD, excluida (por defecto, sin límite)")
+    parser.add_argument("--proyecto", help="Solo los escaneos de este proyecto")
+    parser.add_argument("--url", help="Escaneos de esta URL")
+    parser.add_argument("--falla", type=int, metavar="CHEQUEO",
+                        help="Aplicaciones cuyo último escaneo del período falla este chequeo")
+    parser.add_argument("--tendencia", choices=sorted(BUCKETS), help="Tasa de aprobación por día, semana o mes")
+    parser.add_argument("--chequeo", type=int, help="Con --tendencia: la tasa de este chequeo")
+    parser.add_argument("--purgar", type=int, metavar="DIAS", help="Borrar los escaneos de más de DIAS días")
+    args = parser.parse_args(argv)
+    
+    db = HistoryDB(args.base)
+    since = args.desde or date.today() - timedelta(days=30)
+    try:
+        if args.purgar is not None:
+            removed = db.prune(datetime.now() - timedelta(days=args.purgar))
+            print(f"{removed} escaneos borrados; quedan {db.count()}")
+            return 0
+        if args.falla is not None:
+            output = db.failing(args.falla, since, args.hasta, args.proyecto)
+        elif args.tendencia:
+            output = db.trend(since, args.hasta, args.tendencia, args.chequeo, args.proyecto)
+        else:
+            output = db.scans(args.url, args.proyecto, since=since, until=args.hasta)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
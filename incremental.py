@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Reescaneo incremental: a partir del escaneo anterior guardado en la caché
+(cache.py), la página principal se pide con una petición condicional y cada
+chequeo se vuelve a evaluar solo si cambió alguna de sus entradas (cabeceras,
+cuerpo, respuestas de los sondeos o recursos referenciados); el resto se
+reutiliza tal cual del resultado anterior.
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional
+
+from history import check_number
+
+# Entradas de cada chequeo de SecurityChecker.run_checks
+CHECK_INPUTS = {
+    1: ('body',),
+    2: ('body',),
+    3: ('headers',),
+    4: ('headers', 'body'),
+    5: ('body', 'assets'),
+    6: ('body',),
+    7: ('body', 'cookies'),
+    8: ('body',),
+    9: ('error_page',),
+    10: ('body',),
+    11: ('headers',),
+    12: ('body',),
+    13: ('error_page', 'probes'),
+    14: ('body', 'assets'),
+}
+
+# Cabeceras de la página principal que lee cada chequeo (las demás no lo invalidan)
+CHECK_HEADERS = {
+    3: ('X-Frame-Options', 'x-frame-options', 'Content-Security-Policy'),
+    4: ('Server', 'X-Powered-By', 'X-AspNet-Version', 'X-AspNetMvc-Version'),
+    11: ('Access-Control-Allow-Origin',),
+}
+
+# Nombres de cookie que el chequeo 7 considera de sesión
+SESSION_COOKIES = ('session', 'token', 'auth', 'id')
+
+# Estado del cuerpo de la página principal respecto del escaneo anterior
+BODY_NOT_MODIFIED = 'sin cambios (304)'
+BODY_SAME = 'sin cambios'
+BODY_CHANGED = 'modificado'
+
+def digest(value) -> str:
+    """Huella estable de un valor serializable a JSON"""
+    material = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+def check_headers(headers: Dict) -> Dict[str, str]:
+    """Cabeceras de la página principal que leen los chequeos (CHECK_HEADERS), las presentes en headers"""
+    return {name: headers[name] for names in CHECK_HEADERS.values() for name in names if name in headers}
+
+def conditional_request(validators: Optional[Dict]) -> Dict[str, str]:
+    """Cabeceras de la petición condicional a partir de los validadores guardados"""
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+def _probe_input(result) -> List:
+    return [result.key, result.status, result.ok, result.final_url,
+            hashlib.sha256(result.body or b'').hexdigest()]
+
+def _asset_input(result) -> List:
+    return [result.url, result.versions, result.ips, result.credentials]
+
+def session_cookies(cookie_jar) -> List[str]:
+    return sorted({cookie.name for cookie in cookie_jar
+                   if any(name in cookie.name.lower() for name in SESSION_COOKIES)})
+
+def input_digests(headers: Dict, body: str, probe_results: Iterable, asset_results: Iterable,
+                  cookies: Iterable[str] = ()) -> Dict[str, str]:
+    """Huella de las entradas de cada chequeo, indexada por número de chequeo (como texto, por JSON)"""
+    probe_results = list(probe_results)
+    inputs = {
+        'body': body,
+        'cookies': digest(list(cookies)),
+        'error_page': digest([_probe_input(result) for result in probe_results if result.key == 'error_page']),
+        'probes': digest([_probe_input(result) for result in probe_results if result.key != 'error_page']),
+        'assets': digest([_asset_input(result) for result in asset_results if result.ok and result.status == 200]),
+    }
+    digests = {}
+    for number, names in CHECK_INPUTS.items():
+        parts = [inputs[name] for name in names if name != 'headers']
+        if 'headers' in names:
+            parts.append({name: headers.get(name) for name in CHECK_HEADERS[number]})
+        digests[str(number)] = digest(parts)
+    return digests
+
+def reusable_checks(previous_checks: Iterable, previous_inputs: Optional[Dict], inputs: Dict) -> Dict[int, tuple]:
+    """Chequeos del escaneo anterior cuyas entradas no cambiaron, por número"""
+    if not previous_inputs:
+        return {}
+    reuse = {}
+    for check in previous_checks:
+        number = check_number(check[0])
+        key = str(number)
+        if key in inputs and previous_inputs.get(key) == inputs[key]:
+            reuse[number] = tuple(check)
+    return reuse
+
+def needs_body(reuse: Dict[int, tuple]) -> bool:
+    """Indica si algún chequeo a recalcular lee el cuerpo de la página"""
+    return any('body' in names for number, names in CHECK_INPUTS.items() if number not in reuse)
+
+def summarize(checks: Iterable, reuse: Dict[int, tuple], body_state: str) -> Dict:
+    """Resumen del reescaneo para el resultado: chequeos reutilizados y recalculados"""
+    names = [check[0] for check in checks]
+    return {
+        'body': body_state,
+        'reused': [name for name in names if check_number(name) in reuse],
+        'recomputed': [name for name in names if check_number(name) not in reuse],
+    }
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Instrumentación de los escaneos: tiempo por fase (petición, descarga,
+parseo, chequeos, espera de sondeos) y por chequeo, bytes leídos y peticiones, más un registro
+de proceso que acumula los escaneos y los expone en formato de texto de
+Prometheus (opcional, en /metrics).
+
+Con la instrumentación apagada, SecurityChecker usa DISABLED: sus fases
+son un único contexto vacío compartido y timed/check_list devuelven el
+callable y una lista comunes, sin medir nada.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+# Fases del escaneo en el orden en que se muestran
+PHASES = ('request', 'download', 'parse', 'checks', 'wait', 'probes')
+
+class TimedChecks(list):
+    """
+    Lista de chequeos que registra, al agregar cada uno, el tiempo desde el
+    chequeo anterior (o desde su creación): run_checks arma la lista en
+    orden, así que ese intervalo es lo que tardó el chequeo agregado.
+    """
+    
+    def __init__(self, timings: Dict[str, float]):
+        super().__init__()
+        self.timings = timings
+        self._last = time.perf_counter()
+    
+    def append(self, check):
+        now = time.perf_counter()
+        self.timings[check[0]] = self.timings.get(check[0], 0.0) + now - self._last
+        self._last = now
+        super().append(check)
+    
+    def exclude(self, seconds: float):
+        """Descuenta seconds del intervalo del próximo chequeo"""
+        self._last += seconds
+
+class ScanMetrics:
+    """Mediciones de un escaneo"""
+    
+    enabled = True
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.checks: Dict[str, float] = {}
+        self.bytes_read = 0
+        self.probe_count = 0
+        self.probe_time = 0.0
+        self._recorded = set()
+    
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+    
+    @contextmanager
+    def waiting(self, checks: List):
+        """
+        Espera de un lote de sondeos o recursos dentro de run_checks: su
+        tiempo va a la fase 'wait' y no al chequeo que lo espera
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add('wait', elapsed)
+            if isinstance(checks, TimedChecks):
+                checks.exclude(elapsed)
+    
+    def timed(self, name: str, function: Callable) -> Callable:
+        """function envuelta para sumar su tiempo a la fase name"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+        return wrapper
+    
+    def check_list(self) -> List:
+        return TimedChecks(self.checks)
+    
+    def count_bytes(self, count: int):
+        self.bytes_read += count
+    
+    def record_probes(self, results):
+        # Un mismo lote (el del crawl, compartido por todas las páginas) se cuenta una vez
+        if id(results) in self._recorded:
+            return
+        self._recorded.add(id(results))
+        for result in results:
+            self.probe_count += 1
+            self.probe_time += result.elapsed
+            self.bytes_read += len(result.body or b'')
+    
+    def to_dict(self, transport: Optional[Dict] = None) -> Dict:
+        """
+        Resumen en segundos. 'download' es la lectura del cuerpo sin el
+        parseo que se hace en la misma pasada; 'checks' no incluye 'wait', la
+        espera de los lotes de sondeos y recursos; 'probes' suma la duración de
+        cada sondeo (corren en paralelo, por eso puede superar al total).
+        """
+        phases = dict(self.phases)
+        body = phases.pop('body', 0.0)
+        if body:
+            phases['download'] = max(0.0, body - phases.get('parse', 0.0))
+        if 'checks' in phases and 'wait' in phases:
+            phases['checks'] = max(0.0, phases['checks'] - phases['wait'])
+        if self.probe_count:
+            phases['probes'] = self.probe_time
+        transport = transport or {}
+        return {
+            'total': round(time.perf_counter() - self.started, 4),
+            'phases': {name: round(phases[name], 4) for name in PHASES if name in phases},
+            'checks': {name: round(seconds, 4) for name, seconds in self.checks.items()},
+            'bytes_read': self.bytes_read,
+            'requests': transport.get('requests', 0),
+            'probes': self.probe_count,
+            'network': {key: transport[key] for key in ('dns_time', 'connect_time', 'tls_time')
+                        if key in transport},
+        }
+
+class DisabledMetrics(ScanMetrics):
+    """Instrumentación apagada: no mide nada"""
+    
+    enabled = False
+    _empty = nullcontext()
+    
+    def __init__(self):
+        pass
+    
+    def phase(self, name: str):
+        return self._empty
+    
+    def add(self, name: str, seconds: float):
+        pass
+    
+    def waiting(self, checks: List):
+        return self._empty
+    
+    def timed(self, name: str, function: Callable) -> Callable:
+        return function
+    
+    def check_list(self) -> List:
+        return []
+    
+    def count_bytes(self, count: int):
+        pass
+    
+    def record_probes(self, results):
+        pass
+    
+    def to_dict(self, transport: Optional[Dict] = None) -> Dict:
+        return {}
+
+DISABLED = DisabledMetrics()
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsRegistry:
+    """Acumulado de los escaneos del proceso, para exponerlo a Prometheus"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.scans = {'ok': 0, 'error': 0}
+            self.duration = [0.0, 0]
+            self.phases: Dict[str, List] = {}
+            self.checks: Dict[str, List] = {}
+            self.bytes_read = 0
+            self.requests = 0
+    
+    def observe(self, performance: Optional[Dict], success: bool = True):
+        """Suma las mediciones de un escaneo (el resultado de ScanMetrics.to_dict)"""
+        with self._lock:
+            self.scans['ok' if success else 'error'] += 1
+            if not performance:
+                return
+            self.duration[0] += performance['total']
+            self.duration[1] += 1
+            for target, values in ((self.phases, performance['phases']), (self.checks, performance['checks'])):
+                for name, seconds in values.items():
+                    total = target.setdefault(name, [0.0, 0])
+                    total[0] += seconds
+                    total[1] += 1
+            self.bytes_read += performance['bytes_read']
+            self.requests += performance['requests']
+    
+    def render(self) -> str:
+        """Métricas en el formato de texto de Prometheus (versión 0.0.4)"""
+        with self._lock:
+            lines = [
+                "# HELP checkpoint_scans_total Escaneos terminados por resultado",
+                "# TYPE checkpoint_scans_total counter",
+            ]
+            lines += (f'checkpoint_scans_total{{result="{result}"}} {count}' for result, count in self.scans.items())
+            lines += [
+                "# HELP checkpoint_scan_seconds Duración de los escaneos instrumentados",
+                "# TYPE checkpoint_scan_seconds summary",
+                f"checkpoint_scan_seconds_sum {self.duration[0]:.6f}",
+                f"checkpoint_scan_seconds_count {self.duration[1]}",
+            ]
+            for metric, label, values, help_text in (
+                    ('checkpoint_phase_seconds', 'phase', self.phases, "Duración por fase del escaneo"),
+                    ('checkpoint_check_seconds', 'check', self.checks, "Duración por chequeo")):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+                for name, (seconds, count) in values.items():
+                    lines.append(f'{metric}_sum{{{label}="{_label(name)}"}} {seconds:.6f}')
+                    lines.append(f'{metric}_count{{{label}="{_label(name)}"}} {count}')
+            lines += [
+                "# HELP checkpoint_bytes_read_total Bytes leídos de páginas y sondeos",
+                "# TYPE checkpoint_bytes_read_total counter",
+                f"checkpoint_bytes_read_total {self.bytes_read}",
+                "# HELP checkpoint_requests_total Peticiones HTTP de los escaneos",
+                "# TYPE checkpoint_requests_total counter",
+                f"checkpoint_requests_total {self.requests}",
+            ]
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+    
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+_servers: Dict[int, ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = '127.0.0.1', registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Sirve /metrics en un hilo de fondo; una sola vez por puerto y proceso
+    (Streamlit vuelve a ejecutar el script en cada interacción)
+    """
+    with _servers_lock:
+        server = _servers.get(port) if port else None
+        if server is None:
+            handler = type('RegistryHandler', (MetricsHandler,), {'registry': registry})
+            server = ThreadingHTTPServer((host, port), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            _servers[server.server_address[1]] = server
+    return server
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Índice de palabras clave de una página: texto en minúsculas, un buscador
+multi-patrón sobre todas las listas de indicadores y las posiciones de cada
+coincidencia, construido una sola vez por respuesta
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Arma una expresión regular en forma de trie (prefijos comunes factorizados)
+    para que cada posición del texto se resuelva con una sola rama por carácter
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            # Cuantificador codicioso: en cada posición gana la palabra más larga
+            return '(?:' + '|'.join(branches) + ')?'
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Buscador multi-patrón sobre varios grupos de palabras clave.
+    
+    Una sola expresión regular recorre el texto una vez y devuelve la palabra
+    más larga en cada posición; las palabras contenidas en ella y las que se
+    solapan con su final se completan con tablas precalculadas, de modo que el
+    resultado equivale a buscar cada palabra por separado.
+    """
+    
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups = {name: tuple(dict.fromkeys(kw.lower() for kw in keywords)) for name, keywords in groups.items()}
+        self.keywords = sorted({kw for keywords in self.groups.values() for kw in keywords if kw})
+        self.max_length = max((len(kw) for kw in self.keywords), default=0)
+        self.pattern = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        
+        # Palabras contenidas en otra: (palabra, desplazamiento) dentro de la coincidencia
+        self._contained = {}
+        # Palabras que pueden empezar dentro de una coincidencia y continuar después de ella
+        self._overlapping = {}
+        for outer in self.keywords:
+            contained, overlapping = [], []
+            for inner in self.keywords:
+                for offset in range(1 if inner == outer else 0, len(outer)):
+                    rest = outer[offset:]
+                    if len(inner) <= len(rest):
+                        if rest.startswith(inner):
+                            contained.append((inner, offset))
+                    elif inner.startswith(rest) and offset > 0:
+                        overlapping.append((inner, offset))
+            self._contained[outer] = tuple(contained)
+            self._overlapping[outer] = tuple(overlapping)
+    
+    def finditer(self, text: str, start: int = 0):
+        """Genera (palabra, posición) para cada aparición de una palabra clave en text"""
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text, start):
+            keyword, position = match.group(), match.start()
+            yield keyword, position
+            for inner, offset in self._contained[keyword]:
+                yield inner, position + offset
+            for longer, offset in self._overlapping[keyword]:
+                if text.startswith(longer, position + offset):
+                    yield longer, position + offset
+    
+    def found(self, text: str) -> set:
+        return {keyword for keyword, _ in self.finditer(text)}
+    
+    def has_any(self, text: str, group: str) -> bool:
+        """Indica si text (en minúsculas) contiene alguna palabra del grupo"""
+        keywords = self.groups[group]
+        return any(keyword in keywords for keyword, _ in self.finditer(text))
+
+class PageIndex:
+    """
+    Cuerpo de una respuesta leído por bloques. En la misma pasada se alimenta
+    el parser, se arma el texto en minúsculas y se indexan las posiciones de
+    todas las palabras clave, para que los chequeos consulten el índice en vez
+    de volver a recorrer o copiar el documento.
+    """
+    
+    # Posiciones guardadas por palabra; el resto solo se cuenta
+    MAX_POSITIONS = 1000
+    
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.positions: Dict[str, List[int]] = {}
+        self.counts: Dict[str, int] = {}
+        self.bytes_read = 0
+        self.truncated = False
+        # SHA-256 de los bytes leídos (lo completa SecurityChecker.read_page)
+        self.digest = None
+        self.length = 0
+        self._parts, self._lower_parts = [], []
+        self._tail = ""
+        self.text = self.lower = None
+    
+    @classmethod
+    def from_text(cls, text: str, matcher: KeywordMatcher) -> "PageIndex":
+        index = cls(matcher)
+        index.feed(text)
+        return index.finish()
+    
+    def feed(self, chunk: str, parser=None):
+        if not chunk:
+            return
+        lower = chunk.lower()
+        self._parts.append(chunk)
+        self._lower_parts.append(lower)
+        
+        # La ventana incluye el final del bloque anterior para no perder palabras
+        # cortadas; cada coincidencia se registra en el bloque donde termina
+        window = self._tail + lower
+        base = self.length - len(self._tail)
+        for keyword, position in self.matcher.finditer(window):
+            if position + len(keyword) > len(self._tail):
+                self._record(keyword, base + position)
+        
+        self.length += len(lower)
+        overlap = self.matcher.max_length - 1
+        self._tail = window[-overlap:] if overlap > 0 else ""
+        
+        if parser is not None:
+            parser.feed(chunk)
+    
+    def _record(self, keyword: str, position: int):
+        self.counts[keyword] = self.counts.get(keyword, 0) + 1
+        positions = self.positions.setdefault(keyword, [])
+        if len(positions) < self.MAX_POSITIONS:
+            positions.append(position)
+    
+    def finish(self) -> "PageIndex":
+        self.text = ''.join(self._parts)
+        self.lower = ''.join(self._lower_parts)
+        self._parts = self._lower_parts = None
+        self._tail = ""
+        return self
+    
+    def has(self, keyword: str) -> bool:
+        return keyword in self.counts
+    
+    def has_any(self, group: str) -> bool:
+        return any(keyword in self.counts for keyword in self.matcher.groups[group])
+    
+    def hits(self, group: str) -> Dict[str, List[int]]:
+        """Posiciones de cada palabra del grupo encontrada en la página"""
+        return {kw: self.positions[kw] for kw in self.matcher.groups[group] if kw in self.counts}
+    
+    def first_position(self, group: str) -> Optional[int]:
+        positions = [self.positions[kw][0] for kw in self.matcher.groups[group] if kw in self.counts]
+        return min(positions) if positions else None
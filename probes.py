@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Planificador concurrente de sondeos HTTP para SecurityChecker
+"""
+
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+class Probe(NamedTuple):
+    """Petición saliente a ejecutar durante un escaneo"""
+    key: str
+    url: str
+    method: str = "GET"
+    read_body: bool = True
+    # Probar primero con HEAD y confirmar con GET solo si hace falta el cuerpo
+    head_first: bool = False
+    # Bytes máximos a leer del cuerpo (None: el límite del escaneo)
+    max_bytes: Optional[int] = None
+    # Plazo del lote (time.monotonic()); lo fija el planificador al lanzar el sondeo
+    deadline: Optional[float] = None
+
+class ProbeResult:
+    """Resultado de un sondeo: respuesta HTTP o error"""
+    
+    __slots__ = ("key", "url", "status", "headers", "body", "error", "elapsed", "method", "final_url")
+    
+    def __init__(self, key, url, status=None, headers=None, body=b"", error=None, elapsed=0.0,
+                 method="GET", final_url=None):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.error = error
+        self.elapsed = elapsed
+        self.method = method
+        self.final_url = final_url or url
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="ignore")
+    
+    def __repr__(self):
+        return f"ProbeResult({self.key!r}, status={self.status!r}, error={self.error!r})"
+
+class ProbeBatch:
+    """
+    Conjunto de sondeos en curso. Los resultados se devuelven siempre en el
+    orden en que se enviaron los sondeos, sin importar el orden de finalización.
+    """
+    
+    def __init__(self, probes: List[Probe], futures, deadline: float, executor=None):
+        self.probes = probes
+        self._futures = futures
+        self._deadline = deadline
+        self._executor = executor
+        self._results = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_results(cls, probes: List[Probe], results: List[ProbeResult]) -> "ProbeBatch":
+        """Lote ya terminado (por ejemplo, sondeos ejecutados con asyncio)"""
+        batch = cls(probes, [], time.monotonic())
+        batch._results = list(results)
+        return batch
+    
+    def results(self) -> List[ProbeResult]:
+        with self._lock:
+            if self._results is None:
+                self._results = self._collect()
+            return self._results
+    
+    def get(self, key: str) -> Optional[ProbeResult]:
+        for result in self.results():
+            if result.key == key:
+                return result
+        return None
+    
+    def _collect(self) -> List[ProbeResult]:
+        remaining = max(0.0, self._deadline - time.monotonic())
+        if self._futures:
+            wait(self._futures, timeout=remaining)
+        
+        results = []
+        for probe, future in zip(self.probes, self._futures):
+            if future.done() and not future.cancelled():
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(ProbeResult(probe.key, probe.url, error=str(e)))
+            else:
+                future.cancel()
+                results.append(ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado"))
+        
+        if self._executor is not None:
+            # Los sondeos aún en vuelo terminan por su propio timeout de socket
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        return results
+
+class RateLimiter:
+    """
+    Limitador de peticiones por segundo (token bucket) compartido por los
+    hilos de un escaneo. Sin tasa configurada no limita.
+    """
+    
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = float(burst or max(1, int(self.rate))) if self.rate else 0.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Espera un turno; devuelve False si no lo obtiene antes de deadline"""
+        if self.rate is None:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait_time > deadline:
+                return False
+            time.sleep(wait_time)
+
+class ProbeScheduler:
+    """
+    Ejecuta en paralelo los sondeos de un escaneo con un pool de hilos acotado,
+    un límite de concurrencia por host, una tasa máxima de peticiones y un
+    plazo máximo por escaneo.
+    """
+    
+    def __init__(self, fetch: Callable[[Probe], ProbeResult], max_workers: int = 8,
+                 per_host: int = 4, deadline: float = 30.0, rate_limit: Optional[float] = None):
+        self.fetch = fetch
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.deadline = deadline
+        self.limiter = RateLimiter(rate_limit)
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+    
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlparse(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self._host_limits[host] = semaphore
+            return semaphore
+    
+    def _run_one(self, probe: Probe, deadline: float, fetch: Callable[[Probe], ProbeResult]) -> ProbeResult:
+        if not self.limiter.acquire(deadline):
+            return ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado")
+        
+        semaphore = self._host_semaphore(probe.url)
+        if not semaphore.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            return ProbeResult(probe.key, probe.url, error="Tiempo límite del escaneo agotado")
+        
+        start = time.monotonic()
+        try:
+            result = fetch(probe._replace(deadline=deadline))
+        except Exception as e:
+            result = ProbeResult(probe.key, probe.url, error=str(e))
+        finally:
+            semaphore.release()
+        
+        result.elapsed = time.monotonic() - start
+        return result
+    
+    def scan_deadline(self) -> float:
+        """Vencimiento (time.monotonic) de un escaneo que empieza ahora"""
+        return time.monotonic() + self.deadline
+    
+    def submit(self, probes: List[Probe], fetch: Optional[Callable[[Probe], ProbeResult]] = None,
+               deadline: Optional[float] = None) -> ProbeBatch:
+        """
+        Lanza todos los sondeos y devuelve el lote sin esperar resultados;
+        fetch reemplaza la función de descarga del planificador (por ejemplo,
+        para los recursos de assets.py). deadline es el vencimiento del
+        escaneo (scan_deadline), compartido por todos sus lotes; sin él el
+        lote vence a los self.deadline segundos.
+        """
+        probes = list(probes)
+        if deadline is None:
+            deadline = self.scan_deadline()
+        if not probes:
+            return ProbeBatch(probes, [], deadline)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(probes)),
+            thread_name_prefix="checkpoint-probe"
+        )
+        futures = [executor.submit(self._run_one, probe, deadline, fetch or self.fetch) for probe in probes]
+        return ProbeBatch(probes, futures, deadline, executor)
+    
+    def run(self, probes: List[Probe]) -> List[ProbeResult]:
+        """Ejecuta los sondeos y espera los resultados, en el orden de entrada"""
+        return self.submit(probes).results()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Generación de informes PDF y JSON a partir de los resultados de SecurityChecker
+"""
+
+import io
+from datetime import datetime
+
+def generate_pdf_report(url, results, project_info):
+    """Genera un informe en PDF usando la información proporcionada"""
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+    
+    # Título principal
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        alignment=1,  # Centro
+        textColor=colors.blue
+    )
+    
+    story.append(Paragraph("Checkpoint de Seguridad - Chequeos Previos - v 2.0.2", title_style))
+    story.append(Spacer(1, 20))
+    
+    # Información del proyecto
+    project_data = [
+        ['Estado', project_info.get('estado', 'PENDIENTE')],
+        ['Confeccionó', project_info.get('autor', 'Sistema Automático')],
+        ['Proyecto', project_info.get('proyecto', 'N/A')],
+        ['URL', url],
+        ['Ticket JIRA', project_info.get('ticket', 'N/A')],
+        ['Versión', project_info.get('version', '01.00.00')],
+        ['Fecha', datetime.now().strftime('%d/%m/%Y %H:%M:%S')]
+    ]
+    
+    project_table = Table(project_data, colWidths=[2*inch, 4*inch])
+    project_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (1, 0), (1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(project_table)
+    story.append(Spacer(1, 30))
+    
+    # Resultados de las pruebas
+    story.append(Paragraph("Resultados de las Pruebas", styles['Heading2']))
+    story.append(Spacer(1, 20))
+    
+    check_data = [['Prueba', 'Estado', 'Detalles']]
+    for check_name, status, details in results['checks']:
+        status_text = "CUMPLE" if status else "NO CUMPLE"
+        check_data.append([check_name, status_text, details[:100] + "..." if len(details) > 100 else details])
+    
+    check_table = Table(check_data, colWidths=[3*inch, 1*inch, 2*inch])
+    check_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(check_table)
+    story.append(Spacer(1, 30))
+    
+    # Resumen
+    story.append(Paragraph("Resumen Ejecutivo", styles['Heading2']))
+    story.append(Spacer(1, 10))
+    
+    summary_text = f"""
+    Total de chequeos realizados: {results['total']}<br/>
+    Pruebas aprobadas: {results['passed']}<br/>
+    Pruebas fallidas: {results['failed']}<br/>
+    <br/>
+    <b>Estado final: {results['status']}</b>
+    """
+    
+    story.append(Paragraph(summary_text, styles['Normal']))
+    
+    if 'incremental' in results:
+        # Reescaneo incremental: qué pruebas se copiaron del análisis anterior
+        incremental = results['incremental']
+        reused = ', '.join(name.split('.')[0] for name in incremental['reused']) or 'ninguna'
+        story.append(Spacer(1, 10))
+        story.append(Paragraph(
+            f"Reescaneo incremental (página {incremental['body']}): {len(incremental['recomputed'])} pruebas "
+            f"recalculadas; reutilizadas del análisis anterior: {reused}", styles['Normal']))
+    
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+def build_report_data(url, result, project, performance=None):
+    """
+    Arma el diccionario exportado en JSON para el resultado de un análisis;
+    con performance (SecurityChecker.details['performance']) agrega los
+    tiempos del análisis en 'rendimiento' y, si el resultado es de un
+    recorrido (crawler.py), el resumen de cada página en 'paginas'. En un
+    reescaneo incremental cada prueba indica si se reutilizó del análisis
+    anterior y 'incremental' resume el reescaneo.
+    """
+    data = {
+        'url': url,
+        'fecha': datetime.now().isoformat(),
+        'proyecto': {
+            'nombre': project.get('nombre'),
+            'autor': project.get('autor'),
+            'ticket': project.get('ticket'),
+            'version': project.get('version')
+        },
+        'resultados': {
+            'total': result['total'],
+            'aprobadas': result['passed'],
+            'fallidas': result['failed'],
+            'estado': result['status']
+        },
+        'pruebas': [
+            {
+                'nombre': check_name,
+                'estado': 'CUMPLE' if status else 'NO CUMPLE',
+                'detalles': details
+            }
+            for check_name, status, details in result['checks']
+        ]
+    }
+    if 'incremental' in result:
+        incremental = result['incremental']
+        reused = set(incremental['reused'])
+        for prueba in data['pruebas']:
+            prueba['reutilizada'] = prueba['nombre'] in reused
+        data['incremental'] = {
+            'pagina': incremental['body'],
+            'reutilizadas': incremental['reused'],
+            'recalculadas': incremental['recomputed'],
+        }
+    if 'pages' in result:
+        data['paginas'] = result['pages']
+    if performance:
+        data['rendimiento'] = performance
+    return data
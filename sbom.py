@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Ingesta de SBOM y lockfiles de dependencias para verificar cada componente
+contra el catálogo ES0901: package-lock.json, yarn.lock, requirements.txt,
+pom.xml, composer.lock y SBOM CycloneDX / SPDX en JSON.
+
+Los archivos se leen por partes (líneas, eventos XML o miembros JSON de a
+uno) y los componentes se verifican en tandas con verificar_lote, de modo
+que la memoria queda acotada por las dependencias distintas y no por el
+tamaño del archivo.
+
+Uso:
+    python sbom.py package-lock.json
+    python sbom.py bom.json --solo-problemas -o informe.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional
+from urllib.parse import unquote
+
+from estandar import ESTADO_COMPATIBLE, verificar_lote
+
+FORMATS = ('package-lock', 'yarn-lock', 'requirements', 'pom', 'composer-lock', 'cyclonedx', 'spdx')
+BATCH_SIZE = 5000
+
+# Paquetes de cada ecosistema que corresponden a un producto del catálogo
+CATALOG_PACKAGES = {
+    '@angular/core': 'angular',
+    '@nestjs/core': 'nestjs',
+    '@fortawesome/fontawesome-free': 'fontawesome',
+    '@fortawesome/fontawesome-svg-core': 'fontawesome',
+    'next': 'nextjs',
+    'laravel/framework': 'laravel',
+    'org.springframework.boot:spring-boot': 'springboot',
+    'org.springframework:spring-core': 'spring',
+}
+# Grupos Maven cuyos artefactos comparten la versión del producto
+CATALOG_GROUPS = {
+    'org.springframework.boot': 'springboot',
+}
+
+class Dependency(NamedTuple):
+    """Componente declarado en un lockfile o SBOM"""
+    name: str
+    version: Optional[str]
+    ecosystem: str
+
+def catalog_name(dependency: Dependency) -> str:
+    """Nombre con el que se busca el componente en el catálogo"""
+    name = dependency.name.lower()
+    mapped = CATALOG_PACKAGES.get(name)
+    if mapped is None and dependency.ecosystem == 'maven':
+        mapped = CATALOG_GROUPS.get(name.split(':', 1)[0])
+    return mapped or name
+
+# Lectura incremental de JSON
+
+class JSONStream:
+    """
+    Lector de un documento JSON por partes: recorre las claves del objeto
+    raíz y decodifica de a uno los miembros de los objetos o arreglos
+    buscados, sin cargar el documento completo.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    WHITESPACE = ' \t\n\r'
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self, size=None) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(size or self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Siguiente carácter significativo ('' al final del documento)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: se esperaba {char!r} en la posición {self.pos}")
+        self.pos += 1
+    
+    def value(self):
+        """Decodifica el valor siguiente completo"""
+        self.peek()
+        size = self.CHUNK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # Un número al final del búfer puede seguir en el próximo bloque
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Valor incompleto: leer bloques cada vez más grandes
+            self._fill(size)
+            size *= 2
+    
+    def members(self):
+        """Genera (clave, valor) de un objeto o (índice, valor) de un arreglo"""
+        opening = self.peek()
+        if opening not in '{[':
+            raise ValueError("JSON inválido: se esperaba un objeto o un arreglo")
+        closing = '}' if opening == '{' else ']'
+        self.pos += 1
+        index = 0
+        if self.peek() == closing:
+            self.pos += 1
+            return
+        while True:
+            if opening == '{':
+                key = self.value()
+                self.expect(':')
+            else:
+                key = index
+            yield key, self.value()
+            index += 1
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(closing)
+            return
+    
+    def sections(self, keys):
+        """
+        Genera (clave, miembro) para los objetos o arreglos de las claves
+        indicadas del objeto raíz, en el orden del archivo; los valores de
+        las demás claves se decodifican y se descartan
+        """
+        self.expect('{')
+        while self.peek() not in ('}', ''):
+            name = self.value()
+            self.expect(':')
+            if name in keys and self.peek() in '{[':
+                for member in self.members():
+                    yield name, member
+            else:
+                self.value()
+            if self.peek() == ',':
+                self.pos += 1
+
+def _json_sections(path: str, keys):
+    with open(path, encoding='utf-8') as f:
+        yield from JSONStream(f).sections(keys)
+
+# Lectores por formato
+
+def read_package_lock(path: str) -> Iterator[Dependency]:
+    """package-lock.json / npm-shrinkwrap.json (lockfileVersion 1, 2 y 3)"""
+    seen_packages = False
+    for section, (key, entry) in _json_sections(path, ('packages', 'dependencies')):
+        if not isinstance(entry, dict):
+            continue
+        if section == 'packages':
+            # v2/v3: "node_modules/a/node_modules/@b/c" -> "@b/c"; "" es el proyecto
+            seen_packages = True
+            if not key or entry.get('link'):
+                continue
+            name = entry.get('name') or key.rsplit('node_modules/', 1)[-1]
+            yield Dependency(name, entry.get('version'), 'npm')
+        elif not seen_packages:
+            # v1: árbol anidado de "dependencies" (en v2 repite a "packages")
+            yield from _package_lock_v1(key, entry)
+
+def _package_lock_v1(name, entry):
+    pending = [(name, entry)]
+    while pending:
+        name, entry = pending.pop()
+        yield Dependency(name, entry.get('version'), 'npm')
+        pending.extend((child, data) for child, data in (entry.get('dependencies') or {}).items()
+                       if isinstance(data, dict))
+
+_YARN_VERSION = re.compile(r'^\s+version:?\s+"?([^"\s]+)"?')
+
+def read_yarn_lock(path: str) -> Iterator[Dependency]:
+    """yarn.lock clásico (v1) y de Yarn Berry"""
+    name = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            if not line[0].isspace():
+                # '"@babel/core@^7.0.0", "@babel/core@^7.1.0":' o 'lodash@npm:^4.17.21:'
+                spec = line.rstrip().rstrip(':').split(',')[0].strip().strip('"')
+                at = spec.find('@', 1)
+                name = spec[:at] if at > 0 else spec
+                if name == '__metadata' or '@workspace:' in spec:
+                    name = None
+                continue
+            match = _YARN_VERSION.match(line)
+            if match and name:
+                yield Dependency(name, match.group(1), 'npm')
+                name = None
+
+_REQUIREMENT = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(?:(===?)\s*([^\s;,#]+))?')
+
+def read_requirements(path: str) -> Iterator[Dependency]:
+    """requirements.txt: solo las versiones fijadas con == se toman como versión instalada"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith(('#', '-')) or '://' in line:
+                continue
+            match = _REQUIREMENT.match(line)
+            if match:
+                name = re.sub(r'[-_.]+', '-', match.group(1)).lower()
+                yield Dependency(name, match.group(3), 'pypi')
+
+_POM_PROPERTY = re.compile(r'\$\{([^}]+)\}')
+
+def read_pom(path: str) -> Iterator[Dependency]:
+    """pom.xml: dependencias con sus propiedades ${...} resueltas cuando están definidas"""
+    properties = {}
+    stack = []
+    current = None
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        tag = element.tag.rsplit('}', 1)[-1]
+        if event == 'start':
+            stack.append(tag)
+            if tag in ('dependency', 'parent', 'plugin'):
+                current = {}
+            continue
+        
+        stack.pop()
+        parent = stack[-1] if stack else None
+        text = (element.text or '').strip()
+        if parent == 'properties':
+            properties[tag] = text
+        elif parent == 'project' and tag == 'version':
+            properties['project.version'] = text
+        elif current is not None and parent in ('dependency', 'parent', 'plugin'):
+            current[tag] = text
+        elif tag in ('dependency', 'parent') and current is not None:
+            if tag == 'parent':
+                properties.setdefault('project.parent.version', current.get('version', ''))
+            group, artifact = current.get('groupId', ''), current.get('artifactId', '')
+            version = _POM_PROPERTY.sub(lambda m: properties.get(m.group(1), m.group(0)), current.get('version', ''))
+            if artifact:
+                yield Dependency(f"{group}:{artifact}" if group else artifact,
+                                 version if version and '${' not in version else None, 'maven')
+            current = None
+        elif tag == 'plugin':
+            current = None
+        # Liberar el subárbol ya procesado
+        if tag != 'project':
+            element.clear()
+
+def read_composer_lock(path: str) -> Iterator[Dependency]:
+    """composer.lock: paquetes de producción y de desarrollo"""
+    for _, (_, entry) in _json_sections(path, ('packages', 'packages-dev')):
+        if isinstance(entry, dict) and entry.get('name'):
+            yield Dependency(entry['name'], entry.get('version'), 'composer')
+
+def _purl_ecosystem(purl: Optional[str]) -> str:
+    """Tipo del package URL (npm en "pkg:npm/...", maven en "pkg:maven/..."); generic si no hay"""
+    match = re.match(r'pkg:([^/]+)/', purl or '')
+    return match.group(1) if match else 'generic'
+
+def read_cyclonedx(path: str) -> Iterator[Dependency]:
+    """SBOM CycloneDX en JSON, incluidos los componentes anidados"""
+    for _, (_, component) in _json_sections(path, ('components',)):
+        pending = [component]
+        while pending:
+            component = pending.pop()
+            if not isinstance(component, dict):
+                continue
+            ecosystem = _purl_ecosystem(component.get('purl'))
+            name, group = component.get('name', ''), component.get('group')
+            if group:
+                separator = {'npm': '/', 'composer': '/'}.get(ecosystem, ':')
+                name = f"{group}{separator}{name}"
+            if name:
+                yield Dependency(unquote(name), component.get('version'), ecosystem)
+            pending.extend(component.get('components') or [])
+
+def read_spdx(path: str) -> Iterator[Dependency]:
+    """SBOM SPDX 2.x en JSON"""
+    for _, (_, package) in _json_sections(path, ('packages',)):
+        if not isinstance(package, dict) or not package.get('name'):
+            continue
+        purls = [ref.get('referenceLocator') for ref in package.get('externalRefs') or []
+                 if ref.get('referenceType') == 'purl']
+        yield Dependency(package['name'], package.get('versionInfo'),
+                         _purl_ecosystem(purls[0]) if purls else 'generic')
+
+READERS = {
+    'package-lock': read_package_lock,
+    'yarn-lock': read_yarn_lock,
+    'requirements': read_requirements,
+    'pom': read_pom,
+    'composer-lock': read_composer_lock,
+    'cyclonedx': read_cyclonedx,
+    'spdx': read_spdx,
+}
+
+def detect_format(path: str) -> str:
+    """Formato por nombre de archivo o, para otros JSON, por las primeras claves del documento"""
+    name = os.path.basename(path).lower()
+    if name in ('package-lock.json', 'npm-shrinkwrap.json'):
+        return 'package-lock'
+    if name == 'yarn.lock':
+        return 'yarn-lock'
+    if name == 'composer.lock':
+        return 'composer-lock'
+    if name == 'pom.xml' or name.endswith('.pom'):
+        return 'pom'
+    if name.endswith('.txt') and 'requirements' in name:
+        return 'requirements'
+    
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        head = f.read(8192)
+    if '"bomFormat"' in head or 'cyclonedx' in head.lower():
+        return 'cyclonedx'
+    if '"spdxVersion"' in head:
+        return 'spdx'
+    if '"lockfileVersion"' in head:
+        return 'package-lock'
+    raise ValueError(f"No se reconoce el formato de {path}; indíquelo con --formato ({', '.join(FORMATS)})")
+
+def read_dependencies(path: str, file_format: Optional[str] = None) -> Iterator[Dependency]:
+    """Genera las dependencias del archivo a medida que se leen"""
+    return READERS[file_format or detect_format(path)](path)
+
+def compliance_report(path: str, file_format: Optional[str] = None, batch_size: int = BATCH_SIZE,
+                      only_problems: bool = False) -> Dict:
+    """
+    Informe de cumplimiento ES0901 de un lockfile o SBOM, con la forma de
+    generar_reporte_verificacion más el archivo, el formato y el total de
+    dependencias leídas.
+    
+    Cada (producto, versión) distinto se verifica una sola vez; las
+    dependencias se acumulan en tandas de batch_size y los mensajes de
+    detalle se arman solo para las filas que se informan.
+    """
+    file_format = file_format or detect_format(path)
+    report = {
+        "fecha_verificacion": datetime.now().strftime('%Y-%m-%d'),
+        "archivo": os.path.basename(path),
+        "formato": file_format,
+        "total_dependencias": 0,
+        "total_verificados": 0,
+        "compatibles": 0,
+        "no_compatibles": 0,
+        "no_encontrados": 0,
+        "detalles": [],
+    }
+    seen = set()
+    pending = []
+    
+    def flush():
+        batch = verificar_lote([(name, version) for name, version, _ in pending])
+        for key, value in batch.resumen().items():
+            report[key] += value
+        for i, (_, _, dependency) in enumerate(pending):
+            if only_problems and batch.estados[i] == ESTADO_COMPATIBLE:
+                continue
+            detail = batch.detalle(i)
+            detail["paquete"] = dependency.name
+            detail["ecosistema"] = dependency.ecosystem
+            report["detalles"].append(detail)
+        pending.clear()
+    
+    for dependency in READERS[file_format](path):
+        report["total_dependencias"] += 1
+        name = catalog_name(dependency)
+        key = (name, dependency.version)
+        if key in seen:
+            continue
+        seen.add(key)
+        pending.append((name, dependency.version, dependency))
+        if len(pending) >= batch_size:
+            flush()
+    if pending:
+        flush()
+    return report
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verificar un lockfile o SBOM contra el catálogo ES0901")
+    parser.add_argument("archivo", help="package-lock.json, yarn.lock, requirements.txt, pom.xml, "
+                                        "composer.lock o SBOM CycloneDX/SPDX en JSON")
+    parser.add_argument("--formato", choices=FORMATS, help="Formato del archivo (por defecto se detecta)")
+    parser.add_argument("--solo-problemas", action="store_true",
+                        help="Incluir en los detalles solo los componentes no compatibles o no homologados")
+    parser.add_argument("-o", "--output", help="Archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+    
+    try:
+        report = compliance_report(args.archivo, args.formato, only_problems=args.solo_problemas)
+    except (OSError, ValueError, ET.ParseError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    json_str = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json_str)
+    else:
+        print(json_str)
+    print(f"{report['total_dependencias']} dependencias, {report['total_verificados']} componentes distintos: "
+          f"{report['compatibles']} compatibles, {report['no_compatibles']} no compatibles, "
+          f"{report['no_encontrados']} fuera del catálogo", file=sys.stderr)
+    return 0 if report['no_compatibles'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Instantáneas binarias del catálogo ES0901.
+
+El actualizador procesa una sola vez el documento del estándar (PDF o txt)
+dejado en ./config y escribe una instantánea versionada y compacta del
+catálogo compilado. Al iniciar, estandar.obtener_catalogo mapea el archivo
+en memoria (mmap) en lugar de procesar el documento; los arreglos de claves
+de la verificación por lotes se usan directamente desde las páginas
+mapeadas, que el sistema operativo comparte entre todos los procesos y
+réplicas que abren el mismo archivo.
+
+Formato (little-endian):
+    cabecera    HEADER: firma, versión del formato, bits por componente y tamaños
+    metadatos   JSON UTF-8 (versión y fecha del estándar, revisión, origen)
+    cadenas     nombres, versiones y alias en UTF-8 separados por NUL, sin repetir
+    productos   por producto, índice del nombre y cantidad de versiones (uint32)
+    versiones   índice de cada versión, en el orden de los productos (uint32)
+    alias       pares (alias, producto) de índices (uint32)
+    claves      arreglos int64 ordenados de ClavesNumericas, alineados a 8 bytes
+
+Uso:
+    python snapshot.py
+    python snapshot.py config/ES0901.pdf --version "ES0901 v4.8" --fecha 2025-06-30
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from datetime import date, datetime
+from typing import Dict, Optional
+
+import estandar
+from estandar import CatalogoCompilado, leer_estandar
+
+MAGIC = b'ES0901CT'
+FORMAT_VERSION = 1
+# firma, formato, bits por componente de las claves, tamaño de los metadatos y
+# de las cadenas, cantidad de productos, versiones y alias, y largo de cada arreglo de claves
+HEADER = struct.Struct('<8sHH8I')
+KEY_ARRAYS = estandar.CLAVES_ARREGLOS
+
+CONFIG_DIR = 'config'
+SOURCE_PATTERNS = ('*.pdf', '*.txt')
+
+# "ES0901 v4.8", "ES 0901 - Versión 4.8"
+VERSION_PATTERN = re.compile(r'ES\s*-?\s*0901\D{0,20}?v(?:ersi[oó]n)?\.?\s*(\d+(?:\.\d+)*)', re.IGNORECASE)
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def write_snapshot(catalog: CatalogoCompilado, path: str, metadata: Optional[Dict] = None) -> int:
+    """
+    Escribe la instantánea del catálogo y devuelve su tamaño en bytes. Se
+    escribe en un archivo temporal que luego reemplaza al anterior, de modo
+    que los procesos que ya lo tienen mapeado siguen leyendo la versión vieja.
+    """
+    strings, index = [], {}
+    
+    def intern(text):
+        if text not in index:
+            index[text] = len(strings)
+            strings.append(text)
+        return index[text]
+    
+    products, versions, aliases = [], [], []
+    for name in catalog.nombres:
+        product = catalog.productos[name]
+        products += (intern(name), len(product.versiones))
+        versions += (intern(version) for version in product.versiones)
+    for alias, target in catalog.alias.items():
+        aliases += (intern(alias), intern(target))
+    
+    meta = json.dumps(dict(metadata or catalog.metadatos), ensure_ascii=False, sort_keys=True).encode('utf-8')
+    blob = '\0'.join(strings).encode('utf-8')
+    keys = [sorted(getattr(catalog.claves, name)) for name in KEY_ARRAYS]
+    
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, estandar._BITS_COMPONENTE, len(meta), len(blob),
+                    len(products) // 2, len(versions), len(aliases) // 2, *(len(k) for k in keys)),
+        meta,
+        blob,
+        struct.pack(f'<{len(products)}I', *products),
+        struct.pack(f'<{len(versions)}I', *versions),
+        struct.pack(f'<{len(aliases)}I', *aliases),
+    ]
+    size = sum(len(part) for part in parts)
+    parts.append(b'\0' * (_align(size) - size))
+    parts += (struct.pack(f'<{len(k)}q', *k) for k in keys)
+    data = b''.join(parts)
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(data)
+
+def load_snapshot(path: str) -> CatalogoCompilado:
+    """
+    Catálogo de la instantánea. El archivo queda mapeado en memoria mientras
+    el catálogo exista: los arreglos de claves se leen del mapeo sin copiarse.
+    
+    Raises:
+        ValueError: si el archivo no es una instantánea válida de este formato
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} no es una instantánea del catálogo")
+    magic, file_format, bits, n_meta, n_strings, n_products, n_versions, n_aliases, *counts = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es una instantánea del catálogo")
+    if file_format != FORMAT_VERSION:
+        raise ValueError(f"Formato de instantánea {file_format} no soportado (se esperaba {FORMAT_VERSION})")
+    
+    offset = HEADER.size
+    tables = offset + n_meta + n_strings
+    keys_offset = _align(tables + 4 * (2 * n_products + n_versions + 2 * n_aliases))
+    if len(buffer) != keys_offset + 8 * sum(counts):
+        raise ValueError(f"La instantánea {path} está incompleta")
+    
+    metadata = json.loads(buffer[offset:offset + n_meta].decode('utf-8'))
+    offset += n_meta
+    strings = buffer[offset:offset + n_strings].decode('utf-8').split('\0')
+    products = struct.unpack_from(f'<{2 * n_products}I', buffer, tables)
+    versions = struct.unpack_from(f'<{n_versions}I', buffer, tables + 8 * n_products)
+    aliases = struct.unpack_from(f'<{2 * n_aliases}I', buffer, tables + 8 * n_products + 4 * n_versions)
+    
+    catalog_versions, start = {}, 0
+    for i in range(0, len(products), 2):
+        count = products[i + 1]
+        catalog_versions[strings[products[i]]] = [strings[v] for v in versions[start:start + count]]
+        start += count
+    alias = {strings[aliases[i]]: strings[aliases[i + 1]] for i in range(0, len(aliases), 2)}
+    
+    # Las claves solo se reutilizan si se codificaron igual que en este proceso; se
+    # pasan como vistas del mapeo y numpy las lee recién en la primera verificación por lotes
+    arrays = None
+    if bits == estandar._BITS_COMPONENTE:
+        arrays, offset = {}, keys_offset
+        for name, count in zip(KEY_ARRAYS, counts):
+            arrays[name] = memoryview(buffer)[offset:offset + 8 * count]
+            offset += 8 * count
+    return CatalogoCompilado(catalog_versions, alias, metadata, arrays)
+
+def read_metadata(path: str) -> Optional[Dict]:
+    """Metadatos de la instantánea (sin leer el catálogo), o None si no existe o no es válida"""
+    try:
+        with open(path, 'rb') as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+            if fields[0] != MAGIC or fields[1] != FORMAT_VERSION:
+                return None
+            return json.loads(f.read(fields[3]).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+def latest_source(directory: str = CONFIG_DIR) -> Optional[str]:
+    """Documento del estándar (PDF o txt) modificado más recientemente en el directorio"""
+    candidates = [path for pattern in SOURCE_PATTERNS for path in glob.glob(os.path.join(directory, pattern))]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+def detect_version(text: str) -> Optional[str]:
+    match = VERSION_PATTERN.search(text)
+    return f"ES0901 v{match.group(1)}" if match else None
+
+def update_catalog(source: Optional[str] = None, path: Optional[str] = None, version: Optional[str] = None,
+                   fecha: Optional[str] = None, activate: bool = True) -> Dict:
+    """
+    Genera la instantánea a partir del documento del estándar (por defecto,
+    el más reciente de ./config) y devuelve sus metadatos. Las versiones
+    del documento reemplazan a las del catálogo actual para los productos
+    que menciona. Si el documento no cambió desde la última instantánea no
+    se vuelve a procesar.
+    
+    Raises:
+        FileNotFoundError: si no hay documentos del estándar
+        ValueError: si el documento no contiene versiones reconocibles
+    """
+    source = source or latest_source()
+    if source is None:
+        raise FileNotFoundError(f"No hay documentos del estándar (.pdf o .txt) en {CONFIG_DIR}")
+    path = path or estandar.RUTA_SNAPSHOT
+    with open(source, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    
+    previous = read_metadata(path)
+    if previous and previous.get('sha256') == digest and version is None and fecha is None:
+        metadata = previous
+    else:
+        name = os.path.basename(source)
+        base = estandar.obtener_catalogo_base()
+        text, document_versions = leer_estandar(content, name, base)
+        if not document_versions:
+            raise ValueError(f"No se reconocieron versiones homologadas en {name}")
+        metadata = {
+            'version_estandar': version or detect_version(text) or f"ES0901 ({name})",
+            'fecha_actualizacion': fecha or date.fromtimestamp(os.path.getmtime(source)).isoformat(),
+            'revision': (previous or {}).get('revision', 0) + 1,
+            'origen': name,
+            'sha256': digest,
+            'generado': datetime.now().isoformat(timespec='seconds'),
+        }
+        write_snapshot(base.superponer(document_versions, metadata), path, metadata)
+    
+    if activate:
+        estandar.usar_snapshot(path)
+    return metadata
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Actualizar el catálogo ES0901 a partir del documento del estándar")
+    parser.add_argument("archivo", nargs="?", help=f"PDF o txt del estándar (por defecto, el más reciente de {CONFIG_DIR}/)")
+    parser.add_argument("-o", "--output", help=f"Ruta de la instantánea (por defecto, {estandar.RUTA_SNAPSHOT})")
+    parser.add_argument("--version", help="Versión del estándar (por defecto, se detecta en el documento)")
+    parser.add_argument("--fecha", help="Fecha de actualización (por defecto, la del archivo)")
+    args = parser.parse_args(argv)
+    
+    try:
+        metadata = update_catalog(args.archivo, args.output, args.version, args.fecha, activate=False)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    path = args.output or estandar.RUTA_SNAPSHOT
+    print(f"{metadata['version_estandar']} ({metadata['fecha_actualizacion']}), revisión {metadata['revision']}: "
+          f"{path}, {os.path.getsize(path)} bytes", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
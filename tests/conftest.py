@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Configuración compartida de las pruebas: los escaneos de los sitios locales
+no se guardan en las bases de ./reports sino en un directorio temporal que
+se borra al terminar
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+REPORTS_DIR = tempfile.mkdtemp(prefix='checkpoint-pruebas-')
+atexit.register(shutil.rmtree, REPORTS_DIR, ignore_errors=True)
+
+# Antes de importar los módulos: las rutas predeterminadas se leen al importarlos
+os.environ['CHECKPOINT_HISTORY_DB'] = os.path.join(REPORTS_DIR, 'history.sqlite')
+os.environ['CHECKPOINT_FINGERPRINT_DB'] = os.path.join(REPORTS_DIR, 'fingerprints.sqlite')
+os.environ['CHECKPOINT_CACHE_DIR'] = os.path.join(REPORTS_DIR, 'cache')
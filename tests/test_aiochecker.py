@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Pruebas del análisis asíncrono aiochecker.py y de su cliente HTTP aiotransport.py
+"""
+
+import unittest
+import threading
+import asyncio
+import time
+import sys
+import os
+from http.server import ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import test_checker
+from aiochecker import AsyncSecurityChecker, run_fleet, scan_fleet
+from aiotransport import AsyncHTTPClient, AsyncTransport
+from batch import run_batch
+from checker import SecurityChecker
+
+class SitioAsincrono(test_checker.SitioDePrueba):
+    """Sitio de prueba con respuestas chunked y una ruta lenta que mide la concurrencia"""
+    
+    def do_GET(self, send_body=True):
+        if self.path == '/chunked':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for part in (b"<html><body>", b"<p>hola</p>" * 1000, b"</body></html>"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if self.path == '/lento':
+            server = self.server
+            with server.lock:
+                server.en_vuelo += 1
+                server.maximo = max(server.maximo, server.en_vuelo)
+            time.sleep(0.05)
+            with server.lock:
+                server.en_vuelo -= 1
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b"ok")
+            return
+        super().do_GET(send_body)
+
+class TestAsyncSecurityChecker(unittest.TestCase):
+    """Pruebas de integración de AsyncSecurityChecker"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioAsincrono)
+        cls.server.lock = threading.Lock()
+        cls.server.en_vuelo = cls.server.maximo = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def test_mismos_chequeos_que_el_checker_sincronico(self):
+        success, result = AsyncSecurityChecker(self.url).check_security()
+        esperado = SecurityChecker(self.url).check_security()[1]
+        
+        self.assertTrue(success)
+        self.assertEqual(result['checks'], esperado['checks'])
+        self.assertEqual(result['status'], esperado['status'])
+    
+    def test_reutiliza_conexiones(self):
+        checker = AsyncSecurityChecker(self.url)
+        checker.check_security()
+        metrics = checker.details['transport']
+        
+        self.assertGreaterEqual(metrics['requests'], 1 + len(checker.build_probes()))
+        self.assertGreaterEqual(metrics['reused_connections'], 1)
+        self.assertEqual(metrics['new_connections'] + metrics['reused_connections'], metrics['requests'])
+    
+    def test_cuerpo_chunked_y_limite_de_tamano(self):
+        checker = AsyncSecurityChecker(self.url + "chunked")
+        self.assertTrue(checker.check_security()[0])
+        self.assertEqual(checker.details['body']['bytes_read'], len(b"<html><body></body></html>") + 11000)
+        
+        checker = AsyncSecurityChecker(self.url + "grande", max_body_size=100 * 1024)
+        self.assertTrue(checker.check_security()[0])
+        self.assertEqual(checker.details['body']['bytes_read'], 100 * 1024)
+        self.assertTrue(checker.details['body']['truncated'])
+    
+    def test_url_inaccesible(self):
+        success, result = AsyncSecurityChecker("http://127.0.0.1:1/").check_security()
+        self.assertFalse(success)
+        self.assertIn("No se pudo conectar", result)
+    
+    def test_plazo_del_escaneo(self):
+        """Los sondeos que no terminan antes del plazo se informan como agotados"""
+        checker = AsyncSecurityChecker(self.url, wordlist=[f'/{i}' for i in range(50)], rate_limit=20, scan_deadline=0.3)
+        start = time.monotonic()
+        success, result = checker.check_security()
+        
+        self.assertTrue(success)
+        self.assertEqual(result['total'], 14)
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertGreater(checker.details['exposure']['errors'], 0)
+    
+    def test_sqlite_fuera_del_event_loop(self):
+        """Las huellas de los recursos y el historial se consultan en otro hilo, no en el del event loop"""
+        checker = AsyncSecurityChecker(self.url + "publica")
+        hilos = []
+        
+        def registrar(funcion):
+            def en_hilo(*args, **kwargs):
+                hilos.append(threading.get_ident())
+                return funcion(*args, **kwargs)
+            return en_hilo
+        checker.fingerprints.get = registrar(checker.fingerprints.get)
+        checker.history.record = registrar(checker.history.record)
+        self.assertTrue(checker.check_security()[0])
+        
+        self.assertEqual(len(hilos), 2)
+        self.assertNotIn(threading.get_ident(), hilos)
+    
+    def test_limite_por_host(self):
+        """El cliente compartido no supera per_host peticiones simultáneas a un mismo host"""
+        self.server.maximo = 0
+        
+        async def pedir_todas():
+            client = AsyncHTTPClient(per_host=3)
+            transport = AsyncTransport(client)
+            
+            async def pedir():
+                response = await transport.request(self.url + "lento")
+                body = await response.read()
+                await response.close()
+                return body
+            
+            try:
+                return await asyncio.gather(*(pedir() for _ in range(12)))
+            finally:
+                await client.close()
+        
+        self.assertEqual(asyncio.run(pedir_todas()), [b"ok"] * 12)
+        self.assertLessEqual(self.server.maximo, 3)
+        self.assertGreater(self.server.maximo, 1)
+    
+    def test_flota(self):
+        urls = [self.url, self.url + "chunked", "http://127.0.0.1:1/"]
+        
+        async def recorrer():
+            return [item async for item in scan_fleet(urls, concurrency=2)]
+        
+        items = sorted(asyncio.run(recorrer()), key=lambda item: item.index)
+        self.assertEqual([item.url for item in items], urls)
+        self.assertEqual([item.success for item in items], [True, True, False])
+        
+        items = sorted(run_batch(urls, workers=2, mode="async"), key=lambda item: item.index)
+        self.assertEqual([item.success for item in items], [True, True, False])
+        self.assertEqual(len(list(run_fleet([]))), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la suite de benchmarks: sitios de prueba y comparación con la línea base
+"""
+
+import unittest
+import urllib.request
+import sys
+import os
+
+# Agregar el directorio padre y benchmarks/ al path para importar los módulos
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from fixtures import FixtureServer, page
+from suite import compare
+
+def medicion(valor, mayor_es_mejor=False, cpu=True):
+    return {'valor': valor, 'unidad': 'ms', 'mayor_es_mejor': mayor_es_mejor, 'cpu': cpu}
+
+class TestFixtures(unittest.TestCase):
+    
+    def test_sitios(self):
+        self.assertGreaterEqual(len(page('spa')), 5 * 1024 * 1024 - 64)
+        self.assertGreater(page('formularios').count(b'<form'), 100)
+        
+        with FixtureServer() as server:
+            with urllib.request.urlopen(server.url('pequena')) as response:
+                self.assertEqual(response.read(), page('pequena'))
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(server.url('pequena') + 'admin')
+            self.assertEqual(error.exception.code, 404)
+
+class TestComparacion(unittest.TestCase):
+    
+    def test_regresiones_y_calibracion(self):
+        base = {'calibracion': 1.0, 'mediciones': {
+            'tiempo': medicion(100.0),
+            'throughput': medicion(10.0, mayor_es_mejor=True),
+            'red': medicion(800.0, cpu=False),
+        }}
+        # Máquina el doble de lenta: los tiempos de CPU esperados se duplican, los de red no
+        actual = {'calibracion': 2.0, 'mediciones': {
+            'tiempo': medicion(210.0),
+            'throughput': medicion(3.0, mayor_es_mejor=True),
+            'red': medicion(810.0, cpu=False),
+            'nueva': medicion(1.0),
+        }}
+        estados = {fila['nombre']: fila['estado'] for fila in compare(actual, base, tolerance=0.3)}
+        self.assertEqual(estados, {'tiempo': 'ok', 'throughput': 'REGRESIÓN', 'red': 'ok', 'nueva': 'nuevo'})
+        
+        actual['mediciones']['tiempo'] = medicion(100.0)
+        filas = {fila['nombre']: fila for fila in compare(actual, base, tolerance=0.3)}
+        self.assertEqual(filas['tiempo']['estado'], 'mejora')
+        self.assertAlmostEqual(filas['tiempo']['cambio'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
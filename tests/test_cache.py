@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché de resultados de escaneo cache.py
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import time
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import CacheEntry, ScanCache, cached_check
+from checker import SecurityChecker
+
+class SitioConETag(BaseHTTPRequestHandler):
+    """Página principal con ETag que responde 304 a las peticiones condicionales"""
+    
+    protocol_version = 'HTTP/1.1'
+    etag = '"v1"'
+    extra = {}
+    
+    def do_GET(self, send_body=True):
+        if self.path == '/':
+            self.server.pedidos_principal += 1
+            if self.headers.get('If-None-Match') == self.etag:
+                self.send_response(304)
+                self.send_header('ETag', self.etag)
+                self.end_headers()
+                return
+            body = b"<html><body><p>Inicio</p></body></html>"
+            status = 200
+        else:
+            body, status = b"<html>No encontrado</html>", 404
+        
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        for name, value in self.extra.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestScanCache(unittest.TestCase):
+    """Pruebas de la caché en memoria y disco"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioConETag)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.server.pedidos_principal = 0
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def checker(self, **kwargs):
+        return SecurityChecker(self.url, wordlist=['/icons'], **kwargs)
+    
+    def test_resultado_desde_memoria_y_disco(self):
+        """El segundo escaneo de la misma URL no genera tráfico; otro proceso lo lee del disco"""
+        cache = ScanCache(self.directory, ttl=60)
+        success, primero, info = cached_check(self.checker(), cache)
+        self.assertTrue(success)
+        self.assertEqual(info['source'], 'scan')
+        
+        success, segundo, info = cached_check(self.checker(), cache)
+        self.assertEqual((info['source'], info['layer']), ('cache', 'memoria'))
+        self.assertIs(segundo, primero)
+        
+        otra = ScanCache(self.directory, ttl=60)
+        success, desde_disco, info = cached_check(self.checker(), otra)
+        self.assertEqual(info['layer'], 'disco')
+        self.assertEqual(desde_disco, primero)
+        self.assertEqual(self.server.pedidos_principal, 1)
+    
+    def test_configuracion_distinta(self):
+        """Un cambio de configuración que afecta el resultado usa otra clave"""
+        cache = ScanCache(None)
+        self.assertNotEqual(cache.key_for(self.checker()), cache.key_for(self.checker(max_body_size=1024)))
+        self.assertEqual(cache.key_for(self.checker()), cache.key_for(self.checker(rate_limit=5)))
+    
+    def test_revalidacion_con_etag(self):
+        """Vencido el TTL, un 304 confirma que la página no cambió y evita el escaneo completo"""
+        cache = ScanCache(self.directory, ttl=0)
+        cached_check(self.checker(), cache)
+        time.sleep(0.01)
+        
+        success, result, info = cached_check(self.checker(), cache)
+        self.assertEqual((info['source'], info['layer']), ('cache', 'revalidado'))
+        # Escaneo, petición condicional y HEAD que confirma las cabeceras
+        self.assertEqual(self.server.pedidos_principal, 3)
+        self.assertEqual(cache.stats['revalidated'], 1)
+    
+    def test_revalidacion_con_cabeceras_nuevas(self):
+        """Un 304 no renueva la entrada si cambió una cabecera que leen los chequeos"""
+        cache = ScanCache(self.directory, ttl=0)
+        cached_check(self.checker(), cache)
+        time.sleep(0.01)
+        
+        SitioConETag.extra = {'X-Frame-Options': 'DENY'}
+        try:
+            success, result, info = cached_check(self.checker(), cache)
+        finally:
+            SitioConETag.extra = {}
+        self.assertEqual(info['source'], 'scan')
+        self.assertEqual(cache.stats['revalidated'], 0)
+        checks = {name.split('.')[0]: status for name, status, details in result['checks']}
+        self.assertTrue(checks['3'])
+    
+    def test_forzar_escaneo(self):
+        cache = ScanCache(None)
+        cached_check(self.checker(), cache)
+        success, result, info = cached_check(self.checker(), cache, force=True)
+        self.assertEqual(info['source'], 'scan')
+        self.assertEqual(self.server.pedidos_principal, 2)
+    
+    def test_desalojo_lru(self):
+        """Se descartan primero las entradas usadas hace más tiempo"""
+        cache = ScanCache(self.directory, max_entries=2, max_disk_entries=2)
+        resultado = {'checks': [('1. Captcha', True, 'ok')], 'status': 'APROBADO'}
+        for key in ('a', 'b'):
+            cache.put(CacheEntry(key, f"https://{key}.test", resultado))
+            time.sleep(0.01)
+        cache.get('a')
+        cache.put(CacheEntry('c', "https://c.test", resultado))
+        
+        self.assertEqual(list(cache._memory), ['a', 'c'])
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.json', 'c.json'])
+        self.assertEqual(ScanCache(self.directory).get('a')[0].result['checks'], [('1. Captcha', True, 'ok')])
+    
+    def test_errores_no_se_guardan(self):
+        cache = ScanCache(self.directory)
+        success, result, info = cached_check(SecurityChecker("http://127.0.0.1:1/"), cache)
+        self.assertFalse(success)
+        self.assertEqual(os.listdir(self.directory), [])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
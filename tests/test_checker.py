@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Pruebas del motor de análisis checker.py contra un servidor HTTP local
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker import HTMLTagParser, SecurityChecker, VersionDetector
+from probes import Probe
+from report import build_report_data
+
+PAGINA_PRINCIPAL = b"""<html><head>
+<script src="/js/jquery-3.6.4.min.js"></script>
+<link rel="stylesheet" href="/css/bootstrap-5.3.0.min.css">
+</head><body>
+<form action="/login" method="post">
+  <input type="text" name="usuario" required>
+  <input type="password" name="clave">
+  <div class="g-recaptcha" data-sitekey="abc"></div>
+  login
+</form>
+</body></html>"""
+
+class SitioDePrueba(BaseHTTPRequestHandler):
+    """Sitio estático mínimo para los chequeos"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    paginas = {
+        '/': (200, PAGINA_PRINCIPAL),
+        '/icons': (200, b"<html>listado de iconos</html>"),
+        '/grande': (200, b"<html><body>" + b"<p>contenido</p>" * 50000 + b"</body></html>"),
+        '/publica': (200, b'<html><head><script src="/js/lento.js"></script></head><body>Inicio</body></html>'),
+        '/js/lento.js': (200, b"var x = 1;"),
+    }
+    
+    # Respuestas que dejan una cookie de sesión y recursos que demoran en llegar
+    cookies = {'/icons': 'sessionid=abc; Path=/'}
+    lentas = {'/js/lento.js': 0.5}
+    
+    def do_GET(self, send_body=True):
+        status, body = self.paginas.get(self.path, (404, b"<html>No encontrado</html>"))
+        time.sleep(self.lentas.get(self.path, 0))
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Frame-Options', 'DENY')
+        if self.path in self.cookies:
+            self.send_header('Set-Cookie', self.cookies[self.path])
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestSecurityChecker(unittest.TestCase):
+    """Pruebas de integración de SecurityChecker"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioDePrueba)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def test_catorce_chequeos_en_orden(self):
+        """check_security devuelve los 14 chequeos en el orden documentado"""
+        success, result = SecurityChecker(self.url).check_security()
+        
+        self.assertTrue(success)
+        self.assertEqual(result['total'], 14)
+        numeros = [int(nombre.split('.')[0]) for nombre, _, _ in result['checks']]
+        self.assertEqual(numeros, list(range(1, 15)))
+    
+    def test_resultados_de_chequeos(self):
+        """Los chequeos reflejan el contenido y los sondeos del sitio"""
+        success, result = SecurityChecker(self.url).check_security()
+        checks = {nombre.split('.')[0]: (estado, detalles) for nombre, estado, detalles in result['checks']}
+        
+        self.assertTrue(checks['1'][0])     # CAPTCHA presente
+        self.assertTrue(checks['3'][0])     # X-Frame-Options: DENY
+        self.assertTrue(checks['9'][0])     # Página de error sin stack trace
+        self.assertFalse(checks['13'][0])   # /icons accesible
+        self.assertIn('/icons', checks['13'][1])
+    
+    def test_url_inaccesible(self):
+        """Un host que no responde se informa como error y no como excepción"""
+        success, result = SecurityChecker("http://127.0.0.1:1/").check_security()
+        self.assertFalse(success)
+        self.assertIn("Error", result)
+    
+    def test_esquema_json(self):
+        """El JSON exportado conserva el esquema del botón de descarga"""
+        success, result = SecurityChecker(self.url).check_security()
+        data = build_report_data(self.url, result, {'nombre': 'Prueba', 'autor': None, 'ticket': None, 'version': '01.00.00'})
+        
+        self.assertEqual(set(data), {'url', 'fecha', 'proyecto', 'resultados', 'pruebas'})
+        self.assertEqual(len(data['pruebas']), 14)
+        self.assertIn(data['pruebas'][0]['estado'], ('CUMPLE', 'NO CUMPLE'))
+
+    def test_limite_de_tamano_del_cuerpo(self):
+        """El cuerpo se lee por bloques y se corta en max_body_size"""
+        checker = SecurityChecker(self.url + "grande", max_body_size=100 * 1024)
+        success, result = checker.check_security()
+        
+        self.assertTrue(success)
+        self.assertEqual(checker.details['body']['bytes_read'], 100 * 1024)
+        self.assertTrue(checker.details['body']['truncated'])
+    
+    def test_lista_de_rutas_configurable(self):
+        """El chequeo 13 sondea todas las rutas de la lista, no solo las primeras"""
+        checker = SecurityChecker(self.url, wordlist=['/images', '/fonts', '/icons'])
+        success, result = checker.check_security()
+        checks = {nombre.split('.')[0]: (estado, detalles) for nombre, estado, detalles in result['checks']}
+        
+        self.assertEqual(checker.details['exposure']['probed'], 3)
+        self.assertEqual(checks['13'][1], "Acceso a: /icons")
+    
+    def test_cookies_de_los_sondeos(self):
+        """El chequeo 7 solo cuenta las cookies de la página principal, no las que dejan los sondeos"""
+        checker = SecurityChecker(self.url + "publica", wordlist=['/icons'])
+        success, result = checker.check_security()
+        checks = {nombre.split('.')[0]: (estado, detalles) for nombre, estado, detalles in result['checks']}
+        
+        self.assertIn('sessionid', [cookie.name for cookie in checker.cookie_jar])
+        self.assertFalse(checks['7'][0])
+    
+    def test_un_plazo_por_escaneo(self):
+        """Los sondeos y la descarga de recursos comparten el plazo del escaneo"""
+        checker = SecurityChecker(self.url, wordlist=['/icons'])
+        plazos = set()
+        
+        def registrar(fetch):
+            def fetch_con_plazo(probe):
+                plazos.add(probe.deadline)
+                return fetch(probe)
+            return fetch_con_plazo
+        checker.scheduler.fetch = registrar(checker.scheduler.fetch)
+        checker.fetch_asset = registrar(checker.fetch_asset)
+        checker.check_security()
+        
+        self.assertEqual(len(plazos), 1)
+    
+    def test_catalogo_de_la_sesion(self):
+        """El chequeo 5 y la huella de la caché usan el catálogo recibido, no el global"""
+        from estandar import cargar_catalogo
+        catalogo = cargar_catalogo(b"jquery:3.7.1\n", "estandar.txt")
+        
+        predeterminado = SecurityChecker(self.url)
+        checker = SecurityChecker(self.url, catalogo=catalogo)
+        success, result = checker.check_security()
+        checks = {nombre.split('.')[0]: (estado, detalles) for nombre, estado, detalles in result['checks']}
+        
+        self.assertFalse(checks['5'][0])
+        self.assertIn("jquery 3.6.4", checks['5'][1])
+        self.assertNotEqual(checker.config_fingerprint(), predeterminado.config_fingerprint())
+    
+    def test_metricas_de_conexiones(self):
+        """Los sondeos reutilizan la conexión keep-alive de la página principal"""
+        checker = SecurityChecker(self.url)
+        checker.check_security()
+        metrics = checker.details['transport']
+        
+        self.assertGreaterEqual(metrics['requests'], 1 + len(checker.build_probes()))
+        self.assertGreaterEqual(metrics['reused_connections'], 1)
+        self.assertEqual(metrics['new_connections'] + metrics['reused_connections'], metrics['requests'])
+    
+    def test_plazo_del_get_despues_del_head(self):
+        """Si la tasa no deja confirmar con GET antes del plazo del lote, el sondeo se informa como agotado"""
+        checker = SecurityChecker(self.url, rate_limit=0.5)
+        checker.scheduler.limiter.acquire()
+        probe = Probe('path:/icons', self.url + "icons", head_first=True, deadline=time.monotonic() + 0.2)
+        
+        inicio = time.monotonic()
+        result = checker.fetch_probe(probe)
+        self.assertLess(time.monotonic() - inicio, 1.0)
+        self.assertEqual(result.error, "Tiempo límite del escaneo agotado")
+
+class TestHTMLTagParser(unittest.TestCase):
+    """Pruebas del parser HTML"""
+    
+    def test_deteccion_de_versiones(self):
+        """Se detectan versiones en scripts y hojas de estilo"""
+        parser = HTMLTagParser()
+        parser.feed(PAGINA_PRINCIPAL.decode())
+        
+        self.assertEqual(parser.detected_versions.get('jquery'), '3.6.4')
+        self.assertEqual(parser.detected_versions.get('bootstrap'), '5.3.0')
+        self.assertEqual(len(parser.forms), 1)
+        self.assertEqual(len(parser.inputs), 2)
+
+class TestVersionDetector(unittest.TestCase):
+    """Pruebas del detector de versiones basado en el catálogo"""
+    
+    def setUp(self):
+        self.detector = VersionDetector(['jquery', 'node', 'nodejs', 'ios', 'chart.js', 'lodash', 'react'])
+    
+    def test_urls(self):
+        """Se detectan bibliotecas del catálogo en URLs de scripts y estilos"""
+        casos = [
+            ("/js/jquery-3.6.4.min.js", {'jquery': '3.6.4'}),
+            ("https://cdn.jsdelivr.net/npm/lodash@4.17.21/lodash.min.js", {'lodash': '4.17.21'}),
+            ("/vendor/chart.js-4.4.0.js", {'chart.js': '4.4.0'}),
+            ("/bin/nodejs-18.20.4.tar.gz", {'nodejs': '18.20.4'}),
+            ("/js/axios-1.6.0.js", {}),
+            ("/static/js/main.3f2a1b.js", {}),
+        ]
+        
+        for url, esperado in casos:
+            with self.subTest(url=url):
+                self.assertEqual(self.detector.scan_url(url), esperado)
+    
+    def test_contenido_de_scripts(self):
+        """Se detectan versiones declaradas en scripts inline"""
+        casos = [
+            ('window.reactversion = "18.2.0";', {'react': '18.2.0'}),
+            ("var cfg = {jquery version: '3.7.1'};", {'jquery': '3.7.1'}),
+            ('var preactversion = "10.5.0";', {}),
+            ('console.log("sin versiones")', {}),
+        ]
+        
+        for contenido, esperado in casos:
+            with self.subTest(contenido=contenido):
+                self.assertEqual(self.detector.scan_script(contenido), esperado)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Pruebas del modo crawl crawler.py contra un sitio local de varias páginas
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker import HTMLTagParser, SecurityChecker
+from crawler import SiteCrawler, crawl_site, merge_checks, normalize_url
+from report import build_report_data
+
+PAGINA_ACERCA = b"""<html><body><h1>Acerca del sitio</h1>
+<a href="/profundo">Detalles</a></body></html>"""
+
+SITIO = {
+    '/': b"""<html><body>
+<a href="/acerca">Acerca</a> <a href="/acerca#equipo">Equipo</a> <a href="/otra?origen=menu">Otra</a>
+<a href="/login">Ingresar</a> <a href="/privado/panel">Panel</a> <a href="/manual.pdf">Manual</a>
+<a href="https://externo.invalid/">Externo</a> <a href="mailto:info@ejemplo.invalid">Correo</a>
+<form action="/buscar"><input type="text" name="q" required></form>
+<form action="/salir" method="post"><button>Salir</button></form>
+</body></html>""",
+    '/acerca': PAGINA_ACERCA,
+    '/otra?origen=menu': PAGINA_ACERCA,
+    '/login': b"""<html><body><form action="/login" method="post">
+<input type="text" name="usuario" required><input type="password" name="clave">
+<div class="g-recaptcha" data-sitekey="abc"></div></form></body></html>""",
+    '/profundo': b"""<html><body><p>Servidor interno 10.0.0.5</p>
+<a href="/mas-profundo">Seguir</a></body></html>""",
+    '/mas-profundo': b"<html><body>Fin</body></html>",
+    '/privado/panel': b"<html><body>Panel</body></html>",
+}
+
+class SitioDeVariasPaginas(BaseHTTPRequestHandler):
+    """Sitio con enlaces internos y externos, contenido repetido y un robots.txt que excluye /privado/"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self, send_body=True):
+        self.server.pedidas.append(self.path)
+        content_type = 'text/html; charset=utf-8'
+        if self.path == '/robots.txt':
+            status, body, content_type = 200, b"User-agent: *\nDisallow: /privado/\n", 'text/plain'
+        elif self.path in SITIO:
+            status, body = 200, SITIO[self.path]
+        else:
+            status, body = 404, b"<html>No encontrado</html>"
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Frame-Options', 'DENY')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestSiteCrawler(unittest.TestCase):
+    """Pruebas de integración de SiteCrawler"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioDeVariasPaginas)
+        cls.server.pedidas = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.server.pedidas = []
+    
+    def crawl(self, **options):
+        checker = SecurityChecker(self.url, wordlist=['/admin'], rate_limit=0)
+        success, result = crawl_site(checker, **options)
+        self.assertTrue(success, result)
+        return checker, result
+    
+    def test_veredicto_del_sitio(self):
+        checker, result = self.crawl()
+        checks = {name.split('.')[0]: (status, details) for name, status, details in result['checks']}
+        
+        # El CAPTCHA del login cuenta para el sitio aunque la página principal no lo tenga
+        self.assertTrue(checks['1'][0])
+        self.assertIn("/login", checks['1'][1])
+        # Una IP en una página interna hace fallar el chequeo 14 del sitio
+        self.assertFalse(checks['14'][0])
+        self.assertIn("/profundo", checks['14'][1])
+        self.assertEqual(result['total'], 14)
+        self.assertEqual(result['status'], 'NO APROBADO')
+        
+        self.assertEqual(result['pages'][0]['url'], self.url)
+        self.assertEqual(result['pages'][0]['depth'], 0)
+        self.assertIn({'url': self.url + "buscar", 'depth': 1, 'http_status': 404}, result['pages'])
+        self.assertTrue(all('checks' not in page for page in result['pages']))
+    
+    def test_robots_y_mismo_origen(self):
+        checker, result = self.crawl()
+        
+        self.assertNotIn('/privado/panel', self.server.pedidas)
+        self.assertNotIn('/manual.pdf', self.server.pedidas)
+        # La acción de un formulario POST no se pide con GET
+        self.assertNotIn('/salir', self.server.pedidas)
+        self.assertEqual(checker.details['crawl']['robots_blocked'], 1)
+        self.assertEqual(self.server.pedidas.count('/acerca'), 1)
+        
+        checker, result = self.crawl(respect_robots=False)
+        self.assertIn('/privado/panel', self.server.pedidas)
+    
+    def test_contenido_repetido(self):
+        checker, result = self.crawl()
+        repetidas = [page['url'] for page in result['pages'] if page.get('duplicate')]
+        
+        self.assertEqual(len(repetidas), 1)
+        self.assertEqual(checker.details['crawl']['duplicates'], 1)
+        # La página repetida no se expande: /profundo se pide una sola vez
+        self.assertEqual(self.server.pedidas.count('/profundo'), 1)
+    
+    def test_profundidad_y_presupuesto(self):
+        self.crawl(max_depth=2)
+        self.assertIn('/profundo', self.server.pedidas)
+        self.assertNotIn('/mas-profundo', self.server.pedidas)
+        
+        self.server.pedidas = []
+        checker, result = self.crawl(max_depth=0)
+        self.assertEqual([page['url'] for page in result['pages']], [self.url])
+        self.assertEqual(checker.details['crawl']['pages'], 1)
+        
+        checker, result = self.crawl(max_pages=3)
+        self.assertEqual(len(result['pages']), 3)
+        self.assertTrue(checker.details['crawl']['budget_exhausted'])
+    
+    def test_instrumentacion_e_informe(self):
+        checker = SecurityChecker(self.url, wordlist=['/admin'], rate_limit=0, instrument=True)
+        success, result = SiteCrawler(checker, max_pages=5).run()
+        performance = checker.details['performance']
+        
+        self.assertTrue(success)
+        self.assertEqual(performance['probes'], 2)
+        self.assertIn('checks', performance['phases'])
+        
+        data = build_report_data(self.url, result, {}, performance)
+        self.assertEqual(data['paginas'], result['pages'])
+        del result['pages']
+        self.assertNotIn('paginas', build_report_data(self.url, result, {}))
+    
+    def test_url_inaccesible(self):
+        success, result = crawl_site(SecurityChecker("http://127.0.0.1:1/"))
+        self.assertFalse(success)
+        self.assertIn("No se pudo conectar", result)
+    
+    def checker_con_chequeos(self, chequeos_principal):
+        """Checker cuyos chequeos de la página principal se reemplazan por chequeos_principal()"""
+        checker = SecurityChecker(self.url, wordlist=['/admin'], rate_limit=0)
+        run_checks = checker.run_checks
+        
+        def run_checks_principal(*args, base_url=None, **kwargs):
+            if base_url == self.url:
+                return chequeos_principal()
+            return run_checks(*args, base_url=base_url, **kwargs)
+        checker.run_checks = run_checks_principal
+        return checker
+    
+    def test_falla_la_pagina_principal(self):
+        """Si fallan los chequeos de la página principal no se toma otra página en su lugar"""
+        def falla():
+            raise RuntimeError("chequeo roto")
+        success, result = crawl_site(self.checker_con_chequeos(falla))
+        self.assertFalse(success)
+        self.assertEqual(result, "Error durante la evaluación: chequeo roto")
+    
+    def test_plazo_total_del_recorrido(self):
+        """El plazo corta el recorrido sin esperar a los chequeos en curso"""
+        def lento():
+            time.sleep(2.0)
+            return []
+        inicio = time.monotonic()
+        success, result = crawl_site(self.checker_con_chequeos(lento), deadline=0.5)
+        self.assertLess(time.monotonic() - inicio, 1.5)
+        self.assertFalse(success)
+        self.assertIn("Tiempo límite del recorrido agotado", result)
+
+class TestCrawlerHelpers(unittest.TestCase):
+    """Pruebas de las funciones auxiliares del recorrido"""
+    
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url("HTTP://Ejemplo.gob.ar:80/a?b=1#c"), "http://ejemplo.gob.ar/a?b=1")
+        self.assertEqual(normalize_url("https://ejemplo.gob.ar:8443"), "https://ejemplo.gob.ar:8443/")
+        self.assertIsNone(normalize_url("mailto:info@ejemplo.gob.ar"))
+        self.assertIsNone(normalize_url("javascript:void(0)"))
+    
+    def test_links_of(self):
+        parser = HTMLTagParser()
+        parser.feed('<a href="/a">a</a><a href="b#x">b</a><a href="https://otro.gob.ar/">c</a>'
+                    '<a href="/img/logo.PNG">d</a><a href="/a#y">e</a><form action="/enviar"></form>'
+                    '<form action="/buscar" method="GET"></form><form action="/borrar" method="post"></form>')
+        crawler = SiteCrawler(SecurityChecker("https://ejemplo.gob.ar/"))
+        
+        self.assertEqual(crawler.links_of("https://ejemplo.gob.ar/dir/", parser),
+                         ["https://ejemplo.gob.ar/a", "https://ejemplo.gob.ar/dir/b", "https://ejemplo.gob.ar/enviar",
+                          "https://ejemplo.gob.ar/buscar"])
+    
+    def test_merge_checks(self):
+        pages = [
+            ("https://s/", [("1. Captcha", False, "sin captcha"), ("9. Errores", True, "ok"), ("14. Frontend", True, "ok")]),
+            ("https://s/a", [("1. Captcha", True, "recaptcha"), ("9. Errores", False, "x"), ("14. Frontend", False, "IP")]),
+            ("https://s/b", [("1. Captcha", False, "sin captcha"), ("9. Errores", False, "x"), ("14. Frontend", False, "IP")]),
+        ]
+        
+        self.assertEqual(merge_checks(pages), [
+            ("1. Captcha", True, "recaptcha (en https://s/a)"),
+            ("9. Errores", True, "ok"),
+            ("14. Frontend", False, "IP (en https://s/a y 1 página(s) más)"),
+        ])
+        self.assertEqual(merge_checks(pages[:1]), pages[0][1])
+
+if __name__ == '__main__':
+    unittest.main()
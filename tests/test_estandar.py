@@ -4,8 +4,11 @@ Pruebas unitarias para el módulo estandar.py
 """
 
 import unittest
+import subprocess
+import threading
 import sys
 import os
+from importlib.util import find_spec
 
 # Agregar el directorio padre al path para importar el módulo
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,8 +20,24 @@ from estandar import (
     verificar_version_compatible,
     obtener_versiones_recomendadas,
     es_software_homologado,
-    obtener_catalogo_completo
+    obtener_catalogo_completo,
+    obtener_catalogo,
+    cargar_versiones_desde_archivo,
+    cargar_catalogo,
+    parsear_estandar_txt,
+    usar_catalogo,
+    CatalogoCompilado,
+    VERSIONES_HOMOLOGADAS,
+    verificar_lote,
+    generar_reporte_verificacion,
+    ESTADO_COMPATIBLE,
+    ESTADO_NO_COMPATIBLE,
+    ESTADO_SIN_VERSION,
+    ESTADO_NO_ENCONTRADO
 )
+import estandar
+
+PDF_DISPONIBLE = find_spec('reportlab') is not None and find_spec('PyPDF2') is not None
 
 class TestEstandarModule(unittest.TestCase):
     """Pruebas para el módulo de estándares"""
@@ -56,6 +75,36 @@ class TestEstandarModule(unittest.TestCase):
                 resultado = extraer_version(entrada)
                 self.assertEqual(resultado, esperado)
     
+    def test_extraer_version_formas_extendidas(self):
+        """Prueba sufijos de letra, prerelease/build y prefijos v/version"""
+        casos = [
+            ("oracle 19c", "19c"),
+            ("openssl 1.1.1k", "1.1.1k"),
+            ("1.0.0-beta.1+build.5", "1.0.0-beta.1+build.5"),
+            ("spring-boot-3.2.0-SNAPSHOT.jar", "3.2.0-snapshot"),
+            ("jquery-3.6.4-min.js", "3.6.4"),
+            ("vue3", "3"),
+            ("Windows 10 v1809", "1809"),      # El prefijo v gana
+            ("node 18 build 18.20.4", "18.20.4"),  # Más componentes gana
+            ("3rd party 2", "2"),
+            ("1.2.3a1", "1.2.3a1"),            # Prerelease pegado (PEP 440)
+            ("django 4.2.0rc1", "4.2.0rc1"),
+            ("node-1.2.3x64", "1.2.3"),       # Un sufijo desconocido no recorta el núcleo
+            ("", None),
+        ]
+        
+        for entrada, esperado in casos:
+            with self.subTest(entrada=entrada):
+                self.assertEqual(extraer_version(entrada), esperado)
+        # Memo: la segunda llamada devuelve el mismo objeto
+        self.assertIs(extraer_version("openssl 1.1.1k"), extraer_version("openssl 1.1.1k"))
+    
+    def test_prerelease_compatible_por_mayor_menor(self):
+        """Un prerelease cuenta con su núcleo para la regla mayor.menor"""
+        self.assertTrue(buscar_version_homologada("jquery 3.7.2-rc.1")["compatible"])
+        self.assertTrue(buscar_version_homologada("jquery 3.7.2rc1")["compatible"])
+        self.assertTrue(buscar_version_homologada("oracle 19c")["compatible"])
+    
     def test_verificar_version_compatible(self):
         """Prueba la verificación de compatibilidad de versiones"""
         versiones_homologadas = ["3.6.4", "3.7.0", "3.7.1"]
@@ -167,6 +216,229 @@ class TestEstandarModule(unittest.TestCase):
                 self.assertEqual(resultado["estado"], "encontrado")
                 self.assertFalse(resultado["compatible"])
 
+class TestCatalogoCompilado(unittest.TestCase):
+    """Pruebas del catálogo compilado"""
+    
+    def test_inmutable(self):
+        """El catálogo y sus productos no se pueden modificar"""
+        catalogo = obtener_catalogo()
+        with self.assertRaises(AttributeError):
+            catalogo.productos = {}
+        with self.assertRaises(TypeError):
+            catalogo.productos['jquery'] = None
+        with self.assertRaises(AttributeError):
+            catalogo.producto('jquery').versiones = ()
+    
+    def test_indices_mayor_menor(self):
+        """La regla de compatibilidad usa los índices precalculados"""
+        catalogo = CatalogoCompilado({'demo': ['3.6.4', '5', '19c']})
+        casos = [
+            ('3.6.9', True),    # Mismo mayor y menor
+            ('3.7.0', False),   # Otro menor
+            ('3', True),        # Solo mayor
+            ('5.9.1', True),    # Homologada sin menor
+            ('19c', True),      # Coincidencia exacta no numérica
+            ('19', False),
+            ('abc', False),
+        ]
+        for version, esperado in casos:
+            with self.subTest(version=version):
+                self.assertEqual(catalogo.es_compatible('demo', version), esperado)
+    
+    def test_alias_y_nombres_con_version(self):
+        """Los alias y los nombres con versión pegada o separada se resuelven al producto"""
+        self.assertIs(obtener_catalogo().producto('node.js'), obtener_catalogo().producto('nodejs'))
+        for texto in ("Node.js 18.20.4", "react v18.2.0", "angular version 17.3.12", "font-awesome 6.0.0", "vue3"):
+            with self.subTest(texto=texto):
+                self.assertEqual(buscar_version_homologada(texto)["estado"], "encontrado")
+    
+    def test_recompilar_al_cargar_archivo(self):
+        """Cargar un archivo de estándares activa un catálogo nuevo sin modificar el global"""
+        import tempfile
+        original = dict(VERSIONES_HOMOLOGADAS)
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("producto_nuevo:1.2.3\n")
+        try:
+            anterior = obtener_catalogo()
+            with usar_catalogo(None):
+                self.assertTrue(cargar_versiones_desde_archivo(f.name))
+                self.assertIsNot(obtener_catalogo(), anterior)
+                self.assertIs(obtener_catalogo().base, anterior)
+                self.assertTrue(es_software_homologado("producto_nuevo"))
+            self.assertIs(obtener_catalogo(), anterior)
+            self.assertFalse(es_software_homologado("producto_nuevo"))
+            self.assertEqual(VERSIONES_HOMOLOGADAS, original)
+        finally:
+            os.unlink(f.name)
+
+class TestCargarCatalogo(unittest.TestCase):
+    """Pruebas de la carga de archivos de estándares por sesión"""
+    
+    TXT = "# estándar de prueba\njquery:3.7.1\nproducto_nuevo:1.2.3, 1.3.0\nlínea sin formato\n".encode('utf-8')
+    
+    def test_parsear_txt(self):
+        self.assertEqual(parsear_estandar_txt(self.TXT.decode('utf-8')),
+                         {"jquery": ["3.7.1"], "producto_nuevo": ["1.2.3", "1.3.0"]})
+    
+    def test_no_modifica_el_catalogo_global(self):
+        """El catálogo cargado se usa solo donde se pasa; el global no cambia"""
+        original = dict(VERSIONES_HOMOLOGADAS)
+        global_antes = obtener_catalogo()
+        catalogo = cargar_catalogo(self.TXT, "estandar.txt")
+        self.assertEqual(VERSIONES_HOMOLOGADAS, original)
+        self.assertIs(obtener_catalogo(), global_antes)
+        self.assertNotEqual(catalogo.huella, global_antes.huella)
+        
+        self.assertTrue(buscar_version_homologada("producto_nuevo 1.3.0", catalogo=catalogo)["compatible"])
+        self.assertEqual(buscar_version_homologada("producto_nuevo 1.3.0")["estado"], "no_encontrado")
+        # Las versiones del archivo reemplazan a las del producto; el resto del catálogo se conserva
+        self.assertFalse(buscar_version_homologada("jquery 3.6.4", catalogo=catalogo)["compatible"])
+        self.assertTrue(buscar_version_homologada("bootstrap 5.3.0", catalogo=catalogo)["compatible"])
+    
+    def test_cache_por_contenido(self):
+        """El mismo contenido devuelve el mismo catálogo compilado"""
+        catalogo = cargar_catalogo(self.TXT, "estandar.txt")
+        self.assertIs(cargar_catalogo(bytes(self.TXT), "otro_nombre.txt"), catalogo)
+        self.assertIsNot(cargar_catalogo(self.TXT + b"otro:1.0\n"), catalogo)
+    
+    def test_archivo_sin_versiones(self):
+        with self.assertRaises(ValueError):
+            cargar_catalogo(b"solo texto\n", "vacio.txt")
+    
+    @unittest.skipUnless(PDF_DISPONIBLE, "reportlab o PyPDF2 no disponibles")
+    def test_pdf(self):
+        """Líneas "nombre: versiones" y filas de tabla con productos conocidos"""
+        from reportlab.pdfgen import canvas
+        import io
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for i, linea in enumerate(["ES0901 - Estándar de software", "Producto Versión",
+                                   "jQuery 3.7.1 3.7.2", "producto_nuevo: 1.2.3", "Página 1"]):
+            pdf.drawString(72, 760 - 20 * i, linea)
+        pdf.save()
+        
+        catalogo = cargar_catalogo(buffer.getvalue(), "ES0901.pdf")
+        self.assertEqual(catalogo.productos["jquery"].versiones, ("3.7.1", "3.7.2"))
+        self.assertEqual(catalogo.productos["producto_nuevo"].versiones, ("1.2.3",))
+        self.assertNotIn("página", catalogo)
+
+class TestCatalogoSesion(unittest.TestCase):
+    """Pruebas de los catálogos superpuestos y del catálogo por sesión"""
+    
+    def test_superponer_comparte_productos(self):
+        base = obtener_catalogo()
+        catalogo = base.superponer({"jquery": ["3.7.2"], "producto_nuevo": ["1.0"]})
+        
+        self.assertIs(catalogo.base, base)
+        self.assertIs(catalogo.productos["bootstrap"], base.productos["bootstrap"])
+        self.assertEqual(catalogo.productos["jquery"].versiones, ("3.7.2",))
+        self.assertEqual(base.productos["jquery"].versiones, ("3.6.4", "3.7.0", "3.7.1"))
+        self.assertEqual(catalogo.nombres[:len(base)], base.nombres)
+        self.assertEqual(catalogo.nombres[-1], "producto_nuevo")
+        self.assertNotEqual(catalogo.huella, base.huella)
+        
+        lote = verificar_lote(["jquery 3.7.2", "jquery 3.6.4", "producto_nuevo 1.0", "bootstrap 5.3.0"], catalogo)
+        self.assertEqual(list(lote.estados), [ESTADO_COMPATIBLE, ESTADO_NO_COMPATIBLE,
+                                              ESTADO_COMPATIBLE, ESTADO_COMPATIBLE])
+    
+    def test_catalogos_por_hilo(self):
+        """Cada hilo consulta su catálogo de sesión sin afectar a los demás ni al global"""
+        from concurrent.futures import ThreadPoolExecutor
+        barrera = threading.Barrier(4)
+        
+        def sesion(version):
+            with usar_catalogo(obtener_catalogo().superponer({"jquery": [version]})):
+                barrera.wait()
+                return [buscar_version_homologada(f"jquery {v}")["compatible"] for v in ("1.1.0", "1.2.0", "1.3.0", "1.4.0")]
+        
+        versiones = ["1.1.0", "1.2.0", "1.3.0", "1.4.0"]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            resultados = list(pool.map(sesion, versiones))
+        for i, resultado in enumerate(resultados):
+            self.assertEqual(resultado, [j == i for j in range(4)])
+        self.assertTrue(buscar_version_homologada("jquery 3.6.4")["compatible"])
+    
+    def test_cargar_archivo_en_sesion(self):
+        """Con un catálogo de sesión activo, cargar un archivo no modifica el global"""
+        import tempfile
+        original = dict(VERSIONES_HOMOLOGADAS)
+        global_antes = obtener_catalogo()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("producto_sesion:2.0\n")
+        try:
+            with usar_catalogo(global_antes):
+                self.assertTrue(cargar_versiones_desde_archivo(f.name))
+                self.assertTrue(es_software_homologado("producto_sesion"))
+            self.assertFalse(es_software_homologado("producto_sesion"))
+            self.assertIs(obtener_catalogo(), global_antes)
+            self.assertEqual(VERSIONES_HOMOLOGADAS, original)
+        finally:
+            os.unlink(f.name)
+
+class TestVerificacionLote(unittest.TestCase):
+    """Pruebas de la verificación por lotes"""
+    
+    TEXTOS = [
+        "jquery 3.6.4", "jquery 2.0.0", "jquery", "vue3", "Node.js 18.20.4",
+        "react v18.2.0", "software_inventado 1.0.0", "", "bootstrap 5.3.0", "php 7.4.0",
+        "jquery 3.6.4",
+    ]
+    
+    def test_equivale_a_buscar_version_homologada(self):
+        """Cada fila da el mismo resultado que la búsqueda individual"""
+        lote = verificar_lote(self.TEXTOS)
+        self.assertEqual(len(lote), len(self.TEXTOS))
+        for i, texto in enumerate(self.TEXTOS):
+            with self.subTest(texto=texto):
+                self.assertEqual(lote.detalle(i), buscar_version_homologada(texto))
+    
+    def test_pares_y_estados(self):
+        """Los pares (software, versión) se clasifican por columnas"""
+        lote = verificar_lote([("jquery", "3.6.4"), ("Bootstrap", "4.0.0"), ("jquery", None),
+                               ("inventado", "1.0"), ("Node.js", "v18.20.4"), ("oracle", "19c"),
+                               ("jquery", "20240101")])
+        self.assertEqual([int(e) for e in lote.estados],
+                         [ESTADO_COMPATIBLE, ESTADO_NO_COMPATIBLE, ESTADO_SIN_VERSION, ESTADO_NO_ENCONTRADO,
+                          ESTADO_COMPATIBLE, ESTADO_COMPATIBLE, ESTADO_NO_COMPATIBLE])
+        self.assertEqual(lote.software[1], "bootstrap")
+        self.assertEqual(lote.versiones[4], "18.20.4")
+        self.assertEqual(lote.resumen(), {"total_verificados": 7, "compatibles": 3,
+                                          "no_compatibles": 3, "no_encontrados": 1})
+        self.assertEqual(lote.indices(ESTADO_NO_ENCONTRADO), [3])
+        self.assertIn("v18.20.4 es compatible", lote.detalle(4)["mensaje"])
+    
+    def test_sin_numpy(self):
+        """La implementación en Python puro da el mismo resultado"""
+        con_numpy = verificar_lote(self.TEXTOS)
+        original = estandar.NUMPY_DISPONIBLE
+        estandar.NUMPY_DISPONIBLE = False
+        try:
+            sin_numpy = verificar_lote(self.TEXTOS)
+        finally:
+            estandar.NUMPY_DISPONIBLE = original
+        self.assertIsInstance(sin_numpy.estados, list)
+        self.assertEqual([int(e) for e in con_numpy.estados], sin_numpy.estados)
+        self.assertEqual(con_numpy.resumen(), sin_numpy.resumen())
+    
+    def test_numpy_no_se_importa_al_importar(self):
+        """numpy se importa en la primera verificación por lotes, no al importar el checker"""
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (f"import sys; sys.path.insert(0, {raiz!r})\n"
+                  "import checker, estandar\n"
+                  "print('numpy' in sys.modules)\n"
+                  "estandar.verificar_lote(['jquery 3.6.4'])\n"
+                  "print('numpy' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+        self.assertEqual(output.stdout.split(), ['False', str(estandar.NUMPY_DISPONIBLE)])
+    
+    def test_reporte_verificacion(self):
+        """generar_reporte_verificacion conserva su formato"""
+        reporte = generar_reporte_verificacion(self.TEXTOS)
+        self.assertEqual(reporte["total_verificados"], len(self.TEXTOS))
+        self.assertEqual(reporte["compatibles"], 6)
+        self.assertEqual(reporte["no_encontrados"], 2)
+        self.assertEqual(reporte["detalles"][0], buscar_version_homologada("jquery 3.6.4"))
+
 class TestIntegracionEstandar(unittest.TestCase):
     """Pruebas de integración para el módulo de estándares"""
     
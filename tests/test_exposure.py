@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pruebas del sondeo de exposición de rutas exposure.py
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exposure import DEFAULT_WORDLIST, SoftNotFound, classify_exposures, load_wordlist
+from probes import ProbeResult
+
+PAGINA_SPA = b"<html><body><div id='app'>Cargando la aplicacion de Tramites</div><p>Ruta %s</p></body></html>"
+
+def resultado(path, status=200, body=b"", url=None, final_url=None, method="GET"):
+    url = url or f"https://app.test{path}"
+    return ProbeResult(f"path:{path}", url, status=status, body=body, final_url=final_url, method=method)
+
+class TestWordlist(unittest.TestCase):
+    """Pruebas de la lectura de la lista de rutas"""
+    
+    def test_archivo_con_comentarios(self):
+        """Se ignoran comentarios y líneas vacías, se agrega la barra y se quitan duplicados"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("# rutas\n/.env\n\nadmin/\n/.env\n  /backup.zip  \n")
+        try:
+            self.assertEqual(load_wordlist(f.name), ['/.env', '/admin/', '/backup.zip'])
+        finally:
+            os.unlink(f.name)
+    
+    def test_lista_por_defecto(self):
+        """La lista incluida contiene las rutas originales del chequeo 13"""
+        paths = load_wordlist(DEFAULT_WORDLIST)
+        self.assertEqual(paths[:2], ['/icons', '/icons/small'])
+        self.assertIn('/.git/HEAD', paths)
+        self.assertGreater(len(paths), 50)
+
+class TestSoftNotFound(unittest.TestCase):
+    """Pruebas de la comparación con la página de error"""
+    
+    def test_sitio_con_respuesta_generica(self):
+        """En un sitio que responde 200 a todo, la misma página no cuenta como exposición"""
+        baseline = resultado('/non_existent_page_12345', body=PAGINA_SPA % b'/non_existent_page_12345')
+        soft_404 = SoftNotFound(baseline, '/non_existent_page_12345')
+        
+        resumen = classify_exposures([
+            resultado('/admin/', body=PAGINA_SPA % b'/admin/'),
+            resultado('/.env', body=b"DB_PASSWORD=secreto\nAPI_KEY=abc"),
+            resultado('/backup.zip', status=404),
+            ProbeResult('path:/tmp/', 'https://app.test/tmp/', error="timeout"),
+            ProbeResult('error_page', 'https://app.test/x', status=200),
+        ], soft_404)
+        
+        self.assertEqual(resumen['probed'], 4)
+        self.assertEqual(resumen['exposed'], ['/.env'])
+        self.assertEqual(resumen['soft_404'], ['/admin/'])
+        self.assertEqual(resumen['errors'], 1)
+    
+    def test_redireccion_al_mismo_destino(self):
+        """Las rutas que redirigen al mismo lugar que la ruta inexistente se descartan"""
+        baseline = resultado('/non_existent_page_12345', final_url='https://app.test/login', body=b"ingrese")
+        soft_404 = SoftNotFound(baseline, '/non_existent_page_12345')
+        
+        self.assertTrue(soft_404.matches(resultado('/admin/', final_url='https://app.test/login', body=b"otra"), '/admin/'))
+        self.assertFalse(soft_404.matches(resultado('/icons', body=b"listado"), '/icons'))
+    
+    def test_sin_linea_base(self):
+        """Si la ruta inexistente respondió 404 o falló, todo 200 es una exposición"""
+        for baseline in (resultado('/x', status=404), ProbeResult('error_page', 'https://app.test/x', error="timeout"), None):
+            with self.subTest(baseline=baseline):
+                soft_404 = SoftNotFound(baseline, '/x')
+                self.assertFalse(soft_404.matches(resultado('/icons', body=b"listado"), '/icons'))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
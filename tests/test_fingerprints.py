@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la base de huellas de recursos fingerprints.py
+"""
+
+import unittest
+import subprocess
+import tempfile
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fingerprints
+from assets import AssetBody, analyzer_id
+from checker import DEFAULT_DETECTOR, VersionDetector
+from fingerprints import FingerprintDB, get_fingerprint_db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JQUERY = b"/*! jQuery v3.6.4 | (c) OpenJS Foundation */\n" + b"(function(e,t){return e})(window);\n" * 2000
+
+def body_of(content: bytes, size: int = 4096) -> AssetBody:
+    body = AssetBody()
+    for start in range(0, len(content), size):
+        body.append(content[start:start + size])
+    return body
+
+class TestFingerprintDB(unittest.TestCase):
+    """Pruebas de FingerprintDB"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sub', 'huellas.sqlite')
+        self.db = FingerprintDB(self.path)
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def test_guardar_y_recuperar(self):
+        analysis = {'versions': {'jquery': '3.6.4'}, 'ips': [], 'credentials': []}
+        self.assertIsNone(self.db.get('abc', '1:x'))
+        self.db.put('abc', '1:x', 100, analysis)
+        
+        self.assertEqual(self.db.get('abc', '1:x'), analysis)
+        # Otro detector (otro catálogo) no reutiliza el análisis
+        self.assertIsNone(self.db.get('abc', '1:y'))
+        self.assertEqual(self.db.stats, {'hits': 1, 'misses': 2, 'stores': 1})
+        
+        # Persiste en disco: otra instancia sobre el mismo archivo la encuentra
+        other = FingerprintDB(self.path)
+        self.assertEqual(other.get('abc', '1:x'), analysis)
+        other.close()
+        
+        self.db.clear()
+        self.assertEqual(self.db.count(), 0)
+    
+    def test_entre_procesos(self):
+        body = body_of(JQUERY)
+        analysis, known = body.analyze(DEFAULT_DETECTOR, self.db)
+        self.assertFalse(known)
+        
+        script = (f"import sys; sys.path.insert(0, {ROOT!r})\n"
+                  "from fingerprints import FingerprintDB\n"
+                  f"print(FingerprintDB({self.path!r}).get({body.hash.hexdigest()!r}, {analyzer_id(DEFAULT_DETECTOR)!r}))")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+        self.assertEqual(output.stdout.strip(), str(analysis))
+    
+    def test_recorte(self):
+        self.db.max_entries = 5
+        original = fingerprints.EVICT_EVERY
+        fingerprints.EVICT_EVERY = 1
+        try:
+            for i in range(8):
+                self.db.put(f'h{i}', 'a', 1, {'versions': {}, 'ips': [], 'credentials': []})
+        finally:
+            fingerprints.EVICT_EVERY = original
+        
+        self.assertEqual(self.db.count(), 5)
+        self.assertIsNone(self.db.get('h0', 'a'))
+        self.assertIsNotNone(self.db.get('h7', 'a'))
+    
+    def test_archivo_inutilizable(self):
+        """Una ruta que no puede abrirse se comporta como una base vacía"""
+        db = FingerprintDB(self.tmp.name)
+        self.assertIsNone(db.get('abc', 'a'))
+        db.put('abc', 'a', 1, {})
+        self.assertEqual(db.count(), 0)
+    
+    def test_base_compartida(self):
+        self.assertIs(get_fingerprint_db(self.path), get_fingerprint_db(self.path))
+        self.assertIsNone(get_fingerprint_db(''))
+
+class TestAssetBody(unittest.TestCase):
+    """Pruebas del análisis por hash de AssetBody"""
+    
+    def test_analisis_conocido(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = FingerprintDB(os.path.join(tmp, 'huellas.sqlite'))
+            analysis, known = body_of(JQUERY).analyze(DEFAULT_DETECTOR, db)
+            self.assertEqual(analysis['versions'], {'jquery': '3.6.4'})
+            self.assertFalse(known)
+            
+            # El mismo contenido, leído con otros bloques, es el mismo hash
+            self.assertEqual(body_of(JQUERY, 1000).analyze(DEFAULT_DETECTOR, db), (analysis, True))
+            self.assertFalse(body_of(JQUERY + b" ").analyze(DEFAULT_DETECTOR, db)[1])
+            
+            # Un detector con otros productos vuelve a analizar
+            detector = VersionDetector(['jquery', 'otra'])
+            self.assertNotEqual(detector.fingerprint, DEFAULT_DETECTOR.fingerprint)
+            self.assertFalse(body_of(JQUERY).analyze(detector, db)[1])
+            db.close()
+        
+        # Sin base, siempre se analiza
+        self.assertEqual(body_of(JQUERY).analyze(DEFAULT_DETECTOR), (analysis, False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Pruebas del historial de escaneos history.py
+"""
+
+import unittest
+import tempfile
+import threading
+import sys
+import os
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history
+from aiochecker import AsyncSecurityChecker
+from checker import SecurityChecker
+from crawler import crawl_site
+from history import HistoryDB, check_number, get_history_db
+from test_checker import SitioDePrueba
+
+def resultado(fallidos=(), detalles="ok"):
+    checks = [(f"{i}. Chequeo {i}", i not in fallidos, detalles) for i in range(1, 15)]
+    failed = len([check for check in checks if not check[1]])
+    return {'checks': checks, 'total': 14, 'passed': 14 - failed, 'failed': failed,
+            'status': 'APROBADO' if failed == 0 else 'NO APROBADO'}
+
+class TestHistoryDB(unittest.TestCase):
+    """Pruebas de las consultas de HistoryDB"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = HistoryDB(os.path.join(self.tmp.name, 'historial.sqlite'))
+        self.hoy = datetime(2026, 10, 15, 12, 0)
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def guardar(self, url, dias, fallidos=(), proyecto='Eventos', ticket='APP-1'):
+        created = (self.hoy - timedelta(days=dias)).timestamp()
+        return self.db.record(url, True, resultado(fallidos), {'nombre': proyecto, 'ticket': ticket}, created)
+    
+    def test_guardar_y_recuperar(self):
+        scan_id = self.guardar("https://a.gob.ar", 0, fallidos=(3,))
+        self.db.record("https://caida.gob.ar", False, "Error: No se pudo acceder a la URL",
+                       created=self.hoy.timestamp())
+        
+        scans = self.db.scans(since=self.hoy - timedelta(days=1))
+        self.assertEqual([(scan['url'], scan['status']) for scan in scans],
+                         [("https://caida.gob.ar", 'ERROR'), ("https://a.gob.ar", 'NO APROBADO')])
+        self.assertEqual(scans[1]['project'], 'Eventos')
+        self.assertEqual(self.db.checks_of(scan_id), resultado((3,))['checks'])
+        self.assertEqual(self.db.scans(ticket='APP-1')[0]['id'], scan_id)
+        self.assertEqual(self.db.scans(url="https://caida.gob.ar")[0]['error'], "Error: No se pudo acceder a la URL")
+    
+    def test_aplicaciones_que_fallan(self):
+        self.guardar("https://a.gob.ar", 20, fallidos=(3,))
+        self.guardar("https://a.gob.ar", 2)                   # corregida después
+        self.guardar("https://b.gob.ar", 5, fallidos=(3, 9))
+        self.guardar("https://c.gob.ar", 40, fallidos=(3,))   # fuera del período
+        self.guardar("https://d.gob.ar", 1, fallidos=(3,), proyecto='Otro')
+        mes = self.hoy - timedelta(days=30)
+        
+        self.assertEqual([row['url'] for row in self.db.failing(3, since=mes)], ["https://b.gob.ar", "https://d.gob.ar"])
+        self.assertEqual([row['url'] for row in self.db.failing(3, since=mes, project='Eventos')], ["https://b.gob.ar"])
+        # Sin latest, cada escaneo fallido del período
+        self.assertEqual([row['url'] for row in self.db.failing(3, since=mes, latest=False)],
+                         ["https://d.gob.ar", "https://b.gob.ar", "https://a.gob.ar"])
+        self.assertEqual(self.db.failing(9, since=mes)[0]['name'], "9. Chequeo 9")
+    
+    def test_tendencias(self):
+        for dias, fallidos in [(0, ()), (0, (3,)), (1, (3,)), (8, ())]:
+            self.guardar(f"https://{dias}-{len(fallidos)}.gob.ar", dias, fallidos)
+        self.db.record("https://caida.gob.ar", False, "Error", created=self.hoy.timestamp())
+        
+        por_dia = self.db.trend(self.hoy - timedelta(days=2), self.hoy + timedelta(days=1))
+        self.assertEqual([(row['period'], row['scans'], row['passed']) for row in por_dia],
+                         [('2026-10-14', 1, 0), ('2026-10-15', 2, 1)])
+        self.assertEqual(por_dia[1]['rate'], 0.5)
+        
+        chequeo = self.db.trend(bucket='mes', check_id=3)
+        self.assertEqual([(row['period'], row['scans'], row['passed']) for row in chequeo], [('2026-10', 4, 2)])
+        semanas = self.db.trend(bucket='semana', project='Eventos')
+        self.assertEqual(sum(row['scans'] for row in semanas), 4)
+        self.assertEqual(self.db.trend(project='Otro'), [])
+        
+        tasas = {row['check_id']: row['rate'] for row in self.db.check_rates()}
+        self.assertEqual(tasas[3], 0.5)
+        self.assertEqual(tasas[1], 1.0)
+    
+    def test_purgar(self):
+        self.guardar("https://a.gob.ar", 400)
+        self.guardar("https://a.gob.ar", 1)
+        self.assertEqual(self.db.prune(self.hoy - timedelta(days=365)), 1)
+        self.assertEqual(self.db.count(), 1)
+        self.assertEqual(self.db.check_rates()[0]['scans'], 1)
+        
+        self.db.clear()
+        self.assertEqual(self.db.count(), 0)
+    
+    def test_archivo_inutilizable(self):
+        """Una ruta que no puede abrirse no interrumpe el escaneo"""
+        db = HistoryDB(self.tmp.name)
+        self.assertIsNone(db.record("https://a.gob.ar", True, resultado()))
+        self.assertEqual(db.scans(), [])
+        self.assertEqual(db.count(), 0)
+    
+    def test_auxiliares(self):
+        self.assertEqual(check_number("13. Acceso no autorizado"), 13)
+        self.assertEqual(check_number("Sin número"), 0)
+        self.assertEqual(history.timestamp("2026-10-01"), datetime(2026, 10, 1).timestamp())
+        self.assertIsNone(get_history_db(''))
+    
+    def test_linea_de_comandos(self):
+        self.guardar("https://b.gob.ar", 0, fallidos=(3,))
+        path = self.db.path
+        self.assertEqual(history.main(['--base', path, '--falla', '3', '--desde', '2026-10-01']), 0)
+        self.assertEqual(history.main(['--base', path, '--purgar', '0']), 0)
+        self.assertEqual(self.db.count(), 0)
+
+class TestHistorialDeEscaneos(unittest.TestCase):
+    """Cada check_security (sincrónico, asíncrono o del recorrido) queda en el historial"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioDePrueba)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = HistoryDB(os.path.join(self.tmp.name, 'historial.sqlite'))
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def checker(self, checker_class=SecurityChecker, url=None):
+        checker = checker_class(url or self.url, wordlist=['/icons'], rate_limit=0, fetch_assets=False,
+                                project={'nombre': 'Eventos', 'ticket': 'APP-7', 'autor': 'a@b.gob.ar'})
+        checker.history = self.db
+        return checker
+    
+    def test_escaneos_guardados(self):
+        checker = self.checker()
+        success, result = checker.check_security()
+        self.assertTrue(success)
+        scan = self.db.scans()[0]
+        self.assertEqual(scan['id'], checker.details['history_id'])
+        self.assertEqual((scan['url'], scan['project'], scan['ticket'], scan['author']),
+                         (checker.url, 'Eventos', 'APP-7', 'a@b.gob.ar'))
+        self.assertEqual(self.db.checks_of(scan['id']), [tuple(check) for check in result['checks']])
+        
+        self.checker(AsyncSecurityChecker).check_security()
+        crawl_site(self.checker(), max_depth=0)
+        self.checker(url="http://127.0.0.1:1/").check_security()
+        self.assertEqual([scan['status'] for scan in self.db.scans()][::-1],
+                         [result['status']] * 3 + ['ERROR'])
+        
+        # Sin historial no se guarda nada
+        checker = self.checker()
+        checker.history = None
+        checker.check_security()
+        self.assertEqual(self.db.count(), 4)
+
+if __name__ == '__main__':
+    unittest.main()
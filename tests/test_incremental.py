@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Pruebas del reescaneo incremental (incremental.py, SecurityChecker._rescan)
+"""
+
+import unittest
+import threading
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiochecker import AsyncSecurityChecker
+from cache import ScanCache, cached_check
+from checker import SecurityChecker
+from incremental import BODY_CHANGED, BODY_NOT_MODIFIED, BODY_SAME, input_digests, needs_body, reusable_checks
+from probes import ProbeResult
+from report import build_report_data
+
+PAGINA = b"""<html><head><title>Inicio</title></head><body>
+<form action="/buscar"><input name="q" required></form>
+<p>Bienvenido</p>
+</body></html>"""
+
+class SitioModificable(BaseHTTPRequestHandler):
+    """Sitio cuya página, cabeceras y página de error cambian entre escaneos"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self, send_body=True):
+        site = self.server.sitio
+        if self.path == '/':
+            site['pedidos'].append((self.command, self.headers.get('If-None-Match')))
+            headers = dict(site['cabeceras'], ETag=site['etag'])
+            if self.headers.get('If-None-Match') == site['etag'] and site['responder_304']:
+                self.send_response(304)
+                self.send_header('ETag', site['etag'])
+                self.end_headers()
+                return
+            status, body = 200, site['pagina']
+        elif self.path == '/icons':
+            status, body, headers = 200, b"<html>listado de iconos</html>", {}
+        else:
+            status, body, headers = 404, site['error'], {}
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestReescaneoIncremental(unittest.TestCase):
+    """Reescaneos contra un sitio local que cambia entre un escaneo y el siguiente"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitioModificable)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.server.sitio = {
+            'etag': '"v1"',
+            'pagina': PAGINA,
+            'cabeceras': {'X-Powered-By': 'PHP/8.1.2'},
+            'error': b"<html>No encontrado</html>",
+            'responder_304': True,
+            'pedidos': [],
+        }
+        self.cache = ScanCache(None)
+    
+    def checker(self, checker_class=SecurityChecker):
+        checker = checker_class(self.url, wordlist=['/icons', '/.git'], rate_limit=0, fetch_assets=False)
+        checker.history = None
+        return checker
+    
+    def escanear(self, checker_class=SecurityChecker):
+        success, result, info = cached_check(self.checker(checker_class), self.cache, incremental=True)
+        self.assertTrue(success, result)
+        return result, info
+    
+    def completo(self):
+        success, result = self.checker().check_security()
+        return result['checks']
+    
+    def test_sin_cambios(self):
+        """Con 304 y los mismos sondeos se reutilizan los 14 chequeos sin leer la página"""
+        primero, info = self.escanear()
+        self.assertEqual(info['source'], 'scan')
+        self.assertNotIn('incremental', primero)
+        
+        self.server.sitio['pedidos'].clear()
+        result, info = self.escanear()
+        self.assertEqual(info, dict(info, source='incremental', reused=14))
+        self.assertEqual(result['incremental']['body'], BODY_NOT_MODIFIED)
+        self.assertEqual(result['incremental']['recomputed'], [])
+        self.assertEqual(result['checks'], primero['checks'])
+        # Petición condicional y HEAD para confirmar las cabeceras: el cuerpo no se vuelve a pedir
+        self.assertEqual(self.server.sitio['pedidos'], [('GET', '"v1"'), ('HEAD', None)])
+        # La caché no guarda las marcas del reescaneo
+        self.assertNotIn('incremental', self.cache.get(self.cache.key_for(self.checker()))[0].result)
+    
+    def test_cabecera_corregida(self):
+        """Agregar una cabecera recalcula solo su chequeo"""
+        self.escanear()
+        self.server.sitio['cabeceras']['X-Frame-Options'] = 'DENY'
+        result, _ = self.escanear()
+        
+        self.assertEqual(result['incremental']['recomputed'], ["3. X-FRAME OPTIONS"])
+        self.assertEqual(result['checks'], self.completo())
+        self.assertTrue(result['checks'][2][1])
+    
+    def test_cabecera_quitada(self):
+        """Quitar una cabecera no se ve en el 304: el HEAD la detecta y el chequeo 4 pide la página"""
+        primero, _ = self.escanear()
+        self.assertIn("X-Powered-By", primero['checks'][3][2])
+        del self.server.sitio['cabeceras']['X-Powered-By']
+        self.server.sitio['pedidos'].clear()
+        result, _ = self.escanear()
+        
+        self.assertEqual(result['incremental']['recomputed'], ["4. No divulgar versiones"])
+        self.assertNotIn("X-Powered-By", result['checks'][3][2])
+        self.assertEqual(self.server.sitio['pedidos'], [('GET', '"v1"'), ('HEAD', None), ('GET', None)])
+        self.assertEqual(result['checks'], self.completo())
+    
+    def test_pagina_modificada(self):
+        """Con otra página se recalculan los chequeos del cuerpo; los de cabeceras y sondeos se reutilizan"""
+        self.escanear()
+        self.server.sitio['etag'] = '"v2"'
+        self.server.sitio['pagina'] = PAGINA.replace(b"Bienvenido", b"<a href='/login'>login</a>")
+        result, _ = self.escanear()
+        
+        self.assertEqual(result['incremental']['body'], BODY_CHANGED)
+        self.assertEqual([name.split('.')[0] for name in result['incremental']['reused']], ['3', '9', '11', '13'])
+        self.assertEqual(result['checks'], self.completo())
+        self.assertEqual(result['checks'][9][2], "No se detecta validación contra Active Directory para las credenciales de usuario")
+    
+    def test_mismo_cuerpo_sin_304(self):
+        """Sin 304 se lee la página, pero con el mismo hash no se parsea"""
+        self.escanear()
+        self.server.sitio['responder_304'] = False
+        result, _ = self.escanear()
+        self.assertEqual(result['incremental']['body'], BODY_SAME)
+        self.assertEqual(len(result['incremental']['reused']), 14)
+    
+    def test_sondeo_distinto(self):
+        """Otra página de error recalcula los chequeos 9 y 13"""
+        self.escanear()
+        self.server.sitio['error'] = b"<html>Traceback (most recent call last): ...</html>"
+        result, _ = self.escanear()
+        
+        self.assertEqual([name.split('.')[0] for name in result['incremental']['recomputed']], ['9', '13'])
+        self.assertFalse(result['checks'][8][1])
+        self.assertEqual(result['checks'], self.completo())
+    
+    def test_asincronico(self):
+        primero, _ = self.escanear(AsyncSecurityChecker)
+        self.server.sitio['cabeceras']['X-Frame-Options'] = 'DENY'
+        result, info = self.escanear(AsyncSecurityChecker)
+        
+        self.assertEqual(info['source'], 'incremental')
+        self.assertEqual(result['incremental']['recomputed'], ["3. X-FRAME OPTIONS"])
+        self.assertEqual(result['checks'], self.completo())
+    
+    def test_informe(self):
+        self.escanear()
+        self.server.sitio['cabeceras']['X-Frame-Options'] = 'DENY'
+        result, _ = self.escanear()
+        
+        data = build_report_data(self.url, result, {})
+        self.assertEqual([prueba['reutilizada'] for prueba in data['pruebas']], [i != 2 for i in range(14)])
+        self.assertEqual(data['incremental']['recalculadas'], ["3. X-FRAME OPTIONS"])
+        completo = {name: value for name, value in result.items() if name != 'incremental'}
+        self.assertNotIn('reutilizada', build_report_data(self.url, completo, {})['pruebas'][0])
+
+class TestEntradas(unittest.TestCase):
+    """Pruebas de las huellas de entradas de incremental.py"""
+    
+    def test_huellas_por_chequeo(self):
+        probes = [ProbeResult('error_page', 'http://a/x', status=404, body=b"no"),
+                  ProbeResult('path:/icons', 'http://a/icons', status=404)]
+        antes = input_digests({'Server': 'nginx'}, 'abc', probes, [])
+        despues = input_digests({'Server': 'nginx', 'Date': 'otra'}, 'abc', probes, [])
+        # Las cabeceras que ningún chequeo lee no invalidan nada
+        self.assertEqual(antes, despues)
+        
+        checks = [(f"{i}. Chequeo", True, "ok") for i in range(1, 15)]
+        cambiado = input_digests({'Server': 'nginx/1.2'}, 'abc', probes, [])
+        self.assertEqual(sorted(set(range(1, 15)) - set(reusable_checks(checks, antes, cambiado))), [4])
+        self.assertTrue(needs_body(reusable_checks(checks, antes, cambiado)))
+        self.assertFalse(needs_body({i: check for i, check in enumerate(checks, 1) if i != 3}))
+        # Sin huellas anteriores no se reutiliza nada
+        self.assertEqual(reusable_checks(checks, None, antes), {})
+
+if __name__ == '__main__':
+    unittest.main()
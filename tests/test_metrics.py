@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la instrumentación de los escaneos metrics.py
+"""
+
+import unittest
+import threading
+import time
+import urllib.request
+import sys
+import os
+from http.server import ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import test_checker
+from checker import SecurityChecker
+from metrics import DISABLED, MetricsRegistry, ScanMetrics, start_metrics_server
+from report import build_report_data
+
+class TestInstrumentacion(unittest.TestCase):
+    """Mediciones de SecurityChecker con y sin instrumentación"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), test_checker.SitioDePrueba)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def test_tiempos_por_fase_y_por_chequeo(self):
+        checker = SecurityChecker(self.url, instrument=True)
+        success, result = checker.check_security()
+        performance = checker.details['performance']
+        
+        self.assertTrue(success)
+        self.assertEqual(list(performance['checks']), [nombre for nombre, _, _ in result['checks']])
+        self.assertEqual(set(performance['phases']), {'request', 'download', 'parse', 'checks', 'wait', 'probes'})
+        self.assertGreaterEqual(performance['bytes_read'], len(test_checker.PAGINA_PRINCIPAL))
+        self.assertEqual(performance['requests'], checker.details['transport']['requests'])
+        self.assertEqual(performance['probes'], len(checker.build_probes()))
+        self.assertGreaterEqual(performance['total'], performance['phases']['checks'])
+        self.assertIn('dns_time', performance['network'])
+        
+        data = build_report_data(self.url, result, {}, performance)
+        self.assertEqual(data['rendimiento'], performance)
+    
+    def test_sin_instrumentacion(self):
+        checker = SecurityChecker(self.url)
+        success, result = checker.check_security()
+        
+        self.assertTrue(success)
+        self.assertNotIn('performance', checker.details)
+        self.assertIs(checker.metrics, DISABLED)
+        self.assertIs(DISABLED.timed('parse', len), len)
+        self.assertNotIn('rendimiento', build_report_data(self.url, result, {}, None))
+    
+    def test_espera_de_lotes(self):
+        """La espera de un lote de sondeos va a la fase 'wait' y no al chequeo que lo espera"""
+        metrics = ScanMetrics()
+        with metrics.phase('checks'):
+            checks = metrics.check_list()
+            with metrics.waiting(checks):
+                time.sleep(0.2)
+            checks.append(('13. Acceso no autorizado', True, ''))
+        
+        performance = metrics.to_dict()
+        self.assertLess(performance['checks']['13. Acceso no autorizado'], 0.1)
+        self.assertGreaterEqual(performance['phases']['wait'], 0.2)
+        self.assertLess(performance['phases']['checks'], 0.1)
+        with DISABLED.waiting([]):
+            pass
+    
+    def test_registro_prometheus(self):
+        registry = MetricsRegistry()
+        metrics = ScanMetrics()
+        with metrics.phase('request'):
+            pass
+        checks = metrics.check_list()
+        checks.append(('1. Captcha "x"', True, ''))
+        metrics.count_bytes(2048)
+        registry.observe(metrics.to_dict({'requests': 3}))
+        registry.observe(None, success=False)
+        
+        texto = registry.render()
+        self.assertIn('checkpoint_scans_total{result="ok"} 1', texto)
+        self.assertIn('checkpoint_scans_total{result="error"} 1', texto)
+        self.assertIn('checkpoint_phase_seconds_count{phase="request"} 1', texto)
+        self.assertIn('checkpoint_check_seconds_count{check="1. Captcha \\"x\\""} 1', texto)
+        self.assertIn('checkpoint_bytes_read_total 2048', texto)
+        self.assertIn('checkpoint_requests_total 3', texto)
+        
+        server = start_metrics_server(0, registry=registry)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+                self.assertEqual(response.read().decode('utf-8'), registry.render())
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
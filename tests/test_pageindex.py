@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice de palabras clave pageindex.py
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pageindex import KeywordMatcher, PageIndex
+from checker import HTMLTagParser, SecurityChecker
+
+PAGINA = """<html><body>
+<form action="/login" method="post">
+  <input type="text" name="usuario" required>
+  <input type="password" name="clave">
+  <div class="g-recaptcha" data-sitekey="abc"></div>
+  login
+</form>
+</body></html>"""
+
+def posiciones_ingenuas(texto, palabras):
+    """Referencia: cada palabra buscada por separado con str.find"""
+    resultado = {}
+    for palabra in palabras:
+        inicio = texto.find(palabra)
+        while inicio != -1:
+            resultado.setdefault(palabra, []).append(inicio)
+            inicio = texto.find(palabra, inicio + 1)
+    return resultado
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Pruebas del buscador multi-patrón"""
+    
+    def test_palabras_contenidas_y_solapadas(self):
+        """Se informan las palabras dentro de otra y las que se solapan con su final"""
+        matcher = KeywordMatcher({'a': ['recaptcha', 'captcha', 'g-recaptcha'], 'b': ['sesión', 'iniciar sesión', 'ones']})
+        texto = 'g-recaptcha; iniciar sesiónes'
+        
+        encontrado = sorted(matcher.finditer(texto))
+        esperado = sorted((p, i) for p, pos in posiciones_ingenuas(texto, matcher.keywords).items() for i in pos)
+        self.assertEqual(encontrado, esperado)
+    
+    def test_equivale_a_busquedas_separadas(self):
+        """Sobre texto aleatorio, el resultado coincide con buscar cada palabra por separado"""
+        matcher = KeywordMatcher(SecurityChecker.KEYWORD_GROUPS)
+        rng = random.Random(7)
+        fragmentos = matcher.keywords + ['x', ' ', 'logi', 'sess', 'auth', 'o']
+        texto = ''.join(rng.choice(fragmentos) for _ in range(3000))
+        
+        encontrado = {}
+        for palabra, posicion in matcher.finditer(texto):
+            encontrado.setdefault(palabra, []).append(posicion)
+        encontrado = {p: sorted(pos) for p, pos in encontrado.items()}
+        self.assertEqual(encontrado, posiciones_ingenuas(texto, matcher.keywords))
+    
+    def test_has_any_por_grupo(self):
+        matcher = KeywordMatcher(SecurityChecker.KEYWORD_GROUPS)
+        self.assertTrue(matcher.has_any('fatal: traceback (most recent call last)', 'stack_trace'))
+        self.assertFalse(matcher.has_any('página no encontrada', 'stack_trace'))
+
+class TestPageIndex(unittest.TestCase):
+    """Pruebas de la lectura incremental del cuerpo"""
+    
+    def test_palabras_clave_entre_bloques(self):
+        """Una palabra clave partida entre dos bloques se detecta igual, con su posición"""
+        page = PageIndex(KeywordMatcher({'captcha': ['g-recaptcha'], 'auth': ['iniciar sesión']}))
+        for chunk in ['<div class="g-reCAP', 'TCHA"></div> Iniciar ', 'Sesión']:
+            page.feed(chunk)
+        page.finish()
+        
+        self.assertTrue(page.has_any('captcha'))
+        self.assertTrue(page.has_any('auth'))
+        self.assertEqual(page.lower, page.text.lower())
+        self.assertEqual(page.hits('captcha'), {'g-recaptcha': [page.lower.index('g-recaptcha')]})
+        self.assertEqual(page.first_position('auth'), page.lower.index('iniciar sesión'))
+    
+    def test_indexado_por_bloques_igual_al_completo(self):
+        """Las posiciones no dependen del tamaño de los bloques"""
+        matcher = KeywordMatcher(SecurityChecker.KEYWORD_GROUPS)
+        completo = PageIndex.from_text(PAGINA, matcher)
+        
+        for size in (1, 3, 7, 64):
+            page = PageIndex(matcher)
+            for i in range(0, len(PAGINA), size):
+                page.feed(PAGINA[i:i + size])
+            page.finish()
+            with self.subTest(size=size):
+                self.assertEqual(page.positions, completo.positions)
+                self.assertEqual(page.counts, completo.counts)
+    
+    def test_parser_incremental(self):
+        """El parser alimentado por bloques obtiene lo mismo que con el documento completo"""
+        completo = HTMLTagParser()
+        completo.feed(PAGINA)
+        
+        incremental = HTMLTagParser()
+        page = PageIndex(SecurityChecker.MATCHER)
+        for i in range(0, len(PAGINA), 7):
+            page.feed(PAGINA[i:i + 7], incremental)
+        page.finish()
+        
+        self.assertEqual(len(incremental.forms), len(completo.forms))
+        self.assertEqual(len(incremental.inputs), len(completo.inputs))
+        self.assertEqual(page.text, PAGINA)
+        self.assertTrue(page.has_any('login_form'))
+        self.assertFalse(page.has_any('stack_trace'))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
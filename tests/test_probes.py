@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Pruebas unitarias para el planificador de sondeos probes.py
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from probes import Probe, ProbeResult, ProbeScheduler, RateLimiter
+
+class TestProbeScheduler(unittest.TestCase):
+    """Pruebas para el planificador concurrente de sondeos"""
+    
+    def test_resultados_en_orden_de_envio(self):
+        """Los resultados respetan el orden de los sondeos aunque terminen desordenados"""
+        demoras = {'a': 0.15, 'b': 0.0, 'c': 0.05}
+        
+        def fetch(probe):
+            time.sleep(demoras[probe.key])
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, max_workers=3, per_host=3)
+        probes = [Probe(key, f"http://ejemplo.test/{key}") for key in ['a', 'b', 'c']]
+        
+        resultados = scheduler.run(probes)
+        self.assertEqual([r.key for r in resultados], ['a', 'b', 'c'])
+        self.assertTrue(all(r.ok for r in resultados))
+    
+    def test_sondeos_concurrentes(self):
+        """Los sondeos se ejecutan en paralelo y no en serie"""
+        def fetch(probe):
+            time.sleep(0.2)
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, max_workers=5, per_host=5)
+        probes = [Probe(str(i), f"http://ejemplo.test/{i}") for i in range(5)]
+        
+        inicio = time.monotonic()
+        scheduler.run(probes)
+        self.assertLess(time.monotonic() - inicio, 0.6)
+    
+    def test_limite_por_host(self):
+        """Nunca hay más peticiones simultáneas a un host que el límite configurado"""
+        en_vuelo = {'actual': 0, 'maximo': 0}
+        lock = threading.Lock()
+        
+        def fetch(probe):
+            with lock:
+                en_vuelo['actual'] += 1
+                en_vuelo['maximo'] = max(en_vuelo['maximo'], en_vuelo['actual'])
+            time.sleep(0.05)
+            with lock:
+                en_vuelo['actual'] -= 1
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, max_workers=8, per_host=2)
+        probes = [Probe(str(i), f"http://ejemplo.test/{i}") for i in range(8)]
+        
+        scheduler.run(probes)
+        self.assertEqual(en_vuelo['maximo'], 2)
+    
+    def test_plazo_del_escaneo(self):
+        """Los sondeos que superan el plazo del escaneo se informan como error"""
+        def fetch(probe):
+            if probe.key == 'lento':
+                time.sleep(1.0)
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, max_workers=2, per_host=2, deadline=0.2)
+        probes = [Probe('rapido', "http://ejemplo.test/a"), Probe('lento', "http://ejemplo.test/b")]
+        
+        inicio = time.monotonic()
+        batch = scheduler.submit(probes)
+        self.assertTrue(batch.get('rapido').ok)
+        self.assertFalse(batch.get('lento').ok)
+        self.assertLess(time.monotonic() - inicio, 0.8)
+    
+    def test_plazo_compartido_entre_lotes(self):
+        """Un lote lanzado más tarde en el mismo escaneo no extiende el plazo"""
+        def fetch(probe):
+            time.sleep(0.3)
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, deadline=0.4)
+        deadline = scheduler.scan_deadline()
+        time.sleep(0.2)
+        batch = scheduler.submit([Probe('a', "http://ejemplo.test/a")], deadline=deadline)
+        self.assertEqual(batch.get('a').error, "Tiempo límite del escaneo agotado")
+        self.assertTrue(scheduler.submit([Probe('b', "http://ejemplo.test/b")]).get('b').ok)
+    
+    def test_plazo_visible_para_la_descarga(self):
+        """La función de descarga recibe el sondeo con el plazo del lote"""
+        plazos = []
+        
+        def fetch(probe):
+            plazos.append(probe.deadline)
+            return ProbeResult(probe.key, probe.url, status=200)
+        
+        scheduler = ProbeScheduler(fetch, deadline=5.0)
+        inicio = time.monotonic()
+        scheduler.run([Probe('a', "http://ejemplo.test/a")])
+        self.assertGreaterEqual(plazos[0], inicio + 5.0)
+        self.assertLess(plazos[0], time.monotonic() + 5.0)
+    
+    def test_errores_de_conexion(self):
+        """Una excepción en un sondeo no interrumpe al resto"""
+        def fetch(probe):
+            if probe.key == 'falla':
+                raise Exception("No se pudo conectar")
+            return ProbeResult(probe.key, probe.url, status=404)
+        
+        scheduler = ProbeScheduler(fetch)
+        resultados = scheduler.run([Probe('falla', "http://a.test/"), Probe('ok', "http://b.test/")])
+        
+        self.assertIn("No se pudo conectar", resultados[0].error)
+        self.assertEqual(resultados[1].status, 404)
+
+class TestRateLimiter(unittest.TestCase):
+    """Pruebas del limitador de peticiones por segundo"""
+    
+    def test_tasa_maxima(self):
+        """Después de la ráfaga inicial, las peticiones se espacian según la tasa"""
+        limiter = RateLimiter(rate=20, burst=5)
+        
+        inicio = time.monotonic()
+        for _ in range(15):
+            self.assertTrue(limiter.acquire())
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.45)
+    
+    def test_plazo(self):
+        """Si el turno llega después del plazo, acquire devuelve False sin esperar"""
+        limiter = RateLimiter(rate=1, burst=1)
+        self.assertTrue(limiter.acquire())
+        
+        inicio = time.monotonic()
+        self.assertFalse(limiter.acquire(deadline=time.monotonic() + 0.1))
+        self.assertLess(time.monotonic() - inicio, 0.1)
+    
+    def test_sin_limite(self):
+        limiter = RateLimiter(None)
+        self.assertTrue(all(limiter.acquire() for _ in range(1000)))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
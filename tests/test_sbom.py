@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la ingesta de lockfiles y SBOM sbom.py
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import io
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sbom import Dependency, JSONStream, compliance_report, detect_format, read_dependencies
+from estandar import generar_reporte_verificacion
+
+PACKAGE_LOCK = {
+    "name": "app",
+    "lockfileVersion": 3,
+    "packages": {
+        "": {"name": "app", "version": "1.0.0"},
+        "node_modules/@angular/core": {"version": "17.3.12"},
+        "node_modules/jquery": {"version": "3.5.1"},
+        "node_modules/a/node_modules/lodash": {"version": "4.17.21"},
+        "node_modules/lodash": {"version": "4.17.21"},
+        "node_modules/left-pad": {"version": "1.3.0"},
+    },
+    "dependencies": {"jquery": {"version": "3.5.1"}},
+}
+
+YARN_LOCK = '''# yarn lockfile v1
+
+
+"@babel/code-frame@^7.0.0", "@babel/code-frame@^7.10.4":
+  version "7.12.13"
+  resolved "https://registry.yarnpkg.com/x"
+
+jquery@^3.6.0:
+  version "3.6.4"
+'''
+
+YARN_BERRY_LOCK = '''__metadata:
+  version: 6
+
+"app@workspace:.":
+  version: 0.0.0-use.local
+
+"react@npm:^18.2.0":
+  version: 18.2.0
+'''
+
+REQUIREMENTS = '''# dependencias
+Django==4.2.11
+requests>=2.28
+numpy == 1.26.4 ; python_version >= "3.9"
+-r otros.txt
+git+https://github.com/x/y.git
+'''
+
+POM = '''<?xml version="1.0"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>3.2.5</version>
+  </parent>
+  <artifactId>app</artifactId>
+  <version>1.0</version>
+  <properties><jackson.version>2.15.0</jackson.version></properties>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter-web</artifactId>
+      <version>${project.parent.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>com.fasterxml.jackson.core</groupId>
+      <artifactId>jackson-databind</artifactId>
+      <version>${jackson.version}</version>
+      <exclusions><exclusion><groupId>x</groupId><artifactId>y</artifactId></exclusion></exclusions>
+    </dependency>
+    <dependency><groupId>junit</groupId><artifactId>junit</artifactId><version>${sin.definir}</version></dependency>
+  </dependencies>
+  <build><plugins><plugin><artifactId>maven-compiler-plugin</artifactId><version>3.11.0</version></plugin></plugins></build>
+</project>
+'''
+
+COMPOSER_LOCK = {
+    "_readme": ["generado"],
+    "packages": [{"name": "laravel/framework", "version": "v11.0.0"}, {"name": "monolog/monolog", "version": "3.5.0"}],
+    "packages-dev": [{"name": "phpunit/phpunit", "version": "10.5.0"}],
+}
+
+CYCLONEDX = {
+    "bomFormat": "CycloneDX",
+    "specVersion": "1.5",
+    "metadata": {"component": {"name": "app"}},
+    "components": [
+        {"group": "@angular", "name": "core", "version": "17.3.12", "purl": "pkg:npm/%40angular/core@17.3.12"},
+        {"name": "react", "version": "16.0.0", "purl": "pkg:npm/react@16.0.0",
+         "components": [{"name": "bootstrap", "version": "5.3.0", "purl": "pkg:npm/bootstrap@5.3.0"}]},
+    ],
+}
+
+SPDX = {
+    "spdxVersion": "SPDX-2.3",
+    "packages": [
+        {"name": "nginx", "versionInfo": "1.24.0"},
+        {"name": "openssl", "versionInfo": "3.0.13",
+         "externalRefs": [{"referenceType": "purl", "referenceLocator": "pkg:generic/openssl@3.0.13"}]},
+    ],
+}
+
+class TestSBOM(unittest.TestCase):
+    """Pruebas de los lectores por formato y del informe"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content if isinstance(content, str) else json.dumps(content, indent=2))
+        return path
+    
+    def test_package_lock(self):
+        """Se toman las entradas de "packages" sin el proyecto ni el árbol v1 repetido"""
+        path = self.write('package-lock.json', PACKAGE_LOCK)
+        self.assertEqual(detect_format(path), 'package-lock')
+        self.assertEqual([(d.name, d.version) for d in read_dependencies(path)], [
+            ('@angular/core', '17.3.12'), ('jquery', '3.5.1'), ('lodash', '4.17.21'),
+            ('lodash', '4.17.21'), ('left-pad', '1.3.0'),
+        ])
+    
+    def test_package_lock_v1(self):
+        """lockfileVersion 1: árbol anidado de dependencias"""
+        lock = {"lockfileVersion": 1, "dependencies": {
+            "express": {"version": "4.19.2", "dependencies": {"debug": {"version": "2.6.9"}}}}}
+        path = self.write('package-lock.json', lock)
+        self.assertEqual(sorted((d.name, d.version) for d in read_dependencies(path)),
+                         [('debug', '2.6.9'), ('express', '4.19.2')])
+    
+    def test_yarn_lock(self):
+        path = self.write('yarn.lock', YARN_LOCK)
+        self.assertEqual(list(read_dependencies(path)), [
+            Dependency('@babel/code-frame', '7.12.13', 'npm'), Dependency('jquery', '3.6.4', 'npm')])
+        path = self.write('yarn.lock', YARN_BERRY_LOCK)
+        self.assertEqual(list(read_dependencies(path)), [Dependency('react', '18.2.0', 'npm')])
+    
+    def test_requirements(self):
+        """Solo las versiones fijadas con == cuentan; se ignoran opciones y URLs"""
+        path = self.write('requirements.txt', REQUIREMENTS)
+        self.assertEqual([(d.name, d.version) for d in read_dependencies(path)],
+                         [('django', '4.2.11'), ('requests', None), ('numpy', '1.26.4')])
+    
+    def test_pom(self):
+        """Las propiedades definidas se resuelven y las que no, dejan la versión vacía"""
+        path = self.write('pom.xml', POM)
+        self.assertEqual([(d.name, d.version) for d in read_dependencies(path)], [
+            ('org.springframework.boot:spring-boot-starter-parent', '3.2.5'),
+            ('org.springframework.boot:spring-boot-starter-web', '3.2.5'),
+            ('com.fasterxml.jackson.core:jackson-databind', '2.15.0'),
+            ('junit:junit', None),
+        ])
+    
+    def test_composer_lock(self):
+        path = self.write('composer.lock', COMPOSER_LOCK)
+        self.assertEqual([d.name for d in read_dependencies(path)],
+                         ['laravel/framework', 'monolog/monolog', 'phpunit/phpunit'])
+    
+    def test_sbom_json(self):
+        """CycloneDX y SPDX se detectan por el contenido"""
+        path = self.write('bom.json', CYCLONEDX)
+        self.assertEqual(detect_format(path), 'cyclonedx')
+        self.assertEqual([(d.name, d.version, d.ecosystem) for d in read_dependencies(path)], [
+            ('@angular/core', '17.3.12', 'npm'), ('react', '16.0.0', 'npm'), ('bootstrap', '5.3.0', 'npm')])
+        path = self.write('sbom.json', SPDX)
+        self.assertEqual(detect_format(path), 'spdx')
+        self.assertEqual([(d.name, d.ecosystem) for d in read_dependencies(path)],
+                         [('nginx', 'generic'), ('openssl', 'generic')])
+    
+    def test_formato_desconocido(self):
+        path = self.write('otro.json', {"a": 1})
+        with self.assertRaises(ValueError):
+            detect_format(path)
+    
+    def test_informe_cumplimiento(self):
+        """El informe tiene la forma de generar_reporte_verificacion y deduplica componentes"""
+        path = self.write('package-lock.json', PACKAGE_LOCK)
+        report = compliance_report(path, batch_size=2)
+        expected = generar_reporte_verificacion(["angular 17.3.12", "jquery 3.5.1", "lodash 4.17.21", "left-pad 1.3.0"])
+        for key in ("total_verificados", "compatibles", "no_compatibles", "no_encontrados"):
+            self.assertEqual(report[key], expected[key], key)
+        self.assertEqual(report["total_dependencias"], 5)
+        self.assertEqual(report["detalles"][0]["software"], "angular")
+        self.assertEqual(report["detalles"][0]["paquete"], "@angular/core")
+        
+        # Spring Boot: todos los artefactos del grupo son un mismo componente del catálogo
+        report = compliance_report(self.write('pom.xml', POM), only_problems=True)
+        self.assertEqual(report["total_verificados"], 3)
+        self.assertNotIn("springboot", [d["software"] for d in report["detalles"]])
+
+class TestJSONStream(unittest.TestCase):
+    """Pruebas del lector incremental de JSON"""
+    
+    def test_bloques_chicos(self):
+        """Claves, cadenas y números cortados entre bloques se decodifican completos"""
+        document = json.dumps({"otro": {"x": [1, 2, 3]}, "packages": {"a": {"version": "1.2.3", "n": 12345},
+                                                                       "bé": [True, None, 6.5e3]}})
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(size=size):
+                stream = JSONStream(io.StringIO(document))
+                stream.CHUNK_SIZE = size
+                self.assertEqual(list(stream.sections(('packages',))), [
+                    ('packages', ('a', {"version": "1.2.3", "n": 12345})),
+                    ('packages', ('bé', [True, None, 6500.0])),
+                ])
+    
+    def test_json_invalido(self):
+        stream = JSONStream(io.StringIO('{"packages": {"a": 1,, }}'))
+        with self.assertRaises(ValueError):
+            list(stream.sections(('packages',)))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las instantáneas binarias del catálogo snapshot.py
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import estandar
+from estandar import (CatalogoCompilado, VERSIONES_HOMOLOGADAS, buscar_version_homologada,
+                      obtener_catalogo, obtener_catalogo_completo, verificar_lote)
+from snapshot import load_snapshot, read_metadata, update_catalog, write_snapshot
+
+class TestSnapshot(unittest.TestCase):
+    """Pruebas de escritura, lectura y actualización de instantáneas"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'es0901.snapshot')
+        self.original = dict(VERSIONES_HOMOLOGADAS)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        # Se descarta la instantánea activada
+        estandar._catalogo = None
+    
+    def test_ida_y_vuelta(self):
+        """La instantánea reproduce el catálogo, sus alias y sus claves numéricas"""
+        catalogo = CatalogoCompilado(VERSIONES_HOMOLOGADAS, metadatos={'version_estandar': 'ES0901 v9'})
+        write_snapshot(catalogo, self.path)
+        cargado = load_snapshot(self.path)
+        
+        self.assertEqual(cargado.huella, catalogo.huella)
+        self.assertEqual(cargado.nombres, catalogo.nombres)
+        self.assertEqual(dict(cargado.alias), dict(catalogo.alias))
+        self.assertEqual(cargado.metadatos['version_estandar'], 'ES0901 v9')
+        self.assertEqual(cargado.claves.mayor_menor, catalogo.claves.mayor_menor)
+        if estandar.NUMPY_DISPONIBLE:
+            for nombre, arreglo in catalogo.claves.arreglos.items():
+                self.assertEqual(cargado.claves.arreglos[nombre].tolist(), arreglo.tolist())
+                self.assertFalse(cargado.claves.arreglos[nombre].flags.writeable)
+        
+        textos = ["jquery 3.6.4", "jquery 2.0.0", "vue3", "Node.js 18.20.4", "oracle 19c", "inventado 1.0"]
+        self.assertEqual(list(verificar_lote(textos, cargado).estados), list(verificar_lote(textos, catalogo).estados))
+    
+    def test_archivo_invalido(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'no es una instantanea')
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+        self.assertIsNone(read_metadata(self.path))
+        
+        write_snapshot(obtener_catalogo(), self.path)
+        with open(self.path, 'rb+') as f:
+            f.truncate(os.path.getsize(self.path) - 8)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+    
+    def test_actualizar_desde_documento(self):
+        """El actualizador versiona la instantánea y la activa como catálogo global"""
+        fuente = os.path.join(self.tmpdir, 'ES0901.txt')
+        with open(fuente, 'w', encoding='utf-8') as f:
+            f.write("# Estándar ES0901 v4.8\njquery:3.7.2\nproducto_nuevo:2.0\n")
+        
+        metadatos = update_catalog(fuente, self.path, fecha='2025-06-30')
+        self.assertEqual(metadatos['version_estandar'], 'ES0901 v4.8')
+        self.assertEqual(metadatos['revision'], 1)
+        self.assertEqual(obtener_catalogo().metadatos['revision'], 1)
+        self.assertTrue(buscar_version_homologada("producto_nuevo 2.0")["compatible"])
+        self.assertFalse(buscar_version_homologada("jquery 3.6.4")["compatible"])
+        # El catálogo incorporado no cambia: la instantánea se sirve solo como catálogo compilado
+        self.assertEqual(VERSIONES_HOMOLOGADAS, self.original)
+        
+        completo = obtener_catalogo_completo()
+        self.assertEqual((completo['version_estandar'], completo['fecha_actualizacion']), ('ES0901 v4.8', '2025-06-30'))
+        
+        # El mismo documento no se vuelve a procesar; uno nuevo incrementa la revisión
+        self.assertEqual(update_catalog(fuente, self.path, activate=False), metadatos)
+        with open(fuente, 'a', encoding='utf-8') as f:
+            f.write("django:5.1.1\n")
+        self.assertEqual(update_catalog(fuente, self.path, activate=False)['revision'], 2)
+    
+    def test_documento_sin_versiones(self):
+        fuente = os.path.join(self.tmpdir, 'vacio.txt')
+        with open(fuente, 'w', encoding='utf-8') as f:
+            f.write("sin versiones\n")
+        with self.assertRaises(ValueError):
+            update_catalog(fuente, self.path)
+        self.assertFalse(os.path.exists(self.path))
+    
+    def test_recompilar_conserva_la_instantanea(self):
+        """recompilar_catalogo vuelve a cargar la instantánea, no el catálogo incorporado"""
+        catalogo = CatalogoCompilado({'jquery': ['3.7.2']}, metadatos={'version_estandar': 'ES0901 v9'})
+        write_snapshot(catalogo, self.path)
+        original = estandar.RUTA_SNAPSHOT
+        estandar.RUTA_SNAPSHOT = self.path
+        try:
+            estandar.usar_snapshot()
+            recompilado = estandar.recompilar_catalogo()
+            self.assertEqual(recompilado.huella, catalogo.huella)
+            self.assertEqual(obtener_catalogo().metadatos['version_estandar'], 'ES0901 v9')
+            
+            # Sin instantánea se vuelve al catálogo incorporado con sus metadatos
+            os.unlink(self.path)
+            self.assertEqual(estandar.recompilar_catalogo().metadatos['version_estandar'], estandar.VERSION_ESTANDAR)
+            self.assertTrue(buscar_version_homologada("jquery 3.6.4")["compatible"])
+        finally:
+            estandar.RUTA_SNAPSHOT = original
+
+if __name__ == '__main__':
+    unittest.main()
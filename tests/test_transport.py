@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pruebas del transporte HTTP con conexiones reutilizables transport.py
+"""
+
+import unittest
+import threading
+import sys
+import os
+from http.cookiejar import CookieJar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio padre al path para importar el módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport import HTTPTransport
+
+class ServidorKeepAlive(BaseHTTPRequestHandler):
+    """Servidor HTTP/1.1 que registra en qué conexión llegó cada petición"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        self.server.conexiones.append(id(self.connection))
+        if self.path == '/login':
+            self.send_response(302)
+            self.send_header('Location', '/panel')
+            self.send_header('Set-Cookie', 'sessionid=abc123; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        body = b"x" * 200000 if self.path == '/grande' else f"cookie={self.headers.get('Cookie')}".encode()
+        self.send_response(404 if self.path == '/no-existe' else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Cierra la conexión sin avisar, como un servidor que vence el keep-alive
+        self.close_connection = self.path == '/cerrar'
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestHTTPTransport(unittest.TestCase):
+    """Pruebas del pool de conexiones keep-alive"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ServidorKeepAlive)
+        cls.server.conexiones = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.server.conexiones.clear()
+        self.transport = HTTPTransport(CookieJar(), pool_size=2)
+    
+    def tearDown(self):
+        self.transport.close()
+    
+    def get(self, path):
+        response = self.transport.request(self.base + path)
+        body = response.read()
+        response.close()
+        return response.getcode(), body
+    
+    def test_reutiliza_conexiones(self):
+        """Peticiones sucesivas al mismo host usan una sola conexión"""
+        for _ in range(5):
+            self.assertEqual(self.get('/')[0], 200)
+        
+        metrics = self.transport.metrics()
+        self.assertEqual(metrics['requests'], 5)
+        self.assertEqual(metrics['new_connections'], 1)
+        self.assertEqual(metrics['reused_connections'], 4)
+        self.assertEqual(len(set(self.server.conexiones)), 1)
+    
+    def test_respuestas_de_error_y_restos_de_cuerpo(self):
+        """Los 404 se devuelven como respuesta y un cuerpo sin leer no se reutiliza si es grande"""
+        self.assertEqual(self.get('/no-existe')[0], 404)
+        
+        response = self.transport.request(self.base + '/grande')
+        response.read(10)
+        response.close()
+        self.get('/')
+        
+        metrics = self.transport.metrics()
+        self.assertEqual(metrics['new_connections'], 2)
+        self.assertEqual(metrics['reused_connections'], 1)
+    
+    def test_cookies_y_redirecciones(self):
+        """Las cookies recibidas durante una redirección se envían en las peticiones siguientes"""
+        status, body = self.get('/login')
+        
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"cookie=sessionid=abc123")
+        self.assertEqual(self.transport.metrics()['redirects'], 1)
+    
+    def test_reintento_con_conexion_cerrada(self):
+        """Si el servidor cerró una conexión ociosa, se reintenta con una nueva"""
+        self.get('/cerrar')
+        self.assertEqual(self.get('/')[0], 200)
+        self.assertEqual(self.transport.metrics()['retries'], 1)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
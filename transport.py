@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Transporte HTTP con conexiones keep-alive reutilizables por host para
+SecurityChecker, construido sobre http.client
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from functools import lru_cache
+from typing import Dict
+
+@lru_cache(maxsize=1)
+def default_ssl_context() -> ssl.SSLContext:
+    """Contexto TLS por defecto, compartido: crearlo carga los certificados raíz (decenas de ms)"""
+    return ssl.create_default_context()
+
+def new_stats() -> Dict:
+    return {
+        'requests': 0,
+        'new_connections': 0,
+        'reused_connections': 0,
+        'retries': 0,
+        'redirects': 0,
+        'proxied': 0,
+        'connect_time': 0.0,
+        'dns_time': 0.0,
+        'tls_time': 0.0,
+    }
+
+def summarize_stats(stats: Dict) -> Dict:
+    """Métricas de reutilización de conexiones a partir de los contadores de un transporte"""
+    metrics = dict(stats)
+    opened = metrics['new_connections'] + metrics['reused_connections']
+    metrics['reuse_ratio'] = round(metrics['reused_connections'] / opened, 3) if opened else 0.0
+    for key in ('connect_time', 'dns_time', 'tls_time'):
+        metrics[key] = round(metrics[key], 4)
+    return metrics
+
+def open_socket(address, timeout, source_address, timing: Dict) -> socket.socket:
+    """
+    socket.create_connection separando la resolución DNS de la conexión TCP
+    (timing recibe 'dns' y 'tcp'); prueba las direcciones en orden
+    """
+    host, port = address
+    start = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    timing['dns'] = time.perf_counter() - start
+    
+    error = None
+    for family, sock_type, proto, _, sockaddr in addresses:
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            timing['tcp'] = time.perf_counter() - start - timing['dns']
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error or OSError(f"No se pudo resolver {host}")
+
+class PooledResponse:
+    """
+    Respuesta HTTP con la interfaz que usa SecurityChecker (getcode, info,
+    read, close). Al cerrarse devuelve la conexión al pool si el cuerpo se
+    consumió completo; si quedó un resto chico se descarta leyéndolo.
+    """
+    
+    def __init__(self, response, connection, pool_key, transport, url):
+        self._response = response
+        self._connection = connection
+        self._pool_key = pool_key
+        self._transport = transport
+        self._released = False
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+    
+    def getcode(self):
+        return self.status
+    
+    def geturl(self):
+        return self.url
+    
+    def info(self):
+        return self._response.msg
+    
+    def read(self, amt=None):
+        return self._response.read(amt)
+    
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        
+        reusable = not self._response.will_close
+        if reusable and not self._response.isclosed():
+            try:
+                self._response.read(self._transport.DRAIN_LIMIT)
+                reusable = self._response.isclosed()
+            except (OSError, http.client.HTTPException):
+                reusable = False
+        
+        self._response.close()
+        self._transport._release(self._pool_key, self._connection, reusable)
+
+class HTTPTransport:
+    """
+    Pool de conexiones HTTP/HTTPS keep-alive por host.
+    
+    Conserva el comportamiento del opener de urllib que reemplaza: envía y
+    guarda cookies en el CookieJar recibido, sigue redirecciones y devuelve
+    las respuestas de error como respuestas comunes. Si hay un proxy
+    configurado en el entorno para la URL, la petición se delega al opener
+    de urllib sin reutilizar conexiones.
+    """
+    
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 10
+    # Resto de cuerpo que se lee al cerrar una respuesta para poder reutilizar la conexión
+    DRAIN_LIMIT = 64 * 1024
+    
+    def __init__(self, cookie_jar=None, pool_size=4, connect_timeout=10.0, read_timeout=10.0,
+                 ssl_context=None):
+        self.cookie_jar = cookie_jar
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context or default_ssl_context()
+        self._idle: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        self._opener = None
+        self._proxies = urllib.request.getproxies()
+        self.stats = new_stats()
+    
+    def request(self, url, method="GET", headers=None):
+        """Ejecuta la petición siguiendo redirecciones; devuelve la respuesta final"""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = self._send(url, method, headers or {})
+            location = response.info().get('Location')
+            if response.getcode() not in self.REDIRECT_CODES or not location:
+                return response
+            
+            response.close()
+            url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(url).scheme not in ('http', 'https'):
+                raise urllib.error.URLError(f"Redirección a un esquema no soportado: {url}")
+            if response.getcode() == 303 or (response.getcode() in (301, 302) and method == "POST"):
+                method = "GET"
+            self._count('redirects')
+        
+        raise urllib.error.URLError(f"Demasiadas redirecciones: {url}")
+    
+    def _send(self, url, method, headers):
+        request = urllib.request.Request(url, headers=headers, method=method)
+        if self._uses_proxy(request):
+            self._count('proxied')
+            return self._open_with_urllib(request)
+        if self.cookie_jar is not None:
+            self.cookie_jar.add_cookie_header(request)
+        
+        parts = urllib.parse.urlsplit(url)
+        pool_key = (parts.scheme, parts.hostname, parts.port)
+        target = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        
+        connection, reused = self._acquire(pool_key)
+        try:
+            response = self._exchange(connection, method, target, request)
+        except (ConnectionError, http.client.HTTPException):
+            connection.close()
+            if not reused:
+                raise
+            # El servidor cerró la conexión ociosa: se reintenta una vez con una nueva
+            self._count('retries')
+            connection, _ = self._acquire(pool_key, fresh=True)
+            try:
+                response = self._exchange(connection, method, target, request)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+        except OSError:
+            connection.close()
+            raise
+        
+        self._count('requests')
+        if self.cookie_jar is not None:
+            self.cookie_jar.extract_cookies(response, request)
+        return PooledResponse(response, connection, pool_key, self, url)
+    
+    def _exchange(self, connection, method, target, request):
+        connection.putrequest(method, target)
+        for header, value in request.header_items():
+            connection.putheader(header, value)
+        connection.endheaders()
+        return connection.getresponse()
+    
+    def _acquire(self, pool_key, fresh=False):
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(pool_key)
+                if idle:
+                    self.stats['reused_connections'] += 1
+                    return idle.pop(), True
+        
+        scheme, host, port = pool_key
+        if scheme == 'https':
+            connection = http.client.HTTPSConnection(host, port, timeout=self.connect_timeout,
+                                                     context=self.ssl_context)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        
+        # La conexión HTTPS hace el handshake TLS después de abrir el socket:
+        # el resto del tiempo de connect() es el del handshake
+        timing = {}
+        connection._create_connection = lambda *args: open_socket(*args, timing=timing)
+        start = time.perf_counter()
+        connection.connect()
+        elapsed = time.perf_counter() - start
+        connection.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.stats['new_connections'] += 1
+            self.stats['connect_time'] += elapsed
+            self.stats['dns_time'] += timing.get('dns', 0.0)
+            if scheme == 'https':
+                self.stats['tls_time'] += max(0.0, elapsed - timing.get('dns', 0.0) - timing.get('tcp', 0.0))
+        return connection, False
+    
+    def _release(self, pool_key, connection, reusable):
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(pool_key, [])
+                if len(idle) < self.pool_size:
+                    idle.append(connection)
+                    return
+        connection.close()
+    
+    def _uses_proxy(self, request):
+        if request.type not in self._proxies:
+            return False
+        return not urllib.request.proxy_bypass(request.host)
+    
+    def _open_with_urllib(self, request):
+        if self._opener is None:
+            handlers = []
+            if self.cookie_jar is not None:
+                handlers.append(urllib.request.HTTPCookieProcessor(self.cookie_jar))
+            self._opener = urllib.request.build_opener(*handlers)
+        try:
+            return self._opener.open(request, timeout=self.connect_timeout)
+        except urllib.error.HTTPError as e:
+            return e
+    
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def metrics(self) -> Dict:
+        """Métricas de reutilización de conexiones del escaneo"""
+        with self._lock:
+            return summarize_stats(self.stats)
+    
+    def close(self):
+        """Cierra las conexiones ociosas del pool"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()